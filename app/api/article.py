@@ -1,7 +1,12 @@
+from datetime import datetime
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.schemas.pagination import PaginatedResponse
+from app.api.responses import model_response, paginated_response
 from app.api.deps import (
     get_db,
     get_current_user,
@@ -23,7 +28,9 @@ from app.services.article_service import (
     get_paginated_articles
 )
 from app.db.models import Article
-from app.services.summarizer import summarize_news
+from app.services.summary_service import get_or_create_summary
+from app.services.export_service import ARTICLE_EXPORT_DEFAULT_FIELDS, ARTICLE_EXPORT_FIELDS, export_articles
+from app.services.llm_gateway import LLMError
 router = APIRouter(prefix="/articles", tags=["articles"])
 
 
@@ -42,7 +49,7 @@ def create_new_article(
     return create_article(db, data, author_id=current_user.id)
 
 
-@router.get("/search", response_model=PaginatedResponse)
+@router.get("/search", response_model=PaginatedResponse[ArticleRead])
 def search_articles_route(
     q: str,
     page: int = 1,
@@ -67,15 +74,10 @@ def search_articles_route(
         sort=sort,
         current_user=current_user
     )
-    return {
-        "items": [ArticleRead.model_validate(i) for i in items],
-        "total": total,
-        "page": page,
-        "limit": limit
-    }
+    return paginated_response(ArticleRead, items, total, page, limit)
 
 
-@router.get("/category/{category_id}", response_model=PaginatedResponse)
+@router.get("/category/{category_id}", response_model=PaginatedResponse[ArticleRead])
 def get_articles_by_category_route(
     category_id: int,
     page: int = 1,
@@ -88,15 +90,10 @@ def get_articles_by_category_route(
     start = (page - 1) * limit
     end = start + limit
     paginated = items[start:end]
-    return {
-        "items": [ArticleRead.model_validate(i) for i in paginated],
-        "total": total,
-        "page": page,
-        "limit": limit
-    }
+    return paginated_response(ArticleRead, paginated, total, page, limit)
 
 
-@router.get("/", response_model=PaginatedResponse)
+@router.get("/", response_model=PaginatedResponse[ArticleRead])
 def list_articles_paginated(
     page: int = 1,
     limit: int = 6,
@@ -106,12 +103,30 @@ def list_articles_paginated(
     current_user = Depends(get_current_user_optional)
 ):
     items, total = get_paginated_articles(db, page, limit, current_user, status, author_id)
-    return {
-        "items": [ArticleRead.model_validate(i) for i in items],
-        "total": total,
-        "page": page,
-        "limit": limit
-    }
+    return paginated_response(ArticleRead, items, total, page, limit)
+
+
+# declared before /{article_id} so "export" isn't taken for an id
+@router.get("/export")
+def export_published_articles(
+    fields: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+):
+    """
+    Published articles streamed as NDJSON (one object per line), ordered by
+    updated_at. fields: comma-separated subset of the export fields.
+    """
+    selected = [f.strip() for f in (fields or "").split(",") if f.strip()] or list(ARTICLE_EXPORT_DEFAULT_FIELDS)
+    unknown = [f for f in selected if f not in ARTICLE_EXPORT_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}; allowed: {', '.join(ARTICLE_EXPORT_FIELDS)}",
+        )
+    return StreamingResponse(
+        export_articles(list(dict.fromkeys(selected)), updated_since),
+        media_type="application/x-ndjson",
+    )
 
 
 @router.get("/{article_id}", response_model=ArticleRead)
@@ -123,7 +138,7 @@ def get_single_article(
     article = get_article(db, article_id, current_user)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
-    return ArticleRead.model_validate(article)
+    return model_response(ArticleRead, article)
 
 
 @router.put("/{article_id}", response_model=ArticleRead)
@@ -163,5 +178,12 @@ def delete_single_article(
 def summarize_article(
         article_id:str,
         db:Session=Depends(get_db)):
-    article=db.query(Article).filter(Article.id==article_id).first()
-    return summarize_news(article.content)
\ No newline at end of file
+    article=db.query(Article.id, Article.content).filter(Article.id==article_id).first()
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    try:
+        return get_or_create_summary(db, article.id, article.content)
+    except LLMError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
\ No newline at end of file
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 
 from app.api.deps import get_db, get_current_user
-from app.schemas.bookmark import BookmarkCreate, BookmarkRead
+from app.api.responses import cursor_response
+from app.db.keyset import InvalidCursor
+from app.schemas.bookmark import BookmarkCard, BookmarkCreate, BookmarkRead
+from app.schemas.pagination import CursorPage
 from app.services.bookmark_service import (
     create_bookmark,
     get_bookmark_by_user_and_article,
@@ -31,13 +34,18 @@ def save_article(
     bookmark = create_bookmark(db, data, user_id=current_user.id)
     return bookmark
 
-@router.get("/", response_model=List[BookmarkRead])
+@router.get("/", response_model=CursorPage[BookmarkCard])
 def get_my_bookmarks(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    bookmarks = list_bookmarks_for_user(db, current_user.id)
-    return bookmarks
+    try:
+        bookmarks, next_cursor = list_bookmarks_for_user(db, current_user.id, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return cursor_response(BookmarkCard, bookmarks, next_cursor, limit)
 
 @router.delete("/{article_id}", status_code=status.HTTP_204_NO_CONTENT)
 def unsave_article(
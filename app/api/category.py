@@ -11,6 +11,7 @@ from app.services.category_service import (
     get_category_by_slug,
 )
 from app.schemas.category import CategoryCreate, CategoryRead, CategoryUpdate
+from app.api.responses import list_response, model_response
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
@@ -25,7 +26,7 @@ def create_new_category(data: CategoryCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=list[CategoryRead])
 def list_all_categories(db: Session = Depends(get_db)):
-    return list_categories(db)
+    return list_response(CategoryRead, list_categories(db))
 
 
 @router.get("/{category_id}", response_model=CategoryRead)
@@ -33,7 +34,7 @@ def get_single_category(category_id: int, db: Session = Depends(get_db)):
     category = get_category(db, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
-    return category
+    return model_response(CategoryRead, category)
 
 
 @router.put("/{category_id}", response_model=CategoryRead,
@@ -60,4 +61,4 @@ def get_category_by_slug_route(slug: str, db: Session = Depends(get_db)):
     category = get_category_by_slug(db, slug)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
-    return category
+    return model_response(CategoryRead, category)
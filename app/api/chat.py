@@ -1,31 +1,26 @@
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 from typing import Optional, Literal, List, Dict, Any
+from datetime import datetime
 import re
 
+from app.api.deps import get_db
 from app.core.config import settings
 from app.services.embedding_service import search_chunks
+from app.services.headlines_service import get_latest_headlines
+from app.services import llm_gateway
+from app.services.context_packer import pack_context
+from app.services.chat_session_service import build_history, get_or_create_session, record_turn
 
-from langchain_groq import ChatGroq
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import BaseMessage
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
-# env
-GROQ_API_KEY = settings.GROQ_API_KEY
-if not GROQ_API_KEY:
-    raise RuntimeError("GROQ_API_KEY required")
-
 GROQ_MODEL = settings.GROQ_MODEL
-
-# LangChain LLM
-llm = ChatGroq(
-    model=GROQ_MODEL,
-    api_key=GROQ_API_KEY,
-    temperature=0.1,
-)
+TEMPERATURE = 0.1
 
 # ---------------------------------------------------------
 # UPDATE: Refined Prompt Template
@@ -56,7 +51,14 @@ class ChatRequest(BaseModel):
     question: str
     mode: Literal["global", "local"] = "global"
     article_id: Optional[str] = None
+    # server-side session; unknown / expired ids start a new session
+    session_id: Optional[str] = None
+    # only used to seed a new session (clients without session support)
     history: List[Dict[str, str]] = []
+    # retrieval filters (global mode only), pushed down into the vector query
+    category_id: Optional[int] = None
+    published_after: Optional[datetime] = None
+    published_before: Optional[datetime] = None
 
 class ChatSource(BaseModel):
     article_id: str
@@ -68,6 +70,7 @@ class ChatSource(BaseModel):
 class ChatResponse(BaseModel):
     answer: str
     sources: List[ChatSource]
+    session_id: Optional[str] = None
 
 
 # ------------------------- Helpers -------------------------
@@ -81,27 +84,39 @@ def is_latest_request(text: str) -> bool:
     t = text.lower()
     return any(k in t for k in ("latest", "recent", "today", "today's news", "top news"))
 
-def extract_answer_from_result(result):
-    if hasattr(result, "content"):
-        return result.content
-    if hasattr(result, "text"):
-        return result.text
-    if isinstance(result, dict):
-        for k in ("content", "text", "answer"):
-            if k in result: 
-                q1
-                return result[k]
-    return str(result)
+def run_llm(question: str, context: str, history: List[BaseMessage]) -> str:
+    # Run the LLM through the shared gateway; provider failures map to 503 / 504
+    try:
+        messages = prompt.format_messages(
+            question=question,
+            context=context,
+            history=history,
+        )
+        answer = llm_gateway.invoke(messages, model=GROQ_MODEL, temperature=TEMPERATURE)
+    except llm_gateway.LLMError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        print(f"LLM Error: {e}")
+        answer = "I'm sorry, I'm having trouble processing that right now."
+    return answer
 
+def answer_from_headlines(question: str, history: List[BaseMessage]) -> ChatResponse:
+    try:
+        block = get_latest_headlines()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"headlines lookup failed: {e}")
 
-# ------------------------- Endpoint -------------------------
+    if not block["context"].strip():
+        return ChatResponse(
+            answer="I searched the latest feed but couldn't find any relevant news stories right now.",
+            sources=[]
+        )
 
-@router.post("/", response_model=ChatResponse)
-def chat(payload: ChatRequest):
-    question = payload.question.strip()
-    if payload.mode == "local" and not payload.article_id:
-        raise HTTPException(status_code=400, detail="article_id required for local")
+    answer = run_llm(question, block["context"], history)
+    return ChatResponse(answer=answer, sources=[ChatSource(**src) for src in block["sources"]])
 
+
+def answer_question(payload: ChatRequest, question: str, history: List[BaseMessage]) -> ChatResponse:
     # 1) Greeting short-circuit
     
     if is_greeting(question):
@@ -110,16 +125,24 @@ def chat(payload: ChatRequest):
             sources=[]
         )
 
-    # 2) Retrieve vector search docs
+    # 2) 'latest' intent: answer from the precomputed headlines block, no embedding / vector search
+    unfiltered = payload.category_id is None and not (payload.published_after or payload.published_before)
+    if payload.mode == "global" and unfiltered and is_latest_request(question):
+        return answer_from_headlines(question, history)
+
+    # 3) Retrieve vector search docs
     try:
-        # Pre-process query for 'latest' intent to ensure semantic search hits relevant dates/topics
-        search_query = question if not is_latest_request(question) else "latest top news headlines"
-        
         docs = search_chunks(
-            query=search_query,
+            query=question,
             mode=payload.mode,
             article_id=payload.article_id,
-            k=5 
+            # wider candidate pool; the context packer picks what fits the token budget
+            k=settings.CHAT_RETRIEVAL_CANDIDATES,
+            category_id=payload.category_id,
+            published_after=payload.published_after,
+            published_before=payload.published_before,
+            # room for adjacent chunks to merge, without one article filling the pool
+            max_per_article=4 if payload.mode == "global" else None,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"search failed: {e}")
@@ -131,61 +154,49 @@ def chat(payload: ChatRequest):
             sources=[]
         )
 
-    # Build context
-    context = "\n\n".join(d.page_content for d in docs if getattr(d, "page_content", None))
+    # Build context: merge adjacent chunks, diversify across articles, cut to the token budget
+    context, passages = pack_context(docs)
     if not context.strip():
         return ChatResponse(
             answer="I searched the latest feed but couldn't find any relevant news content.",
             sources=[]
         )
 
-    # Convert frontend history to LangChain messages
-    history_messages = []
-    for msg in payload.history:
-        role = msg.get("role")
-        content = msg.get("content")
-        if role == "user":
-            history_messages.append(HumanMessage(content=content))
-        elif role in ["assistant", "bot"]:
-            history_messages.append(AIMessage(content=content))
-
-    # Run LangChain Groq LLM
-    try:
-        chain = prompt | llm
-        raw_result = chain.invoke({
-            "question": question,
-            "context": context,
-            "history": history_messages
-        })
-        answer = extract_answer_from_result(raw_result)
-        if not isinstance(answer, str):
-            answer = str(answer)
-    except Exception as e:
-        print(f"LLM Error: {e}")
-        answer = "I'm sorry, I'm having trouble processing that right now."
+    answer = run_llm(question, context, history)
 
-    # Build sources
+    # Build sources (one per packed passage)
     srcs: List[ChatSource] = []
-    for d in docs:
-        m = getattr(d, "metadata", None) or {}
+    for p in passages:
         score = None
-        if hasattr(d, "score"):
+        if p.get("score") is not None:
             try:
-                score = float(d.score)
-            except Exception:
-                score = None
-        if score is None and "score" in m:
-            try:
-                score = float(m.get("score"))
+                score = float(p["score"])
             except Exception:
                 score = None
 
         srcs.append(ChatSource(
-            article_id=str(m.get("article_id") or ""),
-            slug=m.get("slug"),
-            category_id=m.get("category_id"),
-            snippet=(getattr(d, "page_content", "") or "")[:200],
+            article_id=str(p.get("article_id") or ""),
+            slug=p.get("slug"),
+            category_id=p.get("category_id"),
+            snippet=(p.get("text") or "")[:200],
             score=score
         ))
 
-    return ChatResponse(answer=answer, sources=srcs)
\ No newline at end of file
+    return ChatResponse(answer=answer, sources=srcs)
+
+
+# ------------------------- Endpoint -------------------------
+
+@router.post("/", response_model=ChatResponse)
+def chat(payload: ChatRequest, db: Session = Depends(get_db)):
+    question = payload.question.strip()
+    if payload.mode == "local" and not payload.article_id:
+        raise HTTPException(status_code=400, detail="article_id required for local")
+
+    # history comes from the session: recent turns verbatim + rolling summary, token-budgeted
+    session = get_or_create_session(db, payload.session_id, seed_history=payload.history)
+    response = answer_question(payload, question, build_history(session))
+
+    record_turn(db, session.id, question, response.answer)
+    response.session_id = str(session.id)
+    return response
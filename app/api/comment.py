@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_user, require_roles, ensure_comment_delete_permission
-from app.db import models
+from app.db.keyset import InvalidCursor
 from app.schemas.comment import CommentCreate, CommentRead
+from app.schemas.pagination import CursorPage
+from app.api.responses import cursor_response
 from app.services.comment_service import (
     create_comment,
     get_comment,
     list_comments_for_article,
+    list_comments_for_user,
     delete_comment,
 )
 from app.services.article_service import get_article
@@ -29,10 +34,18 @@ def create_new_comment(
     return comment
 
 
-@router.get("/article/{article_id}", response_model=list[CommentRead])
-def get_comments_for_article(article_id: str, db: Session = Depends(get_db)):
-    comments = list_comments_for_article(db, article_id)
-    return comments
+@router.get("/article/{article_id}", response_model=CursorPage[CommentRead])
+def get_comments_for_article(
+    article_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    try:
+        comments, next_cursor = list_comments_for_article(db, article_id, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return cursor_response(CommentRead, comments, next_cursor, limit)
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -45,16 +58,15 @@ def delete_single_comment(
     return None
 
 
-@router.get("/me", response_model=list[CommentRead])
+@router.get("/me", response_model=CursorPage[CommentRead])
 def get_my_comments(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    comments = (
-        db.query(models.Comment)
-        .options(joinedload(models.Comment.article))
-        .filter(models.Comment.user_id == current_user.id)
-        .order_by(models.Comment.created_at.desc())
-        .all()
-    )
-    return comments
+    try:
+        comments, next_cursor = list_comments_for_user(db, current_user.id, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return cursor_response(CommentRead, comments, next_cursor, limit)
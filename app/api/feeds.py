@@ -0,0 +1,63 @@
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.core.config import settings
+from app.services.category_service import get_category_by_slug
+from app.services.feed_service import get_feed, get_sitemap
+
+router = APIRouter(tags=["feeds"])
+
+
+def _not_modified(request: Request, doc: dict) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or doc["etag"] in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).astimezone(timezone.utc).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+        return doc["last_modified"].replace(microsecond=0) <= since
+    return False
+
+
+def _serve(request: Request, doc: dict) -> Response:
+    headers = {
+        "etag": doc["etag"],
+        "last-modified": format_datetime(doc["last_modified"].replace(tzinfo=timezone.utc), usegmt=True),
+        "cache-control": f"public, max-age={settings.FEED_CACHE_MAX_AGE}",
+    }
+    if _not_modified(request, doc):
+        return Response(status_code=304, headers=headers)
+    return Response(content=doc["body"], media_type=doc["media_type"], headers=headers)
+
+
+@router.get("/feeds/rss.xml")
+def rss_feed(request: Request):
+    return _serve(request, get_feed("rss"))
+
+
+@router.get("/feeds/atom.xml")
+def atom_feed(request: Request):
+    return _serve(request, get_feed("atom"))
+
+
+@router.get("/feeds/category/{slug}/{kind}.xml")
+def category_feed(slug: str, kind: str, request: Request, db: Session = Depends(get_db)):
+    if kind not in ("rss", "atom"):
+        raise HTTPException(status_code=404, detail="Feed not found")
+    category = get_category_by_slug(db, slug)
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return _serve(request, get_feed(kind, category))
+
+
+@router.get("/sitemap.xml")
+def sitemap(request: Request):
+    return _serve(request, get_sitemap())
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_user, require_roles
-from app.schemas.like import LikeCreate, LikeRead
+from app.api.responses import cursor_response
+from app.db.keyset import InvalidCursor
+from app.schemas.like import LikeCard, LikeCreate, LikeRead
+from app.schemas.pagination import CursorPage
 from app.services.like_service import (
     create_like,
     get_like_by_user_and_article,
+    list_likes_for_user,
     remove_like,
 )
 from app.services.article_service import get_article
@@ -30,6 +36,20 @@ def like_article(
     return like
 
 
+@router.get("/me", response_model=CursorPage[LikeCard])
+def get_my_likes(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        likes, next_cursor = list_likes_for_user(db, current_user.id, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return cursor_response(LikeCard, likes, next_cursor, limit)
+
+
 @router.delete("/{article_id}", status_code=status.HTTP_204_NO_CONTENT,
                dependencies=[Depends(require_roles("reader", "author", "editor", "admin"))])
 def unlike_article(
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_user
+from app.schemas.article_state import ArticleStateRequest, ArticleStateResponse
+from app.services.article_state_service import get_article_states
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+
+@router.post("/article-state", response_model=ArticleStateResponse)
+def article_state(
+    data: ArticleStateRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """liked / bookmarked flags for a page of articles."""
+    return {"states": get_article_states(db, current_user.id, data.article_ids)}
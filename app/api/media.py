@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import get_db, get_current_user, require_roles, ensure_media_manage_permission
+from app.core.config import settings
 from app.schemas.media import MediaRead, MediaCreate
 from app.services.media_service import (
-    save_file_locally,
+    stage_request_uploads,
     create_media_record,
+    create_media_records,
+    attach_blob,
     delete_media,
     get_media,
 )
@@ -14,20 +19,72 @@ from app.services.article_service import get_article
 router = APIRouter(prefix="/media", tags=["media"])
 
 
-@router.post("/upload", response_model=MediaRead, status_code=status.HTTP_201_CREATED)
-def upload_media(
+def _multipart_body(field: str, multiple: bool) -> dict:
+    # the body is parsed by stage_request_uploads, so the schema is declared for the docs
+    file_schema = {"type": "string", "format": "binary"}
+    schema = {"type": "array", "items": file_schema} if multiple else file_schema
+    return {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+        "type": "object", "properties": {field: schema}, "required": [field],
+    }}}}}
+
+
+def _check_article(db: Session, article_id: str, current_user):
+    """Permission / existence check; returns the article id with the session's transaction ended."""
+    ensure_media_manage_permission(article_id, db=db, current_user=current_user)
+    article = get_article(db, article_id, current_user=current_user)
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    article_id = article.id
+    # the connection goes back to the pool while the body streams in
+    db.commit()
+    return article_id
+
+
+# async so the body is read here, after the permission checks, and streamed to
+# disk as it arrives (size limit, type check and hashing while receiving)
+@router.post("/upload", response_model=MediaRead, status_code=status.HTTP_201_CREATED,
+             openapi_extra=_multipart_body("file", multiple=False))
+async def upload_media(
+    article_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    await run_in_threadpool(_check_article, db, article_id, current_user)
+    staged = await stage_request_uploads(request, "file", max_files=1)
+    data = MediaCreate(article_id=article_id)
+    # create_media_records discards the staged files if it fails
+    return await run_in_threadpool(create_media_record, db, data, staged[0])
+
+
+@router.post("/upload/batch", response_model=List[MediaRead], status_code=status.HTTP_201_CREATED,
+             openapi_extra=_multipart_body("files", multiple=True))
+async def upload_media_batch(
     article_id: str,
-    file: UploadFile = File(...),
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    article_id = await run_in_threadpool(_check_article, db, article_id, current_user)
+    staged = await stage_request_uploads(request, "files", max_files=settings.MEDIA_MAX_FILES_PER_UPLOAD)
+    return await run_in_threadpool(create_media_records, db, article_id, staged)
+
+
+@router.post("/attach", response_model=MediaRead, status_code=status.HTTP_201_CREATED)
+def attach_media(
+    article_id: str,
+    sha256: str,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Attach an already uploaded file (by content hash) without sending it again."""
     _ = ensure_media_manage_permission(article_id, db=db, current_user=current_user)
     article = get_article(db, article_id, current_user=current_user)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
-    file_url, mime_type, file_size = save_file_locally(file)
-    data = MediaCreate(article_id=article_id)
-    media = create_media_record(db, data, url=file_url, mime_type=mime_type, size=file_size)
+    media = attach_blob(db, MediaCreate(article_id=article_id), sha256.lower())
+    if not media:
+        raise HTTPException(status_code=404, detail="Blob not found")
     return media
 
 
@@ -0,0 +1,65 @@
+"""
+Fast JSON responses for hot read endpoints.
+
+Returning ORM objects (or already validated models) through `response_model`
+makes FastAPI validate the payload again and then serialize it through
+jsonable_encoder + json.dumps. These helpers validate the ORM objects once and
+serialize straight to bytes with pydantic-core (TypeAdapter.dump_json); a
+Response returned from a route skips FastAPI's response_model processing, so
+keep `response_model` on the route for the OpenAPI schema only.
+"""
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.schemas.pagination import CursorPage, PaginatedResponse
+
+
+class RawJSONResponse(Response):
+    """Response whose content is already-encoded JSON bytes."""
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+def dump_json(tp: Any, value: Any) -> bytes:
+    return _adapter(tp).dump_json(value)
+
+
+def model_response(model: Type[BaseModel], obj: Any, status_code: int = 200) -> RawJSONResponse:
+    """One ORM object -> `model` JSON."""
+    return RawJSONResponse(dump_json(model, model.model_validate(obj)), status_code=status_code)
+
+
+def list_response(model: Type[BaseModel], objs: Iterable[Any]) -> RawJSONResponse:
+    """ORM objects -> JSON array of `model`."""
+    items = [model.model_validate(o) for o in objs]
+    return RawJSONResponse(dump_json(List[model], items))
+
+
+def paginated_response(model: Type[BaseModel], objs: Iterable[Any], total: int, page: int, limit: int) -> RawJSONResponse:
+    """ORM objects -> PaginatedResponse[model] JSON; the envelope itself is not re-validated."""
+    envelope_type = PaginatedResponse[model]
+    envelope = envelope_type.model_construct(
+        items=[model.model_validate(o) for o in objs],
+        total=total,
+        page=page,
+        limit=limit,
+    )
+    return RawJSONResponse(dump_json(envelope_type, envelope))
+
+
+def cursor_response(model: Type[BaseModel], objs: Iterable[Any], next_cursor, limit: int) -> RawJSONResponse:
+    """ORM objects -> CursorPage[model] JSON."""
+    envelope_type = CursorPage[model]
+    envelope = envelope_type.model_construct(
+        items=[model.model_validate(o) for o in objs],
+        next_cursor=next_cursor,
+        limit=limit,
+    )
+    return RawJSONResponse(dump_json(envelope_type, envelope))
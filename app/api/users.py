@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Literal, Optional
 from app.api.deps import get_db, require_roles, get_current_user
+from app.api.responses import cursor_response
+from app.db.enums import RoleEnum
+from app.db.keyset import InvalidCursor
+from app.schemas.pagination import CursorPage
+from app.services.export_service import EXPORT_FORMATS, export_users
 from app.services.user_service import get_user_by_email, get_user_by_id, create_user, list_users, update_user_role, toggle_user_activation, delete_user, update_user
 from app.schemas.user import UserCreate, UserRead, UserUpdate
 
@@ -13,9 +19,34 @@ def read_current_user(current_user = Depends(get_current_user)):
     return current_user
 
 
-@router.get("/", response_model=List[UserRead], dependencies=[Depends(require_roles("admin"))])
-def admin_list_users(db: Session = Depends(get_db)):
-    return list_users(db)
+@router.get("/", response_model=CursorPage[UserRead], dependencies=[Depends(require_roles("admin"))])
+def admin_list_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    role: Optional[RoleEnum] = None,
+    is_active: Optional[bool] = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        users, next_cursor = list_users(db, limit, cursor, role, is_active)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return cursor_response(UserRead, users, next_cursor, limit)
+
+
+# declared before /{user_id} so "export" isn't taken for an id
+@router.get("/export", dependencies=[Depends(require_roles("admin"))])
+def admin_export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    role: Optional[RoleEnum] = None,
+    is_active: Optional[bool] = None,
+):
+    """All matching users, streamed (constant memory)."""
+    return StreamingResponse(
+        export_users(format, role, is_active),
+        media_type=EXPORT_FORMATS[format],
+        headers={"content-disposition": f'attachment; filename="users.{format}"'},
+    )
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_roles("admin"))])
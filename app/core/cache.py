@@ -0,0 +1,58 @@
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache with per-entry expiry.
+    Each worker process keeps its own copy, so entries should be cheap to rebuild.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._data: dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._evict_locked()
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def items(self) -> list:
+        """Snapshot of the live (key, value) pairs."""
+        now = time.monotonic()
+        with self._lock:
+            return [(k, v) for k, (expires_at, v) in self._data.items() if expires_at >= now]
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict_locked(self):
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _) in self._data.items() if expires_at < now]
+        for k in expired:
+            del self._data[k]
+        if len(self._data) >= self.maxsize:
+            # drop the entry closest to expiry
+            oldest = min(self._data, key=lambda k: self._data[k][0])
+            del self._data[oldest]
@@ -0,0 +1,196 @@
+import zlib
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# already compressed (or streamed event by event): sent as is
+SKIP_MEDIA_TYPES = {
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "application/x-7z-compressed",
+    "application/x-bzip2",
+    "application/x-rar-compressed",
+    "application/pdf",
+    "font/woff",
+    "font/woff2",
+    "text/event-stream",
+}
+SKIP_MEDIA_PREFIXES = ("image/", "video/", "audio/")
+# svg is text
+COMPRESSIBLE_IMAGES = {"image/svg+xml"}
+
+
+def compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if not media_type or media_type in COMPRESSIBLE_IMAGES:
+        return True
+    return media_type not in SKIP_MEDIA_TYPES and not media_type.startswith(SKIP_MEDIA_PREFIXES)
+
+
+def available_encodings() -> List[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Best of br / gzip the client accepts (q > 0), br preferred on ties; None for identity."""
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        offered[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = offered.get(encoding, offered.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(mode=brotli.MODE_TEXT, quality=brotli_quality)
+        else:
+            # wbits 31: gzip container
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it, so streamed chunks reach the client right away."""
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.finish()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI gzip / brotli response compression.
+
+    - encoding negotiated from Accept-Encoding (q-values; br preferred when available)
+    - bodies sent in one message below `minimum_size` go out uncompressed
+    - streamed bodies (more_body) are compressed chunk by chunk with a flush
+      per chunk, without buffering the response
+    - images, archives, fonts, event streams, ranges and responses that already
+      carry a Content-Encoding are passed through
+    Strong ETags on compressed responses are made weak (the bytes differ).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None,
+    ):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+        self.gzip_level = settings.COMPRESSION_GZIP_LEVEL if gzip_level is None else gzip_level
+        self.brotli_quality = settings.COMPRESSION_BROTLI_QUALITY if brotli_quality is None else brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        # None until the first body message decides
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    def _eligible(self, headers: Headers) -> bool:
+        return (
+            self.start["status"] not in (204, 206, 304)
+            and "content-encoding" not in headers
+            and "content-range" not in headers
+            and compressible(headers.get("content-type", ""))
+        )
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = MutableHeaders(raw=message["headers"])
+            if self._eligible(headers):
+                headers.add_vary_header("Accept-Encoding")
+            else:
+                self.passthrough = True
+                await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] != "http.response.body":
+            # e.g. http.response.pathsend: nothing to compress
+            if self.start is not None:
+                await self._send(self.start)
+                self.start = None
+            self.passthrough = True
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            headers["content-encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["etag"] = f"W/{etag}"
+            if more_body:
+                # length unknown up front: chunked transfer
+                if "content-length" in headers:
+                    del headers["content-length"]
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": self.compressor.compress(body), "more_body": True})
+            else:
+                data = self.compressor.finish(body)
+                headers["content-length"] = str(len(data))
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": data})
+            return
+
+        data = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
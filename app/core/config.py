@@ -11,6 +11,90 @@ class Settings(BaseSettings):
     CHROMA_PERSIST_DIR:str
     CHROMA_COLLECTION_NAME:str
     GROQ_MODEL:str
+    GROQ_SUMMARY_MODEL:str="llama-3.3-70b-versatile"
+
+    # LLM gateway (app/services/llm_gateway.py); LLM_BACKEND "groq" or "fake" (local, for tests)
+    LLM_BACKEND:str="groq"
+    LLM_TIMEOUT_SECONDS:float=30
+    LLM_MAX_RETRIES:int=2
+    LLM_RETRY_BASE_DELAY:float=0.5
+    LLM_REQUESTS_PER_MINUTE:int=30  # per model
+    LLM_TOKENS_PER_MINUTE:int=12000
+    LLM_EXPECTED_OUTPUT_TOKENS:int=300
+    LLM_CIRCUIT_FAILURES:int=5
+    LLM_CIRCUIT_RESET_SECONDS:float=30
+    LLM_HEDGE_AFTER_SECONDS:float=0  # 0 disables hedging
+    LLM_FAKE_LATENCY_SECONDS:float=0
+
+    # vector search backend: "chroma" or "numpy" (read-only snapshot built by manage.py build-vector-index)
+    VECTOR_BACKEND:str="chroma"
+    NUMPY_INDEX_DIR:str="vector_index"
+    NUMPY_INDEX_DTYPE:str="int8"
+
+    # summarizer: map-reduce mode for long articles (sizes in characters)
+    SUMMARY_MAP_REDUCE_THRESHOLD:int=12000
+    SUMMARY_CHUNK_SIZE:int=6000
+    SUMMARY_MAX_CONCURRENCY:int=4
+    # a pending summary claim older than this is presumed dead and taken over
+    SUMMARY_CLAIM_TIMEOUT_SECONDS:int=180
+
+    # media uploads
+    MEDIA_MAX_UPLOAD_BYTES:int=10*1024*1024
+    MEDIA_MAX_FILES_PER_UPLOAD:int=20
+    # derivatives: name -> max width in px, each as WebP plus a JPEG / PNG fallback
+    MEDIA_VARIANT_WIDTHS:dict[str,int]={"thumb":160,"card":480,"hero":1280}
+    MEDIA_VARIANT_QUALITY:int=80
+    MEDIA_VARIANT_WORKERS:int=2
+    # serving: max-age for immutable (content-addressed / uuid) files; X-Accel-Redirect
+    # prefix of an nginx internal location aliased to uploads/media ("" serves from Python)
+    MEDIA_CACHE_MAX_AGE:int=31536000
+    MEDIA_ACCEL_REDIRECT_PREFIX:str=""
+
+    # response compression (app/core/compression.py); defaults from benchmarks/compression_bench.py
+    COMPRESSION_MINIMUM_SIZE:int=1024
+    COMPRESSION_GZIP_LEVEL:int=6
+    COMPRESSION_BROTLI_QUALITY:int=5
+
+    # public site (links in feeds / sitemap point to the frontend)
+    SITE_URL:str="http://localhost:3000"
+    SITE_NAME:str="News Portal"
+    # RSS / Atom / sitemap (app/services/feed_service.py): items per feed, how long a
+    # worker keeps a rendered document, Cache-Control max-age sent to clients
+    FEED_ITEM_LIMIT:int=50
+    FEED_TTL_SECONDS:int=600
+    FEED_CACHE_MAX_AGE:int=300
+
+    # scheduled publishing (python manage.py scheduler)
+    SCHEDULER_INTERVAL_SECONDS:int=30
+    SCHEDULER_BATCH_SIZE:int=100
+
+    # query observatory (app/db/observatory.py): latency per statement fingerprint, EXPLAIN
+    # plans of statements slower than QUERY_SLOW_MS (once per fingerprint per interval)
+    QUERY_OBSERVATORY_ENABLED:bool=True
+    QUERY_SLOW_MS:float=200
+    QUERY_EXPLAIN_INTERVAL_SECONDS:int=300
+    QUERY_EXPLAIN_TIMEOUT_MS:int=10000
+    QUERY_OBSERVATORY_MAX_FINGERPRINTS:int=500
+
+    # dashboard counters cache (app/services/dashboard_service.py)
+    DASHBOARD_STATS_TTL_SECONDS:int=30
+
+    # chat: retrieval context packing (app/services/context_packer.py)
+    CHAT_RETRIEVAL_CANDIDATES:int=12
+    CHAT_CONTEXT_TOKEN_BUDGET:int=1500
+    CHAT_MMR_LAMBDA:float=0.7
+
+    # chat: server-side sessions (history budget in estimated tokens)
+    CHAT_SESSION_TTL_MINUTES:int=1440
+    CHAT_HISTORY_TOKEN_BUDGET:int=1200
+    CHAT_HISTORY_RECENT_TURNS:int=6
+    CHAT_SUMMARY_FOLD_TURNS:int=6
+    CHAT_SUMMARY_MAX_WORDS:int=150
+    CHAT_TURN_MAX_CHARS:int=2000
+
+    # chat: precomputed "latest headlines" context
+    LATEST_HEADLINES_LIMIT:int=10
+    LATEST_HEADLINES_TTL_SECONDS:int=300
 
     class Config:
         env_file='.env'
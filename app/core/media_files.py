@@ -0,0 +1,55 @@
+import os
+import re
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.config import settings
+
+# blobs/<..>/<sha256>.<ext>: the name is the content hash
+_CONTENT_ADDRESSED = re.compile(r"^([0-9a-f]{64})\.\w+$")
+# files that are never rewritten under the same name: variants named after their render spec
+# (<sha256>-<name>-<width>w[-q<quality>]; older spec-less variant names were re-rendered in
+# place and are not), uuid4 uploads
+_IMMUTABLE = re.compile(
+    r"^(?:[0-9a-f]{64}-[\w-]+-\d+w(?:-q\d+)?|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\.\w+$"
+)
+
+
+class MediaStaticFiles(StaticFiles):
+    """
+    StaticFiles for uploads/media with a caching policy:
+    - content-addressed and uuid-named files are served with a long max-age and
+      `immutable`, so browsers and proxies stop revalidating them
+    - content-addressed files get their sha256 as a strong ETag (no stat/rehash needed)
+    - byte ranges are handled by FileResponse
+    - with MEDIA_ACCEL_REDIRECT_PREFIX set, the body is left to nginx
+      (X-Accel-Redirect to an internal location, which can use sendfile)
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        name = os.path.basename(full_path)
+
+        headers = {}
+        match = _CONTENT_ADDRESSED.match(name)
+        if match:
+            headers["etag"] = f'"{match.group(1)}"'
+        if match or _IMMUTABLE.match(name):
+            headers["cache-control"] = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable"
+        else:
+            headers["cache-control"] = "public, max-age=0, must-revalidate"
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+
+        prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX
+        if prefix:
+            relpath = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+            accel_headers = {k: v for k, v in response.headers.items() if k in ("etag", "cache-control", "last-modified")}
+            accel_headers["x-accel-redirect"] = f"{prefix.rstrip('/')}/{relpath}"
+            return Response(status_code=status_code, headers=accel_headers, media_type=response.media_type)
+        return response
@@ -10,6 +10,7 @@ class ArticleStatus(PyEnum):
     draft = "draft"
     pending_review = "pending_review"
     rejected = "rejected"
+    scheduled = "scheduled"
     published = "published"
     archived = "archived"
 
@@ -0,0 +1,99 @@
+"""
+Keyset (seek) pagination.
+
+Pages are ordered by a unique key, e.g. (created_at, id), and the next page
+starts after the last row of the previous one (WHERE (created_at, id) > (:c, :i))
+instead of skipping OFFSET rows, so every page costs the same with an index on
+the key, however deep the client scrolls. The position is handed to the client
+as an opaque cursor.
+"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _decode_value(value: Any):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "uuid" in value:
+            return uuid.UUID(value["uuid"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _python_type(column) -> Optional[type]:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """
+    Cursor values for `columns`; each must have its column's Python type, so a
+    tampered cursor is a 400 rather than a database error.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [_decode_value(v) for v in json.loads(raw)]
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if len(values) != len(columns):
+        raise InvalidCursor("Invalid cursor")
+    for value, column in zip(values, columns):
+        expected = _python_type(column)
+        if expected is None:
+            continue
+        # bool is an int subclass
+        if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+            raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def keyset_page(
+    query: Query,
+    columns: Sequence,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Tuple[list, Optional[str]]:
+    """
+    One page of `query` ordered by `columns` (which must identify a row uniquely).
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    Raises InvalidCursor for a cursor that can't be decoded.
+    """
+    key = tuple_(*columns)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(key < after if descending else key > after)
+    order = [c.desc() for c in columns] if descending else [c.asc() for c in columns]
+    # one extra row tells whether there is a next page
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    items = rows[:limit]
+    if len(rows) <= limit:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor([getattr(last, c.key) for c in columns])
@@ -4,4 +4,8 @@ from .article import Article
 from .like import Like
 from .comment import Comment
 from .media import Media
-from .bookmark import Bookmark
\ No newline at end of file
+from .media_blob import MediaBlob
+from .media_variant import MediaVariant
+from .bookmark import Bookmark
+from .summary import ArticleSummary
+from .chat_session import ChatSession
\ No newline at end of file
@@ -8,6 +8,8 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
@@ -19,11 +21,45 @@ class ArticleStatus(PyEnum):
     draft = "draft"
     pending_review = "pending_review"
     rejected = "rejected"
+    # approved, published by the scheduler at publish_at
+    scheduled = "scheduled"
     published = "published"
     archived = "archived"
 
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        # the scheduler's scan for due articles; only scheduled rows are indexed
+        Index(
+            "ix_articles_scheduled_publish_at",
+            "publish_at",
+            postgresql_where=text("status = 'scheduled'"),
+        ),
+        # listings (article_service): status filter + newest first, per category, per author
+        Index("ix_articles_status_created_at", "status", "created_at"),
+        Index("ix_articles_category_status_created_at", "category_id", "status", "created_at"),
+        Index("ix_articles_author_created_at", "author_id", "created_at"),
+        # search sorted by likes / views
+        Index("ix_articles_status_likes_count", "status", "likes_count"),
+        Index("ix_articles_status_views", "status", "views"),
+        # feeds, sitemap and headlines: published articles by publish_at, falling back to created_at
+        Index(
+            "ix_articles_published_on",
+            text("coalesce(publish_at, created_at)"),
+            postgresql_where=text("status = 'published'"),
+        ),
+        # article export (export_service): published articles by last change, id as tiebreaker
+        Index(
+            "ix_articles_published_changed_id",
+            text("coalesce(updated_at, created_at)"),
+            "id",
+            postgresql_where=text("status = 'published'"),
+        ),
+        # search: ILIKE '%q%' on title / summary / content (pg_trgm)
+        Index("ix_articles_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_articles_summary_trgm", "summary", postgresql_using="gin", postgresql_ops={"summary": "gin_trgm_ops"}),
+        Index("ix_articles_content_trgm", "content", postgresql_using="gin", postgresql_ops={"content": "gin_trgm_ops"}),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(500), nullable=False)
@@ -36,18 +72,18 @@ class Article(Base):
     source_url = Column(String(2048), nullable=True)
     views = Column(Integer, default=0, nullable=False)
     likes_count = Column(Integer, default=0, nullable=False)
+    # kept in step by comment_service (atomic UPDATE in the comment's transaction)
+    comments_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     author_id = Column(
         PG_UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     category_id = Column(
         Integer,
         ForeignKey("categories.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
     )
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,20 +1,23 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
 class Bookmark(Base):
     __tablename__ = "bookmarks"
-    __table_args__ = (UniqueConstraint("user_id", "article_id", name="uq_user_article_bookmark"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "article_id", name="uq_user_article_bookmark"),
+        # keyset pagination of a user's list on (created_at, id)
+        Index("ix_bookmarks_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(
         PG_UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     article_id = Column(
         PG_UUID(as_uuid=True),
@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, Integer, Text, DateTime
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
+from app.db.session import Base
+
+
+class ChatSession(Base):
+    __tablename__ = "chat_sessions"
+
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # turns not yet folded into the summary: [{"role": "user"|"assistant", "content": str}, ...]
+    turns = Column(JSONB, nullable=False, default=list)
+    # rolling summary of older turns
+    summary = Column(Text, nullable=False, default="")
+    # number of turns folded into the summary so far
+    folded_turns = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Text, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -14,19 +14,22 @@ class CommentStatus(PyEnum):
 
 class Comment(Base):
     __tablename__ = "comments"
+    # keyset pagination per article / per user on (created_at, id)
+    __table_args__ = (
+        Index("ix_comments_article_created_id", "article_id", "created_at", "id"),
+        Index("ix_comments_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     article_id = Column(
         PG_UUID(as_uuid=True),
         ForeignKey("articles.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     user_id = Column(
         PG_UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -18,7 +18,22 @@ class Media(Base):
     url = Column(String(2048), nullable=False)
     mime_type = Column(String(100), nullable=True)
     size = Column(Integer, nullable=True)
+    # content-addressed file (NULL for uploads stored before deduplication)
+    blob_sha256 = Column(
+        String(64),
+        ForeignKey("media_blobs.sha256", name="fk_media_blob_sha256"),
+        nullable=True,
+        index=True,
+    )
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     article = relationship("Article", back_populates="media")
+    # derivatives belong to the blob, so every Media row sharing it sees them
+    variants = relationship(
+        "MediaVariant",
+        primaryjoin="foreign(MediaVariant.blob_sha256) == Media.blob_sha256",
+        viewonly=True,
+        lazy="selectin",
+        order_by="MediaVariant.width",
+    )
 
@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime
+from app.db.session import Base
+
+
+class MediaBlob(Base):
+    """Content-addressed file under uploads/media/blobs; Media rows reference it by sha256."""
+    __tablename__ = "media_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    # relative to the uploads/media root, e.g. blobs/ab/cd/<sha256>.jpg
+    path = Column(String(512), nullable=False)
+    mime_type = Column(String(100), nullable=True)
+    size = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
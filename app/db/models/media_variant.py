@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from app.db.session import Base
+
+
+class MediaVariant(Base):
+    """Resized / re-encoded derivative of a media blob (thumbnail, card, hero)."""
+    __tablename__ = "media_variants"
+    __table_args__ = (
+        UniqueConstraint("blob_sha256", "name", "format", name="uq_media_variant"),
+    )
+
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    blob_sha256 = Column(
+        String(64),
+        ForeignKey("media_blobs.sha256", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    name = Column(String(50), nullable=False)
+    format = Column(String(10), nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    size = Column(Integer, nullable=False)
+    # relative to the uploads/media root
+    path = Column(String(512), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    @property
+    def url(self) -> str:
+        return f"/media/{self.path}"
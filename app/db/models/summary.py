@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from app.db.session import Base
+
+
+class ArticleSummary(Base):
+    __tablename__ = "article_summaries"
+    __table_args__ = (
+        UniqueConstraint("article_id", "content_hash", "model", name="uq_article_summary_version"),
+    )
+
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    article_id = Column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # sha256 of the summarized content
+    content_hash = Column(String(64), nullable=False)
+    model = Column(String(100), nullable=False)
+    # NULL while a worker is generating it (a claim); created_at is then the claim time
+    summary = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
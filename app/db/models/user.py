@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -9,6 +9,11 @@ from app.db.enums import RoleEnum
 
 class User(Base):
     __tablename__ = "users"
+    # admin list: keyset on (created_at, id), optionally filtered by role / is_active
+    __table_args__ = (
+        Index("ix_users_created_id", "created_at", "id"),
+        Index("ix_users_role_active_created_id", "role", "is_active", "created_at", "id"),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(320), unique=True, nullable=False, index=True)
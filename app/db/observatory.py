@@ -0,0 +1,318 @@
+"""
+Query observatory: per-statement latency histograms and EXPLAIN plans of slow queries.
+
+Engine event hooks record every statement under its fingerprint (literals and
+bind parameters replaced by ?, IN lists collapsed), so
+`... WHERE id = %(id_1)s` from any request lands in the same bucket. Per
+fingerprint: calls, total / max time and a fixed-bucket latency histogram
+(percentiles are bucket upper bounds).
+
+A statement slower than QUERY_SLOW_MS gets its plan captured in the
+background on a separate connection, at most once per fingerprint every
+QUERY_EXPLAIN_INTERVAL_SECONDS:
+- plain reads (SELECT ... FROM user tables calling only the side-effect free
+  functions in READ_ONLY_FUNCTIONS): EXPLAIN (ANALYZE, BUFFERS), i.e.
+  executed again, in a rolled back transaction under QUERY_EXPLAIN_TIMEOUT_MS
+- everything else (writes, locking reads, advisory locks, nextval, ...):
+  plain EXPLAIN, not executed
+plan_hints() reads a plan for what an index would fix (sequential scans that
+discard most rows, large or spilled sorts); the admin report
+(GET /dashboard/queries) lists the top offenders with their hints next to
+pg_stat_user_tables scan counters.
+
+Numbers are per worker process, like the LLM metrics.
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+# histogram bucket upper bounds in ms (the last one catches everything slower)
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+# statements past the fingerprint limit are counted here
+OTHER = "(other)"
+# plan nodes reading fewer rows than this are not worth an index hint
+ADVISOR_MIN_ROWS = 1000
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+_LOCKING_READ = re.compile(r"\bFOR (?:NO KEY )?UPDATE\b|\bFOR (?:KEY )?SHARE\b", re.IGNORECASE)
+_FROM_USER_TABLE = re.compile(r"\bFROM\s+(?!pg_|information_schema\.)", re.IGNORECASE)
+_CALL = re.compile(r"([A-Za-z_][\w.]*)\s*\(")
+# words followed by "(" that are syntax, not function calls
+_SQL_KEYWORDS = frozenset((
+    "all", "and", "any", "array", "as", "between", "by", "case", "cast", "else", "exists", "filter",
+    "from", "in", "is", "join", "lateral", "like", "ilike", "not", "on", "or", "over", "row",
+    "select", "some", "then", "using", "values", "when", "where", "with",
+))
+# functions a statement may call and still be executed by EXPLAIN ANALYZE
+READ_ONLY_FUNCTIONS = frozenset((
+    "abs", "array_agg", "avg", "bool_and", "bool_or", "coalesce", "count", "date_trunc", "greatest",
+    "least", "length", "lower", "max", "min", "nullif", "round", "string_agg", "sum", "upper",
+))
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Statement with literals / parameters replaced by ? and IN lists collapsed."""
+    fp = _STRING.sub("?", statement)
+    fp = _PARAM.sub("?", fp)
+    fp = _NUMBER.sub("?", fp)
+    fp = _IN_LIST.sub("IN (...)", fp)
+    return _SPACE.sub(" ", fp).strip()
+
+
+class _Stats:
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow = 0
+        self.buckets = [0] * len(BUCKETS_MS)
+        self.plan: Optional[Dict[str, Any]] = None
+        self.plan_captured_at = 0.0
+        self.plan_pending = False
+
+    def add(self, ms: float, slow: bool):
+        self.calls += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.slow += slow
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.calls:
+            return None
+        rank, seen = p * self.calls, 0
+        for bound, count in zip(BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return round(min(bound, self.max_ms), 2)
+        return round(self.max_ms, 2)
+
+    def snapshot(self, fp: str, with_plan: bool) -> Dict[str, Any]:
+        data = {
+            "fingerprint": fp,
+            "calls": self.calls,
+            "slow_calls": self.slow,
+            "total_ms": round(self.total_ms, 2),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else None,
+            "max_ms": round(self.max_ms, 2),
+            "latency_ms_p50": self.percentile(0.50),
+            "latency_ms_p95": self.percentile(0.95),
+            "latency_ms_p99": self.percentile(0.99),
+            "histogram": {
+                ("+inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(BUCKETS_MS, self.buckets) if count
+            },
+            "hints": plan_hints(self.plan["plan"]) if self.plan else [],
+        }
+        if self.plan:
+            data["plan_captured_ms"] = self.plan["duration_ms"]
+            data["plan_analyzed"] = self.plan["analyzed"]
+            if with_plan:
+                data["plan"] = self.plan["plan"]
+        return data
+
+
+_stats: Dict[str, _Stats] = {}
+_lock = threading.Lock()
+_local = threading.local()
+# one worker: plan captures never pile up concurrent EXPLAIN ANALYZE runs
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="observatory")
+
+
+def _safe_to_execute(statement: str) -> bool:
+    """A read of user tables without locks or function calls that could have side effects."""
+    sql = _STRING.sub("?", statement)
+    if _LOCKING_READ.search(sql) or not _FROM_USER_TABLE.search(sql):
+        return False
+    for name in _CALL.findall(sql):
+        name = name.rsplit(".", 1)[-1].lower()
+        if name not in _SQL_KEYWORDS and name not in READ_ONLY_FUNCTIONS:
+            return False
+    return True
+
+
+def _explain_prefix(statement: str) -> Optional[str]:
+    """EXPLAIN options for a statement, None for statements without a plan."""
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if verb in ("SELECT", "WITH") and _safe_to_execute(statement):
+        return "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+    if verb in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
+        return "EXPLAIN (FORMAT JSON) "
+    return None
+
+
+def explain(conn, statement: str, parameters=None) -> Optional[Dict[str, Any]]:
+    """Plan of a driver-level statement on `conn` (the caller owns the transaction)."""
+    prefix = _explain_prefix(statement)
+    if prefix is None:
+        return None
+    result = conn.exec_driver_sql(prefix + statement, parameters or {}).scalar()
+    plan = result[0] if isinstance(result, list) else result
+    return {"plan": plan, "analyzed": "ANALYZE" in prefix}
+
+
+def _capture_plan(engine: Engine, fp: str, statement: str, parameters, duration_ms: float):
+    _local.capturing = True
+    captured = None
+    try:
+        with engine.connect() as conn:
+            with conn.begin() as trans:
+                conn.execute(text(f"SET LOCAL statement_timeout = {int(settings.QUERY_EXPLAIN_TIMEOUT_MS)}"))
+                captured = explain(conn, statement, parameters)
+                trans.rollback()
+    except Exception as e:
+        print(f"Query observatory: EXPLAIN failed for {fp[:120]}: {e}")
+    finally:
+        _local.capturing = False
+        with _lock:
+            stats = _stats.get(fp)
+            if stats is not None:
+                stats.plan_pending = False
+                stats.plan_captured_at = time.monotonic()
+                if captured is not None:
+                    captured["duration_ms"] = round(duration_ms, 2)
+                    stats.plan = captured
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("observatory_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("observatory_start")
+    if not starts:
+        return
+    ms = (time.perf_counter() - starts.pop()) * 1000
+    if getattr(_local, "capturing", False):
+        return
+    record(conn.engine, statement, ms, None if executemany else parameters)
+
+
+def _handle_error(context):
+    # failed statements never reach after_cursor_execute
+    if context.connection is not None:
+        starts = context.connection.info.get("observatory_start")
+        if starts:
+            starts.pop()
+
+
+def record(engine: Optional[Engine], statement: str, ms: float, parameters=None):
+    fp = fingerprint(statement)
+    slow = ms >= settings.QUERY_SLOW_MS
+    capture = False
+    with _lock:
+        stats = _stats.get(fp)
+        if stats is None:
+            if len(_stats) >= settings.QUERY_OBSERVATORY_MAX_FINGERPRINTS:
+                fp = OTHER
+            stats = _stats.setdefault(fp, _Stats(statement))
+        stats.add(ms, slow)
+        if (
+            slow
+            and engine is not None
+            and fp != OTHER
+            and not stats.plan_pending
+            and time.monotonic() - stats.plan_captured_at >= settings.QUERY_EXPLAIN_INTERVAL_SECONDS
+        ):
+            stats.plan_pending = capture = True
+    if capture:
+        _executor.submit(_capture_plan, engine, fp, statement, parameters, ms)
+
+
+def install(engine: Engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def uninstall(engine: Engine):
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+        event.remove(engine, "handle_error", _handle_error)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def _walk(node: Dict[str, Any]):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+def plan_hints(plan: Dict[str, Any]) -> List[str]:
+    """What an index would fix in an EXPLAIN (FORMAT JSON) plan."""
+    hints = []
+    for node in _walk(plan.get("Plan", plan)):
+        kind = node.get("Node Type")
+        loops = node.get("Actual Loops", 1) or 1
+        rows = node.get("Actual Rows", node.get("Plan Rows", 0)) * loops
+        if kind == "Seq Scan" and node.get("Filter"):
+            removed = node.get("Rows Removed by Filter", 0) * loops
+            if rows + removed >= ADVISOR_MIN_ROWS or node.get("Plan Rows", 0) >= ADVISOR_MIN_ROWS:
+                detail = f"{removed} rows removed" if "Rows Removed by Filter" in node else f"~{node.get('Plan Rows')} rows estimated"
+                hints.append(
+                    f"Seq Scan on {node.get('Relation Name')} filtering {node['Filter']} ({detail}): "
+                    "index the filtered columns"
+                )
+        elif kind in ("Sort", "Incremental Sort"):
+            keys = ", ".join(node.get("Sort Key", ()))
+            if node.get("Sort Space Type") == "Disk":
+                hints.append(f"Sort on {keys} spilled to disk ({node.get('Sort Space Used')} kB)")
+            elif rows >= ADVISOR_MIN_ROWS or node.get("Plan Rows", 0) >= ADVISOR_MIN_ROWS:
+                hints.append(
+                    f"Sort on {keys} over ~{max(rows, node.get('Plan Rows', 0))} rows: "
+                    "an index on the filter columns followed by the sort key returns rows in order"
+                )
+    return hints
+
+
+SORT_KEYS = {
+    "total": lambda s: s.total_ms,
+    "p95": lambda s: s.percentile(0.95) or 0,
+    "max": lambda s: s.max_ms,
+    "calls": lambda s: s.calls,
+}
+
+
+def report(limit: int = 20, sort: str = "total", with_plans: bool = False) -> Dict[str, Any]:
+    with _lock:
+        ranked = sorted(_stats.items(), key=lambda item: SORT_KEYS[sort](item[1]), reverse=True)
+        queries = [stats.snapshot(fp, with_plans) for fp, stats in ranked[:limit]]
+        fingerprints = len(_stats)
+    return {
+        "slow_ms": settings.QUERY_SLOW_MS,
+        "fingerprints": fingerprints,
+        "sort": sort,
+        "queries": queries,
+    }
+
+
+def table_scan_stats(db, limit: int = 10) -> List[Dict[str, Any]]:
+    """Tables read most through sequential scans (cumulative since the last stats reset)."""
+    rows = db.execute(text(
+        "SELECT relname, seq_scan, seq_tup_read, idx_scan, n_live_tup "
+        "FROM pg_stat_user_tables ORDER BY seq_tup_read DESC LIMIT :limit"
+    ), {"limit": limit}).mappings()
+    return [dict(row) for row in rows]
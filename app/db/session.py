@@ -1,9 +1,12 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base,sessionmaker
 from app.core.config import settings
+from app.db import observatory
 
 
 engine=create_engine(settings.DATABASE_URL)
+if settings.QUERY_OBSERVATORY_ENABLED:
+    observatory.install(engine)
 
 SessionLocal=sessionmaker(autoflush=False,autocommit=False,bind=engine,)
 
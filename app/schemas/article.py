@@ -1,6 +1,6 @@
 from pydantic import BaseModel, model_validator
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 import uuid
 from enum import Enum
 from app.schemas.user import UserRead
@@ -11,6 +11,7 @@ class ArticleStatus(str, Enum):
     draft = "draft"
     pending_review = "pending_review"
     rejected = "rejected"
+    scheduled = "scheduled"
     published = "published"
     archived = "archived"
 
@@ -42,10 +43,13 @@ class ArticleRead(ArticleBase):
     category_id: Optional[int]
     views: int
     likes_count: int
+    comments_count: int = 0
     created_at: datetime
     updated_at: datetime
     rejection_reason: Optional[str] = None
     featured_image: Optional[str] = None
+    # {"thumb": {"webp": url, "jpeg": url}, "card": {...}, "hero": {...}}
+    featured_image_variants: Dict[str, Dict[str, str]] = {}
     
     # Nested objects for display
     author: Optional[UserRead] = None
@@ -58,5 +62,29 @@ class ArticleRead(ArticleBase):
     def populate_featured_image(self):
         if self.media and len(self.media) > 0:
             self.featured_image = self.media[0].url
+            variants: Dict[str, Dict[str, str]] = {}
+            for v in self.media[0].variants:
+                variants.setdefault(v.name, {})[v.format] = v.url
+            self.featured_image_variants = variants
         return self
 
+
+
+class ArticleCard(BaseModel):
+    """Light article projection for feeds and saved / liked lists (no content, author or category)."""
+    id: uuid.UUID
+    title: str
+    slug: str
+    summary: Optional[str] = None
+    status: ArticleStatus
+    author_id: uuid.UUID
+    category_id: Optional[int] = None
+    views: int
+    likes_count: int
+    comments_count: int = 0
+    publish_at: Optional[datetime] = None
+    created_at: datetime
+    featured_image: Optional[str] = None
+    featured_image_variants: Dict[str, Dict[str, str]] = {}
+
+    model_config = {"from_attributes": True }
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import List
+import uuid
+
+# ids per request, about one feed page
+ARTICLE_STATE_MAX_IDS = 100
+
+
+class ArticleStateRequest(BaseModel):
+    article_ids: List[uuid.UUID] = Field(..., max_length=ARTICLE_STATE_MAX_IDS)
+
+
+class ArticleState(BaseModel):
+    article_id: uuid.UUID
+    liked: bool
+    bookmarked: bool
+
+
+class ArticleStateResponse(BaseModel):
+    states: List[ArticleState]
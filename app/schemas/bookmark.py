@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 import uuid
-from app.schemas.article import ArticleRead
+from app.schemas.article import ArticleCard, ArticleRead
 
 class BookmarkBase(BaseModel):
     article_id: uuid.UUID
@@ -17,3 +17,12 @@ class BookmarkRead(BaseModel):
     article: ArticleRead
 
     model_config = {"from_attributes": True }
+
+
+class BookmarkCard(BaseModel):
+    id: uuid.UUID
+    article_id: uuid.UUID
+    created_at: datetime
+    article: ArticleCard
+
+    model_config = {"from_attributes": True }
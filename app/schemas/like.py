@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 import uuid
+from app.schemas.article import ArticleCard
 
 class LikeBase(BaseModel):
     article_id: uuid.UUID
@@ -15,3 +16,12 @@ class LikeRead(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True }
+
+
+class LikeCard(BaseModel):
+    id: uuid.UUID
+    article_id: uuid.UUID
+    created_at: datetime
+    article: ArticleCard
+
+    model_config = {"from_attributes": True }
@@ -7,11 +7,24 @@ class MediaCreate(BaseModel):
     article_id: uuid.UUID
 
 
+class MediaVariantRead(BaseModel):
+    name: str
+    format: str
+    width: int
+    height: int
+    size: int
+    url: str
+
+    model_config = {"from_attributes": True }
+
+
 class MediaRead(BaseModel):
     id: uuid.UUID
     url: str
     mime_type: str | None = None
     size: int | None = None
+    blob_sha256: str | None = None
     uploaded_at: datetime
+    variants: list[MediaVariantRead] = []
 
     model_config = {"from_attributes": True }
@@ -1,10 +1,21 @@
 from pydantic import BaseModel
-from typing import List, Any
+from typing import Generic, List, Any, Optional, TypeVar
 
-class PaginatedResponse(BaseModel):
-    items: List[Any]
+T = TypeVar("T")
+
+
+class PaginatedResponse(BaseModel, Generic[T]):
+    # PaginatedResponse[ArticleRead] for a typed envelope; bare PaginatedResponse keeps List[Any]
+    items: List[T]
     total: int
     page: int
     limit: int
 
     model_config = {"from_attributes": True }
+
+
+class CursorPage(BaseModel, Generic[T]):
+    # keyset pagination (app/db/keyset.py): pass next_cursor back as ?cursor= ; null on the last page
+    items: List[T]
+    next_cursor: Optional[str] = None
+    limit: int
@@ -0,0 +1,77 @@
+"""
+ArticleCard projections for lists of bookmarks / likes.
+
+The list query joins articles loading only CARD_COLUMNS (no content, and the
+author / category joins Article does by default are switched off); featured
+images for the whole page come from one more query (plus one for their
+variants), so a page costs the same number of queries whatever its size.
+"""
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy.orm import Session, contains_eager, defaultload, selectinload
+
+from app.db import models
+
+CARD_COLUMNS = (
+    models.Article.id,
+    models.Article.title,
+    models.Article.slug,
+    models.Article.summary,
+    models.Article.status,
+    models.Article.author_id,
+    models.Article.category_id,
+    models.Article.views,
+    models.Article.likes_count,
+    models.Article.comments_count,
+    models.Article.publish_at,
+    models.Article.created_at,
+)
+
+
+def card_options(relationship) -> list:
+    """Query options for `relationship` (-> Article, joined in the query) as a card."""
+    return [
+        contains_eager(relationship).load_only(*CARD_COLUMNS),
+        defaultload(relationship).lazyload("*"),
+    ]
+
+
+def featured_media(db: Session, article_ids: Iterable) -> Dict[Any, models.Media]:
+    """First uploaded media per article, with its variants."""
+    ids = list(set(article_ids))
+    if not ids:
+        return {}
+    rows = (
+        db.query(models.Media)
+        .options(selectinload(models.Media.variants))
+        .filter(models.Media.article_id.in_(ids))
+        .distinct(models.Media.article_id)
+        .order_by(models.Media.article_id, models.Media.uploaded_at, models.Media.id)
+        .all()
+    )
+    return {m.article_id: m for m in rows}
+
+
+def to_card(article: models.Article, media: models.Media = None) -> Dict[str, Any]:
+    card = {c.key: getattr(article, c.key) for c in CARD_COLUMNS}
+    if media is not None:
+        variants: Dict[str, Dict[str, str]] = {}
+        for v in media.variants:
+            variants.setdefault(v.name, {})[v.format] = v.url
+        card["featured_image"] = media.url
+        card["featured_image_variants"] = variants
+    return card
+
+
+def with_cards(db: Session, rows: List[Any]) -> List[Dict[str, Any]]:
+    """Bookmark / Like rows (article loaded via card_options) -> dicts for BookmarkCard / LikeCard."""
+    media = featured_media(db, [r.article_id for r in rows])
+    return [
+        {
+            "id": r.id,
+            "article_id": r.article_id,
+            "created_at": r.created_at,
+            "article": to_card(r.article, media.get(r.article_id)),
+        }
+        for r in rows
+    ]
@@ -0,0 +1,135 @@
+"""
+Cross-worker cache refresh for publication changes.
+
+The headlines, feed / sitemap and dashboard caches live in each process. A
+write that publishes or unpublishes articles (a request in any API worker,
+the scheduler) sends their ids on CHANNEL, and every API worker runs a
+listener thread (start_listener(), started with the app) that refreshes its
+own caches for them. The sending process has refreshed its own caches
+already and skips its notifications (ORIGIN). Notifications sent while a
+listener is reconnecting are caught up from updated_at once it is back.
+"""
+import json
+import select
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal, engine
+from app.services.dashboard_service import invalidate_dashboard_stats
+from app.services.feed_service import schedule_feed_refresh
+from app.services.headlines_service import refresh_latest_headlines
+
+CHANNEL = "articles_published"
+# NOTIFY payloads are capped at 8000 bytes; 80 (article id, author id) pairs stay below
+ARTICLES_PER_NOTIFY = 80
+# pause before a dropped listener connection is retried
+LISTENER_RETRY_SECONDS = 5
+# updated_at can be set a while before the change commits (the scheduler sets it
+# to the start of its run), so the catch-up after a reconnect looks back this much more
+CATCH_UP_MARGIN_SECONDS = settings.SCHEDULER_INTERVAL_SECONDS
+
+# tells this process's own notifications apart
+ORIGIN = uuid.uuid4().hex
+
+_listener: Optional[threading.Thread] = None
+_listener_lock = threading.Lock()
+
+
+def notify_articles_changed(conn, articles: Iterable[Tuple]):
+    """
+    Queue notifications for (article_id, author_id) pairs on `conn`'s
+    transaction (session or connection); Postgres sends them on commit.
+    """
+    pairs = [[str(article_id), str(author_id) if author_id else None] for article_id, author_id in articles]
+    for i in range(0, len(pairs), ARTICLES_PER_NOTIFY):
+        payload = json.dumps({"origin": ORIGIN, "articles": pairs[i:i + ARTICLES_PER_NOTIFY]})
+        conn.execute(func.pg_notify(CHANNEL, payload).select())
+
+
+def announce_articles_changed(articles: Iterable[Tuple]):
+    """notify_articles_changed for a change that is already committed (own short transaction)."""
+    with engine.begin() as conn:
+        notify_articles_changed(conn, articles)
+
+
+def refresh_articles(articles: Iterable[Tuple]):
+    """Refresh this process's headlines, feed / sitemap and dashboard caches for (article_id, author_id) pairs."""
+    articles = list(articles)
+    author_ids = {author_id for _, author_id in articles if author_id}
+    for author_id in author_ids or [None]:
+        invalidate_dashboard_stats(author_id)
+    try:
+        refresh_latest_headlines()
+    except Exception as e:
+        print(f"Article events: headlines refresh failed: {e}")
+    schedule_feed_refresh(*[article_id for article_id, _ in articles])
+
+
+def _changed_since(since: datetime) -> list:
+    db = SessionLocal()
+    try:
+        return [
+            (row.id, row.author_id) for row in
+            db.query(models.Article.id, models.Article.author_id).filter(models.Article.updated_at >= since)
+        ]
+    finally:
+        db.close()
+
+
+def _listen():
+    """Refresh local caches for every notification from other processes; reconnects (and catches up) on errors."""
+    lost_at = None
+    while True:
+        conn = None
+        try:
+            # a connection of its own: LISTEN needs autocommit and holds it for good
+            cargs, cparams = engine.dialect.create_connect_args(engine.url)
+            conn = engine.dialect.connect(*cargs, **cparams)
+            conn.autocommit = True
+            conn.cursor().execute(f"LISTEN {CHANNEL}")
+            if lost_at is not None:
+                missed = _changed_since(lost_at - timedelta(seconds=CATCH_UP_MARGIN_SECONDS))
+                if missed:
+                    refresh_articles(missed)
+                lost_at = None
+            while True:
+                if select.select([conn], [], [], 60) == ([], [], []):
+                    continue
+                conn.poll()
+                articles = []
+                while conn.notifies:
+                    message = json.loads(conn.notifies.pop(0).payload)
+                    if message["origin"] != ORIGIN:
+                        articles.extend(message["articles"])
+                if articles:
+                    try:
+                        refresh_articles(articles)
+                    except Exception as e:
+                        print(f"Article events: cache refresh failed: {e}")
+        except Exception as e:
+            print(f"Article events listener: {e}")
+            if lost_at is None:
+                lost_at = datetime.utcnow()
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        time.sleep(LISTENER_RETRY_SECONDS)
+
+
+def start_listener():
+    """Start this process's listener thread (once)."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = threading.Thread(target=_listen, name="article-events", daemon=True)
+            _listener.start()
@@ -1,10 +1,48 @@
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from app.db import models
 from app.schemas.article import ArticleCreate, ArticleUpdate
 from sqlalchemy import or_
 from fastapi import HTTPException
-from app.services.embedding_service import index_article
+from app.services.embedding_service import index_article, delete_article_chunks
+from app.services.headlines_service import refresh_latest_headlines
+from app.services.summary_service import schedule_summary
+from app.services.dashboard_service import invalidate_dashboard_stats
+from app.services.feed_service import schedule_feed_refresh
+from app.services.article_events import announce_articles_changed
+
+
+def _after_article_change(db: Session, article_id, old_status: Optional[str], new_status: Optional[str], author_id=None):
+    """
+    Keep derived read models in sync after an article write (best effort,
+    same as indexing: a failure here must not fail the write itself).
+    """
+    if old_status != new_status:
+        invalidate_dashboard_stats(author_id)
+
+    if "published" in (old_status, new_status):
+        try:
+            refresh_latest_headlines(db)
+        except Exception:
+            pass
+        # feeds / sitemap re-render in the background
+        try:
+            schedule_feed_refresh(article_id)
+        except Exception:
+            pass
+        # the same refresh in the other workers (app/services/article_events.py)
+        try:
+            announce_articles_changed([(article_id, author_id)])
+        except Exception as e:
+            print(f"Article events: notify failed for {article_id}: {e}")
+
+    # summaries are keyed by content hash, so this is a no-op when nothing changed
+    if new_status == "published":
+        try:
+            schedule_summary(article_id)
+        except Exception:
+            pass
 
 
 def create_article(db: Session, data: ArticleCreate, author_id: str):
@@ -20,6 +58,8 @@ def create_article(db: Session, data: ArticleCreate, author_id: str):
     except:
         pass
 
+    new_status = article.status.value if hasattr(article.status, 'value') else str(article.status)
+    _after_article_change(db, article.id, None, new_status, article.author_id)
     return article
 
 
@@ -72,6 +112,12 @@ def can_view_article(article: models.Article, current_user) -> bool:
         # Author can see their own pending_review
         return str(article.author_id) == str(current_user.id)
 
+    # Scheduled articles: like pending_review until the scheduler publishes them
+    if article_status == "scheduled":
+        if user_role in ("admin", "editor"):
+            return True
+        return str(article.author_id) == str(current_user.id)
+
     # Draft articles: only author can see
     if article_status == "draft":
         return str(article.author_id) == str(current_user.id)
@@ -106,18 +152,19 @@ def apply_article_visibility_filter(query, current_user, skip_filter=False):
     user_role = current_user.role.value if hasattr(current_user.role, 'value') else str(current_user.role)
     
     # Admin and editor can see all articles
-    # Admin can see: published, pending_review, archived (NOT draft, NOT rejected)
+    # Admin can see: published, pending_review, scheduled, archived (NOT draft, NOT rejected)
     if user_role == "admin":
         return query.filter(
-            models.Article.status.in_(["published", "pending_review", "archived"])
+            models.Article.status.in_(["published", "pending_review", "scheduled", "archived"])
         )
 
-    # Editor can see published and pending_review
+    # Editor can see published, pending_review and scheduled
     if user_role == "editor":
         return query.filter(
             or_(
                 models.Article.status == "published",
-                models.Article.status == "pending_review"
+                models.Article.status == "pending_review",
+                models.Article.status == "scheduled"
             )
         )
     
@@ -136,6 +183,8 @@ def apply_article_visibility_filter(query, current_user, skip_filter=False):
 
 
 def update_article(db: Session, article: models.Article, data: ArticleUpdate, current_user):
+    previous_status = article.status.value if hasattr(article.status, 'value') else str(article.status)
+
     # Status transition logic
     if data.status is not None:
         new_status = data.status.value if hasattr(data.status, 'value') else str(data.status)
@@ -163,7 +212,10 @@ def update_article(db: Session, article: models.Article, data: ArticleUpdate, cu
             elif user_role == "editor":
                 # Editor can move pending_review -> published (Approve)
                 # Editor can move pending_review -> rejected (Reject)
-                if old_status == "pending_review" and new_status in ("published", "rejected"):
+                # Editor can move pending_review -> scheduled (Approve for publish_at)
+                # Editor can move scheduled -> published / pending_review (Publish now / Unschedule)
+                if (old_status == "pending_review" and new_status in ("published", "rejected", "scheduled")) or \
+                   (old_status == "scheduled" and new_status in ("published", "pending_review")):
                     pass # Allowed
                 else:
                     raise HTTPException(
@@ -181,6 +233,9 @@ def update_article(db: Session, article: models.Article, data: ArticleUpdate, cu
                 allowed_transitions = [
                     ("pending_review", "rejected"),
                     ("pending_review", "published"),
+                    ("pending_review", "scheduled"),
+                    ("scheduled", "published"),
+                    ("scheduled", "pending_review"),
                     ("published", "archived"),
                     ("archived", "published")
                 ]
@@ -193,6 +248,9 @@ def update_article(db: Session, article: models.Article, data: ArticleUpdate, cu
                         detail=f"Admin cannot change status from {old_status} to {new_status}"
                     )
 
+            if new_status == "scheduled" and (data.publish_at or article.publish_at) is None:
+                raise HTTPException(status_code=400, detail="publish_at is required to schedule an article")
+
     if data.title is not None:
         article.title = data.title
     if data.slug is not None:
@@ -207,6 +265,15 @@ def update_article(db: Session, article: models.Article, data: ArticleUpdate, cu
         
     if data.publish_at is not None:
         article.publish_at = data.publish_at
+    # Publish now: the article goes out before its scheduled time, so it is dated now
+    if previous_status == "scheduled" and data.status is not None and \
+       (data.status.value if hasattr(data.status, 'value') else str(data.status)) == "published":
+        now = datetime.utcnow()
+        publish_at = article.publish_at
+        if publish_at is not None and publish_at.tzinfo is not None:
+            publish_at = publish_at.astimezone(timezone.utc).replace(tzinfo=None)
+        if publish_at is None or publish_at > now:
+            article.publish_at = now
     if data.category_id is not None:
         article.category_id = data.category_id
     if data.rejection_reason is not None:
@@ -219,12 +286,22 @@ def update_article(db: Session, article: models.Article, data: ArticleUpdate, cu
     except:
         pass
 
+    current_status = article.status.value if hasattr(article.status, 'value') else str(article.status)
+    _after_article_change(db, article.id, previous_status, current_status, article.author_id)
     return article
 
 
 def delete_article(db: Session, article: models.Article):
+    article_id = str(article.id)
+    author_id = article.author_id
+    previous_status = article.status.value if hasattr(article.status, 'value') else str(article.status)
     db.delete(article)
     db.commit()
+    try:
+        delete_article_chunks(article_id)
+    except:
+        pass
+    _after_article_change(db, article_id, previous_status, None, author_id)
 
 
 def get_articles_by_category(db: Session, category_id: int, current_user=None):
@@ -237,7 +314,8 @@ def get_articles_by_category(db: Session, category_id: int, current_user=None):
 
 
 def paginate(query, page: int, limit: int):
-    total = query.count()
+    # the ORDER BY only matters for the page; left in, the count subquery sorts every match
+    total = query.order_by(None).count()
     items = query.offset((page - 1) * limit).limit(limit).all()
     return items, total
 
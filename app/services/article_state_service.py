@@ -0,0 +1,25 @@
+from typing import Dict, List
+from sqlalchemy.orm import Session
+from app.db import models
+
+
+def get_article_states(db: Session, user_id, article_ids: List) -> List[Dict]:
+    """
+    liked / bookmarked flags of user_id for each article, in request order.
+    One IN (...) query per table, answered from the (user_id, article_id) unique indexes.
+    """
+    ids = list(dict.fromkeys(article_ids))
+    if not ids:
+        return []
+    liked = {
+        row.article_id for row in db.query(models.Like.article_id)
+        .filter(models.Like.user_id == user_id, models.Like.article_id.in_(ids))
+    }
+    bookmarked = {
+        row.article_id for row in db.query(models.Bookmark.article_id)
+        .filter(models.Bookmark.user_id == user_id, models.Bookmark.article_id.in_(ids))
+    }
+    return [
+        {"article_id": i, "liked": i in liked, "bookmarked": i in bookmarked}
+        for i in ids
+    ]
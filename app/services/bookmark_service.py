@@ -1,7 +1,9 @@
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
 from app.db import models
+from app.db.keyset import keyset_page
 from app.schemas.bookmark import BookmarkCreate
+from app.services.article_card_service import card_options, with_cards
 
 def create_bookmark(db: Session, data: BookmarkCreate, user_id) -> models.Bookmark:
     bookmark = models.Bookmark(
@@ -19,14 +21,23 @@ def get_bookmark_by_user_and_article(db: Session, user_id, article_id) -> Option
         models.Bookmark.article_id == article_id
     ).first()
 
-def list_bookmarks_for_user(db: Session, user_id) -> List[models.Bookmark]:
-    return (
+def list_bookmarks_for_user(
+    db: Session,
+    user_id,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """Newest first as BookmarkCard dicts, keyset-paginated on (created_at, id); raises InvalidCursor."""
+    query = (
         db.query(models.Bookmark)
-        .options(joinedload(models.Bookmark.article))
+        .join(models.Bookmark.article)
+        .options(*card_options(models.Bookmark.article))
         .filter(models.Bookmark.user_id == user_id)
-        .order_by(models.Bookmark.created_at.desc())
-        .all()
     )
+    rows, next_cursor = keyset_page(
+        query, [models.Bookmark.created_at, models.Bookmark.id], limit, cursor, descending=True
+    )
+    return with_cards(db, rows), next_cursor
 
 def delete_bookmark(db: Session, bookmark: models.Bookmark):
     db.delete(bookmark)
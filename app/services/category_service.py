@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 from app.db import models
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services.index_sync import article_ids_for, clear_category_of_articles
 
 
 def create_category(db: Session, data: CategoryCreate) -> models.Category:
@@ -43,8 +44,10 @@ def update_category(db: Session, category: models.Category, data: CategoryUpdate
 
 
 def delete_category(db: Session, category: models.Category):
+    article_ids = article_ids_for(db, models.Article.category_id == category.id)
     db.delete(category)
     db.commit()
+    clear_category_of_articles(article_ids)
 
 
 def get_category_by_slug(db: Session, slug: str):
@@ -0,0 +1,194 @@
+"""
+Server-side chat sessions (table chat_sessions).
+
+A session keeps the turns that are not yet summarized plus a rolling summary of
+the older ones. The prompt gets the summary and the last CHAT_HISTORY_RECENT_TURNS
+turns verbatim, all within CHAT_HISTORY_TOKEN_BUDGET. Once enough turns fall out
+of the verbatim window they are folded into the summary in the background, so the
+stored row and the prompt stay bounded however long the conversation gets.
+"""
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from langchain.prompts import ChatPromptTemplate
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.services import llm_gateway
+from app.services.llm_gateway import estimate_tokens
+
+summary_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You maintain a running summary of a conversation between a user and a news assistant."),
+    ("human",
+     "Current summary:\n{summary}\n\n"
+     "New turns:\n{turns}\n\n"
+     "Update the summary with the new turns. Keep the topics, articles and facts the user "
+     "may refer back to, in at most {max_words} words. Reply with the summary only."
+    )
+])
+
+# background summarization; one job per session at a time (per process)
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-summary")
+_folding = set()
+_folding_lock = threading.Lock()
+
+
+def _parse_id(session_id: Optional[str]):
+    try:
+        return uuid.UUID(str(session_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def _expiry() -> datetime:
+    return datetime.utcnow() + timedelta(minutes=settings.CHAT_SESSION_TTL_MINUTES)
+
+
+def _compact(role: str, content: str) -> Dict[str, str]:
+    return {"role": role, "content": (content or "")[:settings.CHAT_TURN_MAX_CHARS]}
+
+
+def get_or_create_session(
+    db: Session,
+    session_id: Optional[str] = None,
+    seed_history: Optional[List[Dict[str, str]]] = None,
+) -> models.ChatSession:
+    """Live session for session_id, or a new one (seeded with client-sent history) if unknown or expired."""
+    parsed = _parse_id(session_id)
+    if parsed is not None:
+        session = db.query(models.ChatSession).filter(
+            models.ChatSession.id == parsed,
+            models.ChatSession.expires_at > datetime.utcnow(),
+        ).first()
+        if session:
+            return session
+
+    turns = []
+    for msg in seed_history or []:
+        role = msg.get("role")
+        if role in ("user", "assistant", "bot") and msg.get("content"):
+            turns.append(_compact("user" if role == "user" else "assistant", msg["content"]))
+
+    session = models.ChatSession(turns=turns, summary="", folded_turns=0, expires_at=_expiry())
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return session
+
+
+def build_history(session: models.ChatSession) -> List[BaseMessage]:
+    """Summary + most recent turns, newest first until the token budget is spent."""
+    budget = settings.CHAT_HISTORY_TOKEN_BUDGET
+    recent = (session.turns or [])[-settings.CHAT_HISTORY_RECENT_TURNS:]
+
+    kept: List[BaseMessage] = []
+    for turn in reversed(recent):
+        cost = estimate_tokens(turn["content"])
+        if cost > budget:
+            break
+        budget -= cost
+        cls = HumanMessage if turn["role"] == "user" else AIMessage
+        kept.append(cls(content=turn["content"]))
+    kept.reverse()
+
+    if session.summary and budget > 0:
+        # ~4 characters per token, same estimate as the gateway
+        summary = session.summary[:budget * 4]
+        kept.insert(0, SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+    return kept
+
+
+def record_turn(db: Session, session_id, question: str, answer: str):
+    """Append one question/answer pair and extend the TTL; schedules folding when due."""
+    session = (
+        db.query(models.ChatSession)
+        .filter(models.ChatSession.id == session_id)
+        .with_for_update()
+        .first()
+    )
+    if not session:
+        return
+    turns = list(session.turns or [])
+    turns.append(_compact("user", question))
+    turns.append(_compact("assistant", answer))
+    session.turns = turns
+    session.expires_at = _expiry()
+    db.commit()
+
+    if len(turns) - settings.CHAT_HISTORY_RECENT_TURNS >= settings.CHAT_SUMMARY_FOLD_TURNS:
+        schedule_fold(session_id)
+
+
+def _fold(session_id):
+    db = SessionLocal()
+    try:
+        session = db.query(models.ChatSession).filter(models.ChatSession.id == session_id).first()
+        if not session:
+            return
+        turns = list(session.turns or [])
+        count = len(turns) - settings.CHAT_HISTORY_RECENT_TURNS
+        if count <= 0:
+            return
+        folded_before = session.folded_turns
+        transcript = "\n".join(f"{t['role']}: {t['content']}" for t in turns[:count])
+        messages = summary_prompt.format_messages(
+            summary=session.summary or "(empty)",
+            turns=transcript,
+            max_words=settings.CHAT_SUMMARY_MAX_WORDS,
+        )
+        db.commit()  # don't hold a transaction open during the LLM call
+
+        summary = llm_gateway.invoke(messages, model=settings.GROQ_MODEL, temperature=0)
+
+        session = (
+            db.query(models.ChatSession)
+            .filter(models.ChatSession.id == session_id)
+            .with_for_update()
+            .first()
+        )
+        # another worker folded in the meantime: its summary wins
+        if not session or session.folded_turns != folded_before:
+            db.rollback()
+            return
+        # new turns are only ever appended, so the first `count` are the ones summarized
+        session.turns = list(session.turns or [])[count:]
+        session.summary = summary
+        session.folded_turns = folded_before + count
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Chat summary failed for {session_id}: {e}")
+    finally:
+        db.close()
+        with _folding_lock:
+            _folding.discard(session_id)
+
+
+def schedule_fold(session_id):
+    with _folding_lock:
+        if session_id in _folding:
+            return
+        _folding.add(session_id)
+    _executor.submit(_fold, session_id)
+
+
+def purge_expired_sessions(db: Session, batch_size: int = 1000) -> int:
+    """Delete expired sessions in batches; returns the number removed."""
+    removed = 0
+    while True:
+        ids = [
+            row.id for row in db.query(models.ChatSession.id)
+            .filter(models.ChatSession.expires_at <= datetime.utcnow())
+            .limit(batch_size)
+        ]
+        if not ids:
+            return removed
+        db.query(models.ChatSession).filter(models.ChatSession.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        removed += len(ids)
@@ -1,9 +1,33 @@
-
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional, Tuple
 from app.db import models
+from app.db.keyset import keyset_page
 from app.schemas.comment import CommentCreate
 
+# what CommentRead.user needs (no password hash etc.)
+_USER_FIELDS = (
+    models.User.id,
+    models.User.email,
+    models.User.username,
+    models.User.role,
+    models.User.is_active,
+    models.User.created_at,
+    models.User.updated_at,
+)
+
+
+def _bump_comments_count(db: Session, article_id, delta: int):
+    # single UPDATE: concurrent comments can't lose increments the way read-modify-write would;
+    # updated_at is kept, a comment is not an edit (reindex, export and feeds key on it)
+    db.query(models.Article).filter(models.Article.id == article_id).update(
+        {
+            models.Article.comments_count: func.greatest(models.Article.comments_count + delta, 0),
+            models.Article.updated_at: models.Article.updated_at,
+        },
+        synchronize_session=False,
+    )
+
 
 def create_comment(db: Session, data: CommentCreate, user_id) -> models.Comment:
     comment = models.Comment(
@@ -12,6 +36,7 @@ def create_comment(db: Session, data: CommentCreate, user_id) -> models.Comment:
         user_id=user_id,
     )
     db.add(comment)
+    _bump_comments_count(db, data.article_id, 1)
     db.commit()
     db.refresh(comment)
     return comment
@@ -21,15 +46,57 @@ def get_comment(db: Session, comment_id) -> Optional[models.Comment]:
     return db.query(models.Comment).filter(models.Comment.id == comment_id).first()
 
 
-def list_comments_for_article(db: Session, article_id) -> List[models.Comment]:
-    return (
+def list_comments_for_article(
+    db: Session,
+    article_id,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[models.Comment], Optional[str]]:
+    """Oldest first, keyset-paginated on (created_at, id); raises InvalidCursor."""
+    query = (
         db.query(models.Comment)
+        .options(joinedload(models.Comment.user).load_only(*_USER_FIELDS))
         .filter(models.Comment.article_id == article_id)
-        .order_by(models.Comment.created_at.asc())
-        .all()
+    )
+    return keyset_page(query, [models.Comment.created_at, models.Comment.id], limit, cursor)
+
+
+def list_comments_for_user(
+    db: Session,
+    user_id,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[models.Comment], Optional[str]]:
+    """Newest first, with the commented article; raises InvalidCursor."""
+    query = (
+        db.query(models.Comment)
+        .options(
+            joinedload(models.Comment.user).load_only(*_USER_FIELDS),
+            joinedload(models.Comment.article).selectinload(models.Article.media),
+        )
+        .filter(models.Comment.user_id == user_id)
+    )
+    return keyset_page(query, [models.Comment.created_at, models.Comment.id], limit, cursor, descending=True)
+
+
+def uncount_user_comments(db: Session, user_id):
+    """Before deleting a user: their comments go by ON DELETE CASCADE, so take them off the counters."""
+    per_article = (
+        db.query(models.Comment.article_id, func.count().label("n"))
+        .filter(models.Comment.user_id == user_id)
+        .group_by(models.Comment.article_id)
+        .subquery()
+    )
+    db.query(models.Article).filter(models.Article.id == per_article.c.article_id).update(
+        {
+            models.Article.comments_count: func.greatest(models.Article.comments_count - per_article.c.n, 0),
+            models.Article.updated_at: models.Article.updated_at,
+        },
+        synchronize_session=False,
     )
 
 
 def delete_comment(db: Session, comment: models.Comment):
+    _bump_comments_count(db, comment.article_id, -1)
     db.delete(comment)
     db.commit()
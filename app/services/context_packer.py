@@ -0,0 +1,159 @@
+"""
+Turn retrieved chunks into prompt context.
+
+1. chunks of the same article with consecutive `<article_id>:<i>` ids are merged
+   into one passage and the splitter overlap between them is removed
+2. passages are ordered MMR-style: relevance vs. word-set (Jaccard) similarity to
+   the passages already picked, with passages of an already picked article
+   counted as similar, so other stories get a slot
+3. passages are added until CHAT_CONTEXT_TOKEN_BUDGET is spent (the last one may be cut)
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.llm_gateway import estimate_tokens
+
+# RecursiveCharacterTextSplitter overlap is <= chunk_overlap (100) but lands on word boundaries
+MAX_OVERLAP_CHARS = 300
+MIN_OVERLAP_CHARS = 8
+# similarity assumed between two passages of the same article
+SAME_ARTICLE_SIMILARITY = 0.5
+# a cut passage shorter than this is not worth including
+MIN_PASSAGE_TOKENS = 40
+
+_WORD = re.compile(r"\w+")
+
+
+def _chunk_index(doc) -> Optional[int]:
+    chunk_id = getattr(doc, "id", None) or ""
+    _, _, index = str(chunk_id).rpartition(":")
+    return int(index) if index.isdigit() else None
+
+
+def _similarity(doc, rank: int, total: int) -> float:
+    # chroma (l2 on normalized vectors) and the numpy index both return 2 - 2cos
+    score = (getattr(doc, "metadata", None) or {}).get("score")
+    if score is None:
+        return 1.0 - rank / max(total, 1)
+    return max(0.0, min(1.0, 1.0 - float(score) / 2))
+
+
+def merge_overlap(left: str, right: str) -> str:
+    """Join two consecutive chunks, dropping the text they share."""
+    longest = min(len(left), len(right), MAX_OVERLAP_CHARS)
+    for size in range(longest, MIN_OVERLAP_CHARS - 1, -1):
+        if left.endswith(right[:size]):
+            return left + right[size:]
+    return f"{left} {right}"
+
+
+def _words(text: str) -> set:
+    return set(_WORD.findall(text.lower()))
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def merge_chunks(docs) -> List[Dict[str, Any]]:
+    """Group docs into passages of consecutive chunks per article."""
+    by_article: Dict[Any, List[Tuple[Optional[int], int, Any]]] = {}
+    for rank, d in enumerate(docs):
+        aid = (getattr(d, "metadata", None) or {}).get("article_id")
+        by_article.setdefault(aid, []).append((_chunk_index(d), rank, d))
+
+    passages = []
+    for aid, items in by_article.items():
+        # chunks without a parsable index stay separate, in retrieval order
+        items.sort(key=lambda x: (x[0] is None, x[0] if x[0] is not None else x[1]))
+        current = None
+        for index, rank, d in items:
+            m = getattr(d, "metadata", None) or {}
+            text = getattr(d, "page_content", "") or ""
+            sim = _similarity(d, rank, len(docs))
+            if (
+                current is not None
+                and index is not None
+                and current["end"] is not None
+                and index == current["end"] + 1
+            ):
+                current["text"] = merge_overlap(current["text"], text)
+                current["end"] = index
+                current["relevance"] = max(current["relevance"], sim)
+                current["rank"] = min(current["rank"], rank)
+                if m.get("score") is not None:
+                    current["score"] = m["score"] if current["score"] is None else min(current["score"], m["score"])
+                continue
+            current = {
+                "article_id": aid,
+                "slug": m.get("slug"),
+                "category_id": m.get("category_id"),
+                "start": index,
+                "end": index,
+                "text": text,
+                "relevance": sim,
+                "score": m.get("score"),
+                "rank": rank,
+            }
+            passages.append(current)
+    return passages
+
+
+def _mmr_order(passages: List[Dict[str, Any]], lambda_mult: float) -> List[Dict[str, Any]]:
+    remaining = sorted(passages, key=lambda p: p["rank"])
+    words = {id(p): _words(p["text"]) for p in remaining}
+    picked: List[Dict[str, Any]] = []
+    while remaining:
+        best, best_value = None, None
+        for p in remaining:
+            redundancy = 0.0
+            for q in picked:
+                sim = _jaccard(words[id(p)], words[id(q)])
+                if p["article_id"] == q["article_id"]:
+                    sim = max(sim, SAME_ARTICLE_SIMILARITY)
+                redundancy = max(redundancy, sim)
+            value = lambda_mult * p["relevance"] - (1 - lambda_mult) * redundancy
+            if best_value is None or value > best_value:
+                best, best_value = p, value
+        picked.append(best)
+        remaining.remove(best)
+    return picked
+
+
+def _cut(text: str, tokens: int) -> str:
+    # ~4 characters per token, same estimate as the gateway; end on a word boundary
+    cut = text[:tokens * 4]
+    space = cut.rfind(" ")
+    return (cut[:space] if space > 0 else cut).rstrip() + " ..."
+
+
+def pack_context(
+    docs,
+    token_budget: Optional[int] = None,
+    lambda_mult: Optional[float] = None,
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Returns (context, passages). passages are the ones that made it into the
+    context, in prompt order, with article_id / slug / category_id / text / score.
+    """
+    budget = token_budget if token_budget is not None else settings.CHAT_CONTEXT_TOKEN_BUDGET
+    lambda_mult = lambda_mult if lambda_mult is not None else settings.CHAT_MMR_LAMBDA
+
+    packed = []
+    for p in _mmr_order(merge_chunks(docs), lambda_mult):
+        if not p["text"].strip():
+            continue
+        cost = estimate_tokens(p["text"])
+        if cost > budget:
+            if budget < MIN_PASSAGE_TOKENS:
+                continue
+            p = dict(p, text=_cut(p["text"], budget))
+            cost = estimate_tokens(p["text"])
+        budget -= cost
+        packed.append(p)
+
+    context = "\n\n".join(p["text"] for p in packed)
+    return context, packed
@@ -0,0 +1,103 @@
+"""
+Dashboard counters, one aggregate query per role.
+
+Editors and authors keep the dashboard open with auto-refresh, so results are
+cached per role (per author for authors) for DASHBOARD_STATS_TTL_SECONDS and
+dropped when an article changes status (article_service._after_article_change).
+User and category totals are only bounded by the TTL.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db import models
+from app.db.enums import RoleEnum
+
+_cache = TTLCache(ttl_seconds=settings.DASHBOARD_STATS_TTL_SECONDS, maxsize=1024)
+
+# what the admin dashboard counts as an article (drafts and rejected ones are the authors' business)
+ADMIN_ARTICLE_STATUSES = ("published", "pending_review", "archived")
+
+
+def _count(model):
+    return select(func.count()).select_from(model).scalar_subquery()
+
+
+def admin_stats(db: Session) -> dict:
+    row = db.query(
+        _count(models.User).label("total_users"),
+        select(func.count())
+        .select_from(models.Article)
+        .where(models.Article.status.in_(ADMIN_ARTICLE_STATUSES))
+        .scalar_subquery()
+        .label("total_articles"),
+        _count(models.Category).label("total_categories"),
+    ).one()
+    return {
+        "total_users": row.total_users,
+        "total_articles": row.total_articles,
+        "total_categories": row.total_categories,
+    }
+
+
+def editor_stats(db: Session) -> dict:
+    today = datetime.utcnow().date()
+    row = db.query(
+        func.count().filter(models.Article.status == "pending_review").label("pending_reviews"),
+        func.count().filter(
+            models.Article.status == "published",
+            models.Article.publish_at >= today,
+        ).label("published_today"),
+        _count(models.Category).label("total_categories"),
+    ).select_from(models.Article).one()
+    return {
+        "pending_reviews": row.pending_reviews,
+        "published_today": row.published_today,
+        "total_categories": row.total_categories,
+    }
+
+
+def author_stats(db: Session, author_id) -> dict:
+    by_status = dict(
+        db.query(models.Article.status, func.count())
+        .filter(models.Article.author_id == author_id)
+        .group_by(models.Article.status)
+        .all()
+    )
+    counts = {getattr(k, "value", k): v for k, v in by_status.items()}
+    return {
+        "my_articles": sum(counts.values()),
+        "pending_review": counts.get("pending_review", 0),
+        "published": counts.get("published", 0),
+        "rejected": counts.get("rejected", 0),
+    }
+
+
+def get_dashboard_stats(db: Session, user) -> Optional[dict]:
+    """Cached stats for the user's role (None for roles without a dashboard)."""
+    if user.role == RoleEnum.admin:
+        key, build = ("admin",), lambda: admin_stats(db)
+    elif user.role == RoleEnum.editor:
+        key, build = ("editor",), lambda: editor_stats(db)
+    elif user.role == RoleEnum.author:
+        key, build = ("author", str(user.id)), lambda: author_stats(db, user.id)
+    else:
+        return None
+
+    stats = _cache.get(key)
+    if stats is None:
+        stats = build()
+        _cache.set(key, stats)
+    return stats
+
+
+def invalidate_dashboard_stats(author_id=None):
+    """Drop cached stats an article status change affects."""
+    _cache.delete(("admin",))
+    _cache.delete(("editor",))
+    if author_id is not None:
+        _cache.delete(("author", str(author_id)))
@@ -1,5 +1,8 @@
 # app/services/embedding_service.py
 from typing import List, Optional, Literal
+from datetime import datetime, timezone
+import json
+import os
 import threading
 
 import cohere
@@ -17,6 +20,16 @@ COHERE_EMBED_MODEL = settings.COHERE_EMBED_MODEL
 CHROMA_PERSIST_DIR = settings.CHROMA_PERSIST_DIR
 CHROMA_COLLECTION_NAME = settings.CHROMA_COLLECTION_NAME
 
+# `manage.py reindex --fresh` builds a new collection and points this file at it;
+# workers switch to the named collection on their next call (no rename, no restart)
+LIVE_COLLECTION_PATH = os.path.join(CHROMA_PERSIST_DIR, "live_collection.json")
+
+# max texts per cohere embed request
+EMBED_BATCH_SIZE = 96
+
+# upper bound for adaptive over-fetching in search_chunks (multiple of k)
+MAX_OVERFETCH = 8
+
 # splitter
 _splitter = RecursiveCharacterTextSplitter(
     chunk_size=500,
@@ -27,13 +40,16 @@ _splitter = RecursiveCharacterTextSplitter(
 _cohere_client = cohere.Client(COHERE_API_KEY)
 
 def _embed_documents(texts: List[str]) -> List[List[float]]:
-    # Use the single client instance
-    resp = _cohere_client.embed(
-        texts=texts,
-        model=COHERE_EMBED_MODEL,
-        input_type="search_document"
-    )
-    return resp.embeddings
+    # Use the single client instance; cohere caps the number of texts per request
+    vectors = []
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        resp = _cohere_client.embed(
+            texts=texts[start:start + EMBED_BATCH_SIZE],
+            model=COHERE_EMBED_MODEL,
+            input_type="search_document"
+        )
+        vectors.extend(resp.embeddings)
+    return vectors
 
 def _embed_query(text: str) -> List[float]:
     resp = _cohere_client.embed(
@@ -51,12 +67,53 @@ class CohereEmbeddingWrapper:
     def embed_query(self, text: str):
         return _embed_query(text)
 
-# initialize chroma
-_vectorstore = Chroma(
-    collection_name=CHROMA_COLLECTION_NAME,
-    embedding_function=CohereEmbeddingWrapper(),   # <-- wrapper instance
-    persist_directory=CHROMA_PERSIST_DIR,
-)
+# chroma is opened on first use: workers serving reads from the numpy
+# backend never pay for the persistent client
+_vectorstore = None
+_vectorstore_name = None
+_vectorstore_lock = threading.Lock()
+_live_pointer = (None, CHROMA_COLLECTION_NAME)  # (pointer file mtime, collection name)
+
+def live_collection_name() -> str:
+    """Collection searches and writes go to: the live pointer's, else CHROMA_COLLECTION_NAME."""
+    global _live_pointer
+    try:
+        mtime = os.stat(LIVE_COLLECTION_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return CHROMA_COLLECTION_NAME
+    if _live_pointer[0] != mtime:
+        with open(LIVE_COLLECTION_PATH, "r", encoding="utf-8") as f:
+            _live_pointer = (mtime, json.load(f)["name"])
+    return _live_pointer[1]
+
+def _get_vectorstore() -> Chroma:
+    global _vectorstore, _vectorstore_name
+    name = live_collection_name()
+    if _vectorstore is None or _vectorstore_name != name:
+        with _vectorstore_lock:
+            if _vectorstore is None or _vectorstore_name != name:
+                _vectorstore = Chroma(
+                    collection_name=name,
+                    embedding_function=CohereEmbeddingWrapper(),   # <-- wrapper instance
+                    persist_directory=CHROMA_PERSIST_DIR,
+                )
+                _vectorstore_name = name
+    return _vectorstore
+
+# read-only numpy index, only used when VECTOR_BACKEND == "numpy"
+_numpy_index = None
+_numpy_index_lock = threading.Lock()
+
+def _get_numpy_index():
+    global _numpy_index
+    if _numpy_index is None:
+        with _numpy_index_lock:
+            if _numpy_index is None:
+                from app.services.vector_index import NumpyVectorIndex
+                _numpy_index = NumpyVectorIndex.open(settings.NUMPY_INDEX_DIR)
+    # picks up a rebuilt snapshot without restarting the worker
+    _numpy_index = _numpy_index.newer()
+    return _numpy_index
 
 # a simple lock to reduce chance of concurrent delete/add races (not a full solution)
 _index_lock = threading.Lock()
@@ -64,7 +121,7 @@ _index_lock = threading.Lock()
 # we need manual add using embed_documents instead of embed_query
 def add_chunks(texts: List[str], metadatas: List[dict], ids: List[str]):
     vecs = _embed_documents(texts)
-    _vectorstore.add_texts(texts=texts, metadatas=metadatas, ids=ids, embeddings=vecs)
+    _get_vectorstore().add_texts(texts=texts, metadatas=metadatas, ids=ids, embeddings=vecs)
 
 
 # -------------------------- public helpers --------------------------
@@ -80,9 +137,71 @@ def build_document_text(article):
     return "\n\n".join(p for p in parts if p)
 
 
+def _to_timestamp(value) -> Optional[int]:
+    # chroma only supports range operators on numbers, so dates are stored as epoch seconds (UTC)
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+def _chunk_metadata(article) -> dict:
+    status = getattr(article, "status", "")
+    meta = {
+        "article_id": str(article.id),
+        "slug": getattr(article, "slug", None),
+        "category_id": getattr(article, "category_id", None),
+        "status": status.value if hasattr(status, "value") else str(status),
+        # publish_at when set, otherwise creation time
+        "publish_ts": _to_timestamp(getattr(article, "publish_at", None) or getattr(article, "created_at", None)),
+        # version marker used by index reconciliation to spot stale chunks
+        "updated_ts": _to_timestamp(getattr(article, "updated_at", None) or getattr(article, "created_at", None)),
+    }
+    # chroma rejects None metadata values
+    return {k: v for k, v in meta.items() if v is not None}
+
+
+def build_chunks(article):
+    """
+    Split an article into chunks.
+    Returns (ids, texts, metadatas); all empty when the article has no text.
+    """
+    text = build_document_text(article)
+    if not text or not text.strip():
+        return [], [], []
+
+    chunks = _splitter.split_text(text)
+    ids = [f"{article.id}:{i}" for i in range(len(chunks))]
+    meta = _chunk_metadata(article)
+    metas = [dict(meta) for _ in chunks]
+    return ids, chunks, metas
+
+
 def delete_article_chunks(article_id: str):
     # remove chunks by metadata filter
-    _vectorstore.delete(where={"article_id": article_id})
+    _get_vectorstore().delete(where={"article_id": article_id})
+
+
+def delete_articles_chunks(article_ids: List[str]):
+    # bulk variant for cascading deletes
+    if not article_ids:
+        return
+    _get_vectorstore().delete(where={"article_id": {"$in": [str(i) for i in article_ids]}})
+
+
+def clear_articles_category(article_ids: List[str]):
+    """Drop category_id from the chunks of these articles (their category was deleted: SET NULL)."""
+    if not article_ids:
+        return
+    collection = _get_vectorstore()._collection
+    with _index_lock:
+        ids = collection.get(where={"article_id": {"$in": [str(i) for i in article_ids]}}, include=[])["ids"]
+        if ids:
+            # update merges metadata; None removes the key
+            collection.update(ids=ids, metadatas=[{"category_id": None} for _ in ids])
 
 
 def index_article(article):
@@ -95,70 +214,150 @@ def index_article(article):
     Note: a simple lock is used to reduce race conditions; for high concurrency,
     push indexing to a single-threaded worker queue (recommended).
     """
-    text = build_document_text(article)
-    if not text or not text.strip():
+    ids, chunks, metas = build_chunks(article)
+    if not chunks:
         delete_article_chunks(str(article.id))
         return
 
-    chunks = _splitter.split_text(text)
-
-    ids = [f"{article.id}:{i}" for i in range(len(chunks))]
-    metas = [{
-        "article_id": str(article.id),
-        "slug": getattr(article, "slug", None),
-        "category_id": getattr(article, "category_id", None),
-        "status": article.status.value if hasattr(article.status, "value") else str(getattr(article, "status", "")),
-        # Optionally include published_at in metadata if your Article model provides it:
-        **({"published_at": getattr(article, "published_at")} if getattr(article, "published_at", None) else {})
-    } for _ in chunks]
-
     with _index_lock:
         delete_article_chunks(str(article.id))
         add_chunks(chunks, metas, ids)
 
 
-def search_chunks(query: str, mode: Literal["global", "local"]="global", article_id: Optional[str]=None, k: int=4):
+def index_articles(articles):
     """
-    Retrieve relevant chunks.
-    - If mode == 'local', apply article_id filter
-    - For queries referencing 'latest news', we run a normal similarity_search
-      but preferentially sort by metadata['published_at'] if present.
-    Returns a list of document-like objects (same shape as earlier).
+    index_article for a batch: chunks of all articles are embedded in
+    provider-sized batches and written with one delete + one add.
     """
+    if not articles:
+        return
+    all_ids, all_chunks, all_metas = [], [], []
+    for article in articles:
+        ids, chunks, metas = build_chunks(article)
+        all_ids.extend(ids)
+        all_chunks.extend(chunks)
+        all_metas.extend(metas)
+
+    with _index_lock:
+        delete_articles_chunks([str(a.id) for a in articles])
+        if all_chunks:
+            add_chunks(all_chunks, all_metas, all_ids)
 
-    # Determine filter
-    where = {"article_id": article_id} if mode == "local" and article_id else None
 
-    # Run similarity search
+def _build_where(
+    mode: str,
+    article_id: Optional[str] = None,
+    category_id: Optional[int] = None,
+    published_after: Optional[datetime] = None,
+    published_before: Optional[datetime] = None,
+) -> Optional[dict]:
+    """
+    Build the chroma metadata filter so it is applied inside the vector query
+    instead of after it.
+    - local mode: only the chunks of the given article
+    - global mode: only published chunks, optionally narrowed by category / date range
+    """
+    if mode == "local" and article_id:
+        return {"article_id": article_id}
+
+    conditions = [{"status": {"$eq": "published"}}]
+    if category_id is not None:
+        conditions.append({"category_id": {"$eq": category_id}})
+    if published_after is not None:
+        conditions.append({"publish_ts": {"$gte": _to_timestamp(published_after)}})
+    if published_before is not None:
+        conditions.append({"publish_ts": {"$lte": _to_timestamp(published_before)}})
+
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
+def _similarity_search(embedding: List[float], k: int, where: Optional[dict]):
+    if settings.VECTOR_BACKEND == "numpy":
+        return _get_numpy_index().search(embedding, k=k, where=where)
+
+    vectorstore = _get_vectorstore()
     # Note: some Chromas accept "filter" keyword, others "where"; adapt if needed.
     try:
-        if where:
-            docs = _vectorstore.similarity_search(query=query, k=k, filter=where)
-        else:
-            docs = _vectorstore.similarity_search(query=query, k=k)
+        results = vectorstore.similarity_search_by_vector_with_relevance_scores(
+            embedding=embedding, k=k, filter=where
+        )
     except TypeError:
-        # fallback if chroma implementation expects 'where' param name
-        if where:
-            docs = _vectorstore.similarity_search(query=query, k=k, where=where)
-        else:
-            docs = _vectorstore.similarity_search(query=query, k=k)
+        results = vectorstore.similarity_search_by_vector_with_relevance_scores(
+            embedding=embedding, k=k, where=where
+        )
+
+    docs = []
+    for doc, score in results:
+        doc.metadata = dict(doc.metadata or {})
+        doc.metadata["score"] = score
+        docs.append(doc)
+    return docs
+
+
+def _cap_per_article(docs, max_per_article: int):
+    counts = {}
+    kept = []
+    for d in docs:
+        aid = (d.metadata or {}).get("article_id")
+        counts[aid] = counts.get(aid, 0) + 1
+        if counts[aid] <= max_per_article:
+            kept.append(d)
+    return kept
+
+
+def search_chunks(
+    query: str,
+    mode: Literal["global", "local"] = "global",
+    article_id: Optional[str] = None,
+    k: int = 4,
+    category_id: Optional[int] = None,
+    published_after: Optional[datetime] = None,
+    published_before: Optional[datetime] = None,
+    max_per_article: Optional[int] = None,
+):
+    """
+    Retrieve relevant chunks.
+    - If mode == 'local', apply article_id filter
+    - If mode == 'global', only published chunks are searched; category and
+      publish date range filters are pushed down into the chroma query
+    - max_per_article caps how many chunks a single article may contribute.
+      The query embedding is computed once and the candidate pool is only
+      grown (doubling, up to MAX_OVERFETCH * k) when the cap removed results
+      and chroma still had more matches to give.
+    - For queries referencing 'latest news', we run a normal similarity_search
+      but preferentially sort by metadata['publish_ts'] if present.
+    Returns a list of document-like objects (same shape as earlier).
+    """
+    where = _build_where(mode, article_id, category_id, published_after, published_before)
+    embedding = _embed_query(query)
+
+    fetch_k = k
+    while True:
+        candidates = _similarity_search(embedding, fetch_k, where)
+        docs = _cap_per_article(candidates, max_per_article) if max_per_article else candidates
+        exhausted = len(candidates) < fetch_k
+        if len(docs) >= k or exhausted or fetch_k >= k * MAX_OVERFETCH:
+            break
+        fetch_k = min(fetch_k * 2, k * MAX_OVERFETCH)
 
-    # If the query was 'latest news'-like, prefer sorting by metadata 'published_at' if present
+    # If the query was 'latest news'-like, prefer sorting by metadata 'publish_ts' if present
     q_lower = (query or "").lower()
     if any(tok in q_lower for tok in ("latest", "recent", "today")):
-        # only sort if metadata published_at exists on some docs
+        # only sort if metadata publish_ts exists on some docs
         try:
             docs_with_dates = []
             docs_without_dates = []
             for d in docs:
                 m = getattr(d, "metadata", None) or {}
-                pub = m.get("published_at")
+                pub = m.get("publish_ts")
                 if pub:
                     docs_with_dates.append((pub, d))
                 else:
                     docs_without_dates.append(d)
             if docs_with_dates:
-                # sort descending by published_at (assumes ISO or comparable)
+                # sort descending by publish_ts (epoch seconds)
                 docs_with_dates.sort(key=lambda x: x[0], reverse=True)
                 docs_sorted = [d for _, d in docs_with_dates] + docs_without_dates
                 return docs_sorted[:k]
@@ -0,0 +1,126 @@
+"""
+Streaming exports (NDJSON / CSV).
+
+Rows are read with a server-side cursor (yield_per) and encoded batch by batch
+as they arrive, so memory stays flat however many rows the export has. The
+generators open their own session: they run while the response is being sent,
+after the request's session is gone.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Callable, Iterator, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from app.db import models
+from app.db.session import SessionLocal
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+# rows fetched per round trip; a chunk is sent every batch or every EXPORT_CHUNK_BYTES
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_BYTES = 256 * 1024
+
+USER_EXPORT_FIELDS = ("id", "email", "username", "role", "is_active", "created_at", "updated_at")
+
+ARTICLE_EXPORT_FIELDS = (
+    "id", "title", "slug", "summary", "content", "status", "category_id", "author_id",
+    "source_url", "publish_at", "created_at", "updated_at", "views", "likes_count", "comments_count",
+)
+ARTICLE_EXPORT_DEFAULT_FIELDS = (
+    "id", "title", "slug", "summary", "content", "category_id", "author_id", "publish_at", "updated_at",
+)
+
+
+def _plain(value):
+    if hasattr(value, "value"):  # enums
+        return value.value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _ndjson_chunks(rows, fields: Sequence[str], batch_size: int) -> Iterator[bytes]:
+    lines, size = [], 0
+    for row in rows:
+        line = json.dumps({f: _plain(getattr(row, f)) for f in fields}, ensure_ascii=False)
+        lines.append(line)
+        size += len(line)
+        if len(lines) >= batch_size or size >= EXPORT_CHUNK_BYTES:
+            yield ("\n".join(lines) + "\n").encode()
+            lines, size = [], 0
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def _csv_chunks(rows, fields: Sequence[str], batch_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    pending = 1
+    for row in rows:
+        writer.writerow(["" if v is None else v for v in (_plain(getattr(row, f)) for f in fields)])
+        pending += 1
+        if pending >= batch_size or buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode()
+
+
+def stream_export(
+    build_query: Callable[[Session], Query],
+    fields: Sequence[str],
+    fmt: str = "ndjson",
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """Encoded chunks of build_query(session) rows; `fields` are the row attributes to write."""
+    encode = _csv_chunks if fmt == "csv" else _ndjson_chunks
+    db = SessionLocal()
+    try:
+        rows = build_query(db).yield_per(batch_size)
+        yield from encode(rows, fields, batch_size)
+    finally:
+        db.close()
+
+
+def export_users(fmt: str = "ndjson", role=None, is_active: Optional[bool] = None) -> Iterator[bytes]:
+    def build_query(db: Session) -> Query:
+        query = db.query(*(getattr(models.User, f) for f in USER_EXPORT_FIELDS))
+        if role is not None:
+            query = query.filter(models.User.role == role)
+        if is_active is not None:
+            query = query.filter(models.User.is_active == is_active)
+        return query.order_by(models.User.created_at, models.User.id)
+
+    return stream_export(build_query, USER_EXPORT_FIELDS, fmt)
+
+
+def export_articles(fields: Sequence[str] = ARTICLE_EXPORT_DEFAULT_FIELDS, updated_since: Optional[datetime] = None) -> Iterator[bytes]:
+    """
+    Published articles as NDJSON, oldest change first, so a consumer can resume
+    with updated_since = the last row's updated_at (rows at that instant repeat).
+    updated_at falls back to created_at for rows never updated.
+    """
+    changed_at = func.coalesce(models.Article.updated_at, models.Article.created_at)
+
+    def build_query(db: Session) -> Query:
+        columns = [
+            changed_at.label("updated_at") if f == "updated_at" else getattr(models.Article, f)
+            for f in fields
+        ]
+        query = db.query(*columns).filter(models.Article.status == "published")
+        if updated_since is not None:
+            query = query.filter(changed_at >= updated_since)
+        return query.order_by(changed_at, models.Article.id)
+
+    return stream_export(build_query, fields, "ndjson")
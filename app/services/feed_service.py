@@ -0,0 +1,276 @@
+"""
+Pre-rendered RSS / Atom feeds (global and per category) and the XML sitemap.
+
+Documents are rendered once and kept as bytes with their ETag and
+Last-Modified, so a crawler poll is a dict lookup (or a 304). When an article
+is published, updated or unpublished (article_service._after_article_change)
+the affected documents are re-rendered in the background: the global feeds,
+the article's category feeds, any cached category feed that still lists it,
+and the sitemap, whose per-article entries are kept in memory and patched one
+article at a time instead of re-querying every published article.
+
+Each worker process keeps its own copy; FEED_TTL_SECONDS bounds how long a
+worker can serve a document another worker's write made stale.
+"""
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+# sitemap protocol limit per file
+SITEMAP_MAX_URLS = 50000
+
+MEDIA_TYPES = {
+    "rss": "application/rss+xml",
+    "atom": "application/atom+xml",
+    "sitemap": "application/xml",
+}
+
+_cache = TTLCache(ttl_seconds=settings.FEED_TTL_SECONDS, maxsize=1024)
+_render_lock = threading.Lock()
+# article_id -> (loc, lastmod) of published articles; None until first built
+_sitemap_entries: Optional[Dict[str, Tuple[str, datetime]]] = None
+
+# one worker: refreshes apply in order
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="feeds")
+
+
+def article_url(slug: str) -> str:
+    return f"{settings.SITE_URL.rstrip('/')}/articles/{slug}"
+
+
+def category_url(slug: str) -> str:
+    return f"{settings.SITE_URL.rstrip('/')}/category/{slug}"
+
+
+def _published_on():
+    return func.coalesce(models.Article.publish_at, models.Article.created_at)
+
+
+def _changed_on():
+    return func.coalesce(models.Article.updated_at, models.Article.created_at)
+
+
+def _feed_rows(db: Session, category_id: Optional[int]):
+    query = (
+        db.query(
+            models.Article.id,
+            models.Article.title,
+            models.Article.slug,
+            models.Article.summary,
+            _published_on().label("published_on"),
+            _changed_on().label("changed_on"),
+            models.User.username.label("author_name"),
+            models.Category.name.label("category_name"),
+        )
+        .outerjoin(models.User, models.User.id == models.Article.author_id)
+        .outerjoin(models.Category, models.Category.id == models.Article.category_id)
+        .filter(models.Article.status == "published")
+    )
+    if category_id is not None:
+        query = query.filter(models.Article.category_id == category_id)
+    return query.order_by(_published_on().desc()).limit(settings.FEED_ITEM_LIMIT).all()
+
+
+def _document(body: bytes, last_modified: datetime, media_type: str, article_ids=()) -> dict:
+    return {
+        "body": body,
+        "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        "last_modified": last_modified,
+        "media_type": media_type,
+        "article_ids": frozenset(article_ids),
+    }
+
+
+def _xml(root: ET.Element) -> bytes:
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def _rfc822(dt: datetime) -> str:
+    """RFC 822 date of a naive UTC datetime."""
+    return format_datetime(dt.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def render_rss(rows, title: str, link: str, description: str) -> bytes:
+    rss = ET.Element("rss", {"version": "2.0", "xmlns:atom": ATOM_NS})
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = title
+    ET.SubElement(channel, "link").text = link
+    ET.SubElement(channel, "description").text = description
+    if rows:
+        ET.SubElement(channel, "lastBuildDate").text = _rfc822(max(r.changed_on for r in rows))
+    for r in rows:
+        item = ET.SubElement(channel, "item")
+        ET.SubElement(item, "title").text = r.title
+        ET.SubElement(item, "link").text = article_url(r.slug)
+        ET.SubElement(item, "guid", {"isPermaLink": "false"}).text = f"urn:uuid:{r.id}"
+        ET.SubElement(item, "pubDate").text = _rfc822(r.published_on)
+        if r.summary:
+            ET.SubElement(item, "description").text = r.summary
+        if r.category_name:
+            ET.SubElement(item, "category").text = r.category_name
+    return _xml(rss)
+
+
+def render_atom(rows, title: str, link: str, feed_id: str) -> bytes:
+    feed = ET.Element("feed", {"xmlns": ATOM_NS})
+    ET.SubElement(feed, "title").text = title
+    ET.SubElement(feed, "id").text = feed_id
+    ET.SubElement(feed, "link", {"href": link})
+    updated = max((r.changed_on for r in rows), default=datetime.utcnow())
+    ET.SubElement(feed, "updated").text = updated.isoformat() + "Z"
+    for r in rows:
+        entry = ET.SubElement(feed, "entry")
+        ET.SubElement(entry, "title").text = r.title
+        ET.SubElement(entry, "id").text = f"urn:uuid:{r.id}"
+        ET.SubElement(entry, "link", {"href": article_url(r.slug)})
+        ET.SubElement(entry, "published").text = r.published_on.isoformat() + "Z"
+        ET.SubElement(entry, "updated").text = r.changed_on.isoformat() + "Z"
+        ET.SubElement(ET.SubElement(entry, "author"), "name").text = r.author_name or "Staff"
+        if r.summary:
+            ET.SubElement(entry, "summary").text = r.summary
+        if r.category_name:
+            ET.SubElement(entry, "category", {"term": r.category_name})
+    return _xml(feed)
+
+
+def _render_feeds(db: Session, category: Optional[models.Category]):
+    """Render and cache the rss + atom pair for a category (None: all articles)."""
+    rows = _feed_rows(db, category.id if category else None)
+    ids = [str(r.id) for r in rows]
+    last_modified = max((r.changed_on for r in rows), default=datetime.utcnow())
+    site = settings.SITE_URL.rstrip("/")
+    if category is None:
+        title, link, feed_id = settings.SITE_NAME, site, f"{site}/"
+        description = f"Latest news from {settings.SITE_NAME}"
+    else:
+        title, link = f"{settings.SITE_NAME} - {category.name}", category_url(category.slug)
+        feed_id, description = link, category.description or f"Latest {category.name} news"
+    key = category.id if category else None
+    _cache.set(("rss", key), _document(render_rss(rows, title, link, description), last_modified, MEDIA_TYPES["rss"], ids))
+    _cache.set(("atom", key), _document(render_atom(rows, title, link, feed_id), last_modified, MEDIA_TYPES["atom"], ids))
+
+
+def _build_sitemap_entries(db: Session) -> Dict[str, Tuple[str, datetime]]:
+    rows = (
+        db.query(models.Article.id, models.Article.slug, _changed_on().label("changed_on"))
+        .filter(models.Article.status == "published")
+        .order_by(_changed_on().desc())
+        .limit(SITEMAP_MAX_URLS)
+        .yield_per(5000)
+    )
+    return {str(r.id): (article_url(r.slug), r.changed_on) for r in rows}
+
+
+def _render_sitemap(entries: Dict[str, Tuple[str, datetime]]):
+    urlset = ET.Element("urlset", {"xmlns": SITEMAP_NS})
+    newest = sorted(entries.values(), key=lambda e: e[1], reverse=True)[:SITEMAP_MAX_URLS]
+    for loc, lastmod in newest:
+        url = ET.SubElement(urlset, "url")
+        ET.SubElement(url, "loc").text = loc
+        ET.SubElement(url, "lastmod").text = lastmod.strftime("%Y-%m-%dT%H:%M:%SZ")
+    last_modified = newest[0][1] if newest else datetime.utcnow()
+    _cache.set(("sitemap",), _document(_xml(urlset), last_modified, MEDIA_TYPES["sitemap"]))
+
+
+def get_feed(kind: str, category: Optional[models.Category] = None) -> dict:
+    """Cached rss / atom document; rendered on first use (or after the TTL)."""
+    key = (kind, category.id if category else None)
+    doc = _cache.get(key)
+    if doc is not None:
+        return doc
+    with _render_lock:
+        doc = _cache.get(key)
+        if doc is None:
+            db = SessionLocal()
+            try:
+                _render_feeds(db, category)
+            finally:
+                db.close()
+            doc = _cache.get(key)
+    return doc
+
+
+def get_sitemap() -> dict:
+    global _sitemap_entries
+    doc = _cache.get(("sitemap",))
+    if doc is not None:
+        return doc
+    with _render_lock:
+        doc = _cache.get(("sitemap",))
+        if doc is None:
+            # TTL expiry rebuilds the entries too (picks up other workers' writes)
+            db = SessionLocal()
+            try:
+                _sitemap_entries = _build_sitemap_entries(db)
+            finally:
+                db.close()
+            _render_sitemap(_sitemap_entries)
+            doc = _cache.get(("sitemap",))
+    return doc
+
+
+def _refresh_for_articles(article_ids):
+    """Re-render what the given articles appear in; each feed is rendered once per batch."""
+    article_ids = [str(i) for i in article_ids]
+    db = SessionLocal()
+    try:
+        rows = {
+            str(r.id): r for r in db.query(
+                models.Article.id,
+                models.Article.slug,
+                models.Article.status,
+                models.Article.category_id,
+                _changed_on().label("changed_on"),
+            ).filter(models.Article.id.in_(article_ids))
+        }
+        published = {
+            i: r for i, r in rows.items() if getattr(r.status, "value", r.status) == "published"
+        }
+
+        with _render_lock:
+            # categories whose cached feed lists one of the articles (moved or unpublished)
+            category_ids = {
+                key[1] for key, doc in _cache.items()
+                if key[0] in ("rss", "atom") and key[1] is not None and doc["article_ids"].intersection(article_ids)
+            }
+            category_ids.update(r.category_id for r in published.values() if r.category_id is not None)
+
+            _render_feeds(db, None)
+            existing = db.query(models.Category).filter(models.Category.id.in_(category_ids)).all()
+            for category in existing:
+                _render_feeds(db, category)
+            for category_id in category_ids - {c.id for c in existing}:
+                _cache.delete(("rss", category_id))
+                _cache.delete(("atom", category_id))
+
+            # patched only while the rendered sitemap is live; after the TTL it is rebuilt from the database
+            if _sitemap_entries is not None and _cache.get(("sitemap",)) is not None:
+                for article_id in article_ids:
+                    row = published.get(article_id)
+                    if row is not None:
+                        _sitemap_entries[article_id] = (article_url(row.slug), row.changed_on)
+                    else:
+                        _sitemap_entries.pop(article_id, None)
+                _render_sitemap(_sitemap_entries)
+    except Exception as e:
+        print(f"Feed refresh failed for {article_ids}: {e}")
+    finally:
+        db.close()
+
+
+def schedule_feed_refresh(*article_ids):
+    _executor.submit(_refresh_for_articles, article_ids)
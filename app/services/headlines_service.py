@@ -0,0 +1,86 @@
+import threading
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+
+# Precomputed "latest headlines" context for recency chat intents.
+# Built straight from Postgres so those questions skip embedding + vector search.
+
+_CACHE_KEY = "latest"
+_cache = TTLCache(ttl_seconds=settings.LATEST_HEADLINES_TTL_SECONDS, maxsize=1)
+_build_lock = threading.Lock()
+
+
+def build_latest_headlines(db: Session, limit: int) -> dict:
+    """
+    Returns {"context": str, "sources": [dict], "built_at": datetime}
+    for the newest published articles (publish_at, falling back to created_at).
+    """
+    published_on = func.coalesce(models.Article.publish_at, models.Article.created_at)
+    rows = (
+        db.query(
+            models.Article.id,
+            models.Article.title,
+            models.Article.summary,
+            models.Article.slug,
+            models.Article.category_id,
+            published_on.label("published_on"),
+        )
+        .filter(models.Article.status == "published")
+        .order_by(published_on.desc())
+        .limit(limit)
+        .all()
+    )
+
+    lines = []
+    sources = []
+    for i, row in enumerate(rows, start=1):
+        line = f"{i}. {row.title} ({row.published_on:%Y-%m-%d})"
+        if row.summary:
+            line += f" - {row.summary}"
+        lines.append(line)
+        sources.append({
+            "article_id": str(row.id),
+            "slug": row.slug,
+            "category_id": row.category_id,
+            "snippet": (row.summary or row.title)[:200],
+        })
+
+    return {
+        "context": "\n".join(lines),
+        "sources": sources,
+        "built_at": datetime.utcnow(),
+    }
+
+
+def refresh_latest_headlines(db: Optional[Session] = None) -> dict:
+    """Rebuild the headlines block now (called whenever publication state changes)."""
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
+    try:
+        block = build_latest_headlines(db, settings.LATEST_HEADLINES_LIMIT)
+    finally:
+        if own_session:
+            db.close()
+    _cache.set(_CACHE_KEY, block)
+    return block
+
+
+def get_latest_headlines() -> dict:
+    """Cached headlines block; rebuilt at most once per TTL per process."""
+    block = _cache.get(_CACHE_KEY)
+    if block is not None:
+        return block
+    with _build_lock:
+        block = _cache.get(_CACHE_KEY)
+        if block is None:
+            block = refresh_latest_headlines()
+    return block
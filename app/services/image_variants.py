@@ -0,0 +1,183 @@
+"""
+Image derivatives (thumbnail / card / hero, WebP plus a JPEG or PNG fallback).
+
+Variants are rendered from the stored blob in a process pool (Pillow work is
+CPU bound and would otherwise hold the GIL of the API process) and written to
+uploads/media/variants/<sha[:2]>/<sha[2:4]>/<sha256>-<name>-<width>w[-q<quality>].<ext>.
+The file name carries everything the bytes depend on, so a re-render with
+other widths / quality writes a new file instead of rewriting one that
+browsers cache as immutable. The rows in media_variants are recorded from the
+parent process once a job finishes; files of a replaced spec are removed then.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+
+VARIANT_SUBDIR = "variants"
+FORMAT_EXTENSIONS = {"webp": "webp", "jpeg": "jpg", "png": "png"}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def variant_relpath(sha256: str, name: str, fmt: str, width: int, quality: int) -> str:
+    # PNG is lossless: quality does not change its bytes
+    spec = f"{width}w" if fmt == "png" else f"{width}w-q{quality}"
+    return f"{VARIANT_SUBDIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}-{name}-{spec}.{FORMAT_EXTENSIONS[fmt]}"
+
+
+def render_variants(src_path: str, root: str, sha256: str, widths: Dict[str, int], quality: int) -> List[dict]:
+    """Runs in a worker process; returns one dict per written file."""
+    from PIL import Image, ImageOps
+
+    results = []
+    with Image.open(src_path) as original:
+        im = ImageOps.exif_transpose(original)
+        has_alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if has_alpha else "RGB")
+        fallback = "png" if has_alpha else "jpeg"
+
+        for name, width in sorted(widths.items(), key=lambda x: x[1]):
+            # never upscale
+            w = min(width, im.width)
+            h = max(1, round(im.height * w / im.width))
+            resized = im.resize((w, h), Image.LANCZOS) if w != im.width else im
+
+            for fmt in ("webp", fallback):
+                relpath = variant_relpath(sha256, name, fmt, w, quality)
+                path = os.path.join(root, *relpath.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.part"
+                if fmt == "webp":
+                    resized.save(tmp_path, "WEBP", quality=quality, method=4)
+                elif fmt == "jpeg":
+                    resized.save(tmp_path, "JPEG", quality=quality, optimize=True, progressive=True)
+                else:
+                    resized.save(tmp_path, "PNG", optimize=True)
+                os.replace(tmp_path, path)
+                results.append({
+                    "name": name,
+                    "format": fmt,
+                    "width": w,
+                    "height": h,
+                    "size": os.path.getsize(path),
+                    "path": relpath,
+                })
+    return results
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded server process is not safe
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.MEDIA_VARIANT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def remove_variant_files(root: str, paths: List[str]):
+    for relpath in paths:
+        path = os.path.join(root, *relpath.split("/"))
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def store_variants(sha256: str, rows: List[dict], root: str):
+    db = SessionLocal()
+    try:
+        previous = [
+            row.path for row in
+            db.query(models.MediaVariant.path).filter(models.MediaVariant.blob_sha256 == sha256)
+        ]
+        for row in rows:
+            db.execute(
+                pg_insert(models.MediaVariant)
+                .values(blob_sha256=sha256, **row)
+                .on_conflict_do_update(
+                    constraint="uq_media_variant",
+                    set_={k: row[k] for k in ("width", "height", "size", "path")},
+                )
+            )
+        db.commit()
+        # rendered before with other widths / quality
+        current = {row["path"] for row in rows}
+        remove_variant_files(root, [path for path in previous if path not in current])
+    except IntegrityError:
+        # the blob was deleted while its variants were rendering
+        db.rollback()
+        remove_variant_files(root, [row["path"] for row in rows])
+    finally:
+        db.close()
+
+
+def _on_rendered(sha256: str, root: str, future):
+    try:
+        store_variants(sha256, future.result(), root)
+    except Exception as e:
+        print(f"Media variants failed for {sha256}: {e}")
+
+
+def schedule_variants(blobs: List[tuple], root: str):
+    """Render the configured variants of each (sha256, path) blob in the background."""
+    for sha256, path in blobs:
+        future = _get_pool().submit(
+            render_variants,
+            os.path.join(root, *path.split("/")),
+            root,
+            sha256,
+            dict(settings.MEDIA_VARIANT_WIDTHS),
+            settings.MEDIA_VARIANT_QUALITY,
+        )
+        future.add_done_callback(partial(_on_rendered, sha256, root))
+
+
+def backfill_variants(root: str, batch_size: int = 100) -> dict:
+    """Render variants for stored blobs that have none (manage.py media-variants)."""
+    db = SessionLocal()
+    done = failed = 0
+    try:
+        missing = (
+            db.query(models.MediaBlob.sha256, models.MediaBlob.path)
+            .outerjoin(models.MediaVariant, models.MediaVariant.blob_sha256 == models.MediaBlob.sha256)
+            .filter(models.MediaVariant.id.is_(None))
+            .all()
+        )
+    finally:
+        db.close()
+
+    pool = _get_pool()
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        futures = [
+            (sha256, pool.submit(
+                render_variants,
+                os.path.join(root, *path.split("/")),
+                root,
+                sha256,
+                dict(settings.MEDIA_VARIANT_WIDTHS),
+                settings.MEDIA_VARIANT_QUALITY,
+            ))
+            for sha256, path in batch
+        ]
+        for sha256, future in futures:
+            try:
+                store_variants(sha256, future.result(), root)
+                done += 1
+            except Exception as e:
+                print(f"Media variants failed for {sha256}: {e}")
+                failed += 1
+    return {"blobs": len(missing), "rendered": done, "failed": failed}
@@ -0,0 +1,133 @@
+"""
+Reconcile the chroma index with Postgres (run through `python manage.py reconcile-index`).
+
+- orphans: chunks whose article no longer exists -> deleted in batches
+- stale: chunks whose status / category / updated_ts metadata no longer match
+  the article row (or predate the updated_ts marker) -> article re-indexed
+- missing: articles without any chunks -> re-indexed when fix_missing=True
+"""
+import os
+from typing import Optional
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.services.embedding_service import (
+    CHROMA_PERSIST_DIR,
+    _chunk_metadata,
+    _get_vectorstore,
+    index_article,
+)
+from app.services.reindex_service import CHROMA_WRITE_BATCH
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _version(meta: dict) -> tuple:
+    return (meta.get("status"), meta.get("category_id"), meta.get("updated_ts"))
+
+
+def _bloat_snapshot(collection, orphan_chunks: Optional[int] = None) -> dict:
+    snapshot = {
+        "chunks": collection.count(),
+        "disk_bytes": _dir_size(CHROMA_PERSIST_DIR),
+    }
+    if orphan_chunks is not None:
+        snapshot["orphan_chunks"] = orphan_chunks
+        snapshot["orphan_ratio"] = round(orphan_chunks / snapshot["chunks"], 4) if snapshot["chunks"] else 0.0
+    return snapshot
+
+
+def _reindex_articles(db, article_ids, batch_size: int) -> int:
+    done = 0
+    for start in range(0, len(article_ids), batch_size):
+        batch = article_ids[start:start + batch_size]
+        for article in db.query(models.Article).filter(models.Article.id.in_(batch)).all():
+            try:
+                index_article(article)
+                done += 1
+            except Exception as e:
+                print(f"re-index of {article.id} failed: {e}")
+        db.expunge_all()
+    return done
+
+
+def reconcile_index(
+    batch_size: int = 1000,
+    fix_stale: bool = True,
+    fix_missing: bool = False,
+    dry_run: bool = False,
+) -> dict:
+    collection = _get_vectorstore()._collection
+    db = SessionLocal()
+    try:
+        # 1) expected chunk version per article, streamed from Postgres
+        expected = {}
+        rows = db.query(
+            models.Article.id,
+            models.Article.status,
+            models.Article.category_id,
+            models.Article.created_at,
+            models.Article.updated_at,
+        ).yield_per(batch_size)
+        for row in rows:
+            expected[str(row.id)] = _version(_chunk_metadata(row))
+
+        # 2) scan chunk metadata page by page
+        orphan_ids = []
+        stale = set()
+        indexed = set()
+        offset = 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+            ids = page["ids"]
+            if not ids:
+                break
+            for chunk_id, meta in zip(ids, page["metadatas"]):
+                meta = meta or {}
+                article_id = meta.get("article_id")
+                version = expected.get(article_id)
+                if version is None:
+                    orphan_ids.append(chunk_id)
+                    continue
+                indexed.add(article_id)
+                if _version(meta) != version:
+                    stale.add(article_id)
+            offset += len(ids)
+
+        # title is mandatory, so every article should have at least one chunk
+        missing = sorted(set(expected) - indexed)
+        before = _bloat_snapshot(collection, orphan_chunks=len(orphan_ids))
+        report = {
+            "articles": len(expected),
+            "orphan_chunks": len(orphan_ids),
+            "stale_articles": len(stale),
+            "missing_articles": len(missing),
+            "before": before,
+        }
+        if dry_run:
+            return report
+
+        # 3) repair
+        for start in range(0, len(orphan_ids), CHROMA_WRITE_BATCH):
+            collection.delete(ids=orphan_ids[start:start + CHROMA_WRITE_BATCH])
+
+        reindexed = 0
+        if fix_stale:
+            reindexed += _reindex_articles(db, sorted(stale), batch_size)
+        if fix_missing:
+            reindexed += _reindex_articles(db, missing, batch_size)
+
+        report["reindexed_articles"] = reindexed
+        report["after"] = _bloat_snapshot(collection)
+        return report
+    finally:
+        db.close()
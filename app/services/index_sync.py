@@ -0,0 +1,37 @@
+from typing import List
+from sqlalchemy.orm import Session
+from app.db import models
+from app.services.embedding_service import clear_articles_category, delete_articles_chunks
+
+
+def article_ids_for(db: Session, *criteria) -> List[str]:
+    """Ids of the articles a cascading delete is about to touch."""
+    return [str(row.id) for row in db.query(models.Article.id).filter(*criteria).all()]
+
+
+def drop_chunks_of_deleted_articles(db: Session, article_ids: List[str]):
+    """
+    Remove vector chunks of articles that no longer exist after a cascading
+    delete (best effort; reconciliation picks up anything missed here).
+    """
+    if not article_ids:
+        return
+    try:
+        remaining = {
+            str(row.id)
+            for row in db.query(models.Article.id).filter(models.Article.id.in_(article_ids)).all()
+        }
+        delete_articles_chunks([i for i in article_ids if i not in remaining])
+    except Exception:
+        pass
+
+
+def clear_category_of_articles(article_ids: List[str]):
+    """
+    Articles survive a category delete (category_id is SET NULL): patch their
+    chunks so category-filtered retrieval stops returning them (best effort).
+    """
+    try:
+        clear_articles_category(article_ids)
+    except Exception:
+        pass
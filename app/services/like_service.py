@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from app.db import models
+from app.db.keyset import keyset_page
 from app.schemas.like import LikeCreate
+from app.services.article_card_service import card_options, with_cards
 
 
 
@@ -38,6 +40,26 @@ def get_like_by_user_and_article(db: Session, user_id, article_id) -> Optional[m
 
 
 
+def list_likes_for_user(
+    db: Session,
+    user_id,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """Newest first as LikeCard dicts, keyset-paginated on (created_at, id); raises InvalidCursor."""
+    query = (
+        db.query(models.Like)
+        .join(models.Like.article)
+        .options(*card_options(models.Like.article))
+        .filter(models.Like.user_id == user_id)
+    )
+    rows, next_cursor = keyset_page(
+        query, [models.Like.created_at, models.Like.id], limit, cursor, descending=True
+    )
+    return with_cards(db, rows), next_cursor
+
+
+
 def remove_like(db: Session, like: models.Like):
     """Remove like and decrease article counter."""
     article = db.query(models.Article).filter(models.Article.id == like.article_id).first()
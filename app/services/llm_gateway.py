@@ -0,0 +1,441 @@
+"""
+Single entry point for LLM calls (chat endpoint and summarizer).
+
+Every call goes through:
+- token buckets for requests/minute and tokens/minute per model (provider quotas, per process)
+- a per-call deadline covering queueing, retries and the upstream request
+- jittered exponential retries for transient upstream errors (429 / 5xx / network)
+- a per-model circuit breaker that fails fast while the provider is down
+- optional hedging: a second identical request if the first is slow
+- latency / token metrics per model (get_metrics)
+
+LLM_BACKEND="fake" swaps the provider for a local deterministic model (tests, offline dev).
+Errors surface as LLMError subclasses carrying the HTTP status the API should return.
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.core.config import settings
+
+
+# ------------------------- Errors -------------------------
+
+class LLMError(RuntimeError):
+    status_code = 503
+
+
+class LLMRateLimited(LLMError):
+    """Local quota exhausted for longer than the call deadline."""
+    status_code = 503
+
+
+class LLMUnavailable(LLMError):
+    """Circuit open, or the provider kept failing."""
+    status_code = 503
+
+
+class LLMTimeout(LLMError):
+    """Deadline passed before a response arrived."""
+    status_code = 504
+
+
+# ------------------------- Rate limiting -------------------------
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, amount: float) -> bool:
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return True
+            return False
+
+    def acquire(self, amount: float, deadline: float):
+        # a single request larger than the bucket would never fit
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait_for = (amount - self.tokens) / self.rate
+            if now + wait_for > deadline:
+                raise LLMRateLimited("LLM rate limit reached, try again later")
+            time.sleep(min(wait_for, 1.0))
+
+    def charge(self, amount: float):
+        # usage above the estimate is paid for afterwards (the bucket may go negative)
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= amount
+
+
+# ------------------------- Circuit breaker -------------------------
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self):
+        """False to reject; "probe" when the caller is the one half-open probe, True otherwise."""
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.probing:
+                # let exactly one probe through
+                self.probing = True
+                return "probe"
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self, probe: bool = False):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            if probe:
+                self.probing = False
+
+    def release_probe(self):
+        """The call ended without reaching the provider (quota, setup): let the next one probe."""
+        with self.lock:
+            self.probing = False
+
+
+# ------------------------- Metrics -------------------------
+
+class _ModelMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.hedges = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latencies = deque(maxlen=1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lat = sorted(self.latencies)
+
+        def pct(p):
+            return round(lat[min(len(lat) - 1, int(p * len(lat)))] * 1000, 1) if lat else None
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "latency_ms_p50": pct(0.50),
+            "latency_ms_p95": pct(0.95),
+            "latency_ms_p99": pct(0.99),
+        }
+
+
+_metrics: Dict[str, _ModelMetrics] = {}
+_metrics_lock = threading.Lock()
+
+
+def _record(model: str, **deltas):
+    with _metrics_lock:
+        m = _metrics.setdefault(model, _ModelMetrics())
+        latency = deltas.pop("latency", None)
+        if latency is not None:
+            m.latencies.append(latency)
+        for key, value in deltas.items():
+            setattr(m, key, getattr(m, key) + value)
+
+
+def get_metrics() -> Dict[str, Any]:
+    with _metrics_lock:
+        models = {name: m.snapshot() for name, m in _metrics.items()}
+    return {
+        "backend": settings.LLM_BACKEND,
+        "models": models,
+        "circuits": {name: b.state for name, b in _breakers.items()},
+    }
+
+
+# ------------------------- Backends -------------------------
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic local model: echoes the start of the last message."""
+
+    model: str = "fake"
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-gateway"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        last = str(messages[-1].content) if messages else ""
+        text = f"[{self.model}] {last[:200]}"
+        prompt_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        message = AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": estimate_tokens(text),
+                "total_tokens": prompt_tokens + estimate_tokens(text),
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+_clients: Dict[tuple, BaseChatModel] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(model: str, temperature: float) -> BaseChatModel:
+    key = (settings.LLM_BACKEND, model, temperature)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if settings.LLM_BACKEND == "fake":
+                client = FakeChatModel(model=model, latency=settings.LLM_FAKE_LATENCY_SECONDS)
+            else:
+                from langchain_groq import ChatGroq
+
+                if not settings.GROQ_API_KEY:
+                    raise RuntimeError("GROQ_API_KEY not set")
+                # retries and deadlines are handled here, not inside the client
+                client = ChatGroq(
+                    model=model,
+                    api_key=settings.GROQ_API_KEY,
+                    temperature=temperature,
+                    timeout=settings.LLM_TIMEOUT_SECONDS,
+                    max_retries=0,
+                )
+            _clients[key] = client
+        return client
+
+
+# ------------------------- Gateway -------------------------
+
+_buckets: Dict[str, tuple] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+# upstream calls run here so the caller can stop waiting at its deadline
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm")
+
+TRANSIENT_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def _breaker(model: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(model)
+        if breaker is None:
+            breaker = CircuitBreaker(settings.LLM_CIRCUIT_FAILURES, settings.LLM_CIRCUIT_RESET_SECONDS)
+            _breakers[model] = breaker
+        return breaker
+
+
+def _limits(model: str) -> tuple:
+    # (requests bucket, tokens bucket); provider quotas are per model
+    with _breakers_lock:
+        limits = _buckets.get(model)
+        if limits is None:
+            limits = (TokenBucket(settings.LLM_REQUESTS_PER_MINUTE), TokenBucket(settings.LLM_TOKENS_PER_MINUTE))
+            _buckets[model] = limits
+        return limits
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text
+    return len(text or "") // 4 + 1
+
+
+def _is_transient(e: Exception) -> bool:
+    status = getattr(e, "status_code", None)
+    if status is not None:
+        return status in TRANSIENT_STATUS
+    name = type(e).__name__
+    return isinstance(e, (TimeoutError, ConnectionError)) or "Timeout" in name or "Connection" in name
+
+
+def _usage(result) -> tuple:
+    usage = getattr(result, "usage_metadata", None) or {}
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    usage = (getattr(result, "response_metadata", None) or {}).get("token_usage") or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def _call(
+    client: BaseChatModel,
+    messages: List[BaseMessage],
+    deadline: float,
+    model: str,
+    requests: TokenBucket,
+    tokens: TokenBucket,
+    estimate: int,
+):
+    """One attempt, hedged with a duplicate request if it is slower than LLM_HEDGE_AFTER_SECONDS."""
+    futures = [_executor.submit(client.invoke, messages)]
+    hedge_after = settings.LLM_HEDGE_AFTER_SECONDS
+    remaining = deadline - time.monotonic()
+
+    if hedge_after and remaining > hedge_after:
+        done, _ = wait(futures, timeout=hedge_after)
+        # the hedge must fit the request and token quotas, otherwise just keep waiting
+        if not done and tokens.try_acquire(estimate):
+            if requests.try_acquire(1):
+                _record(model, hedges=1)
+                futures.append(_executor.submit(client.invoke, messages))
+            else:
+                tokens.charge(-estimate)
+
+    pending = set(futures)
+    error = None
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for f in done:
+            if f.exception() is None:
+                return f.result()
+            error = f.exception()
+    if error is not None and not pending:
+        raise error
+    raise FutureTimeout()
+
+
+def invoke(
+    messages: List[BaseMessage],
+    model: Optional[str] = None,
+    temperature: float = 0.1,
+    timeout: Optional[float] = None,
+) -> str:
+    """Run one chat completion and return its text, or raise an LLMError."""
+    model = model or settings.GROQ_MODEL
+    deadline = time.monotonic() + (timeout or settings.LLM_TIMEOUT_SECONDS)
+    breaker = _breaker(model)
+    client = _get_client(model, temperature)
+    requests, tokens = _limits(model)
+    estimate = sum(estimate_tokens(str(m.content)) for m in messages) + settings.LLM_EXPECTED_OUTPUT_TOKENS
+    allowed = breaker.allow()
+    if not allowed:
+        raise LLMUnavailable("LLM provider unavailable, try again later")
+    probe = allowed == "probe"
+
+    try:
+        return _attempts(client, messages, deadline, model, breaker, probe, requests, tokens, estimate)
+    finally:
+        # a probe that ended before reaching the provider (rate limited) would otherwise
+        # leave the breaker half open with its probe taken, rejecting every later call
+        if probe:
+            breaker.release_probe()
+
+
+def _attempts(client, messages, deadline, model, breaker, probe, requests, tokens, estimate) -> str:
+    attempt = 0
+    while True:
+        requests.acquire(1, deadline)
+        tokens.acquire(estimate, deadline)
+        start = time.monotonic()
+        try:
+            result = _call(client, messages, deadline, model, requests, tokens, estimate)
+        except FutureTimeout:
+            breaker.record_failure(probe)
+            _record(model, calls=1, timeouts=1, latency=time.monotonic() - start)
+            raise LLMTimeout("LLM request timed out")
+        except Exception as e:
+            transient = _is_transient(e)
+            _record(model, calls=1, errors=1, latency=time.monotonic() - start)
+            if not transient:
+                # a 4xx means the provider is up and rejected this request
+                status = getattr(e, "status_code", None)
+                if status is not None and 400 <= status < 500:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure(probe)
+                raise LLMUnavailable(f"LLM request failed: {e}")
+
+            attempt += 1
+            backoff = random.uniform(0, settings.LLM_RETRY_BASE_DELAY * 2 ** attempt)
+            if attempt > settings.LLM_MAX_RETRIES or time.monotonic() + backoff >= deadline:
+                breaker.record_failure(probe)
+                raise LLMUnavailable(f"LLM request failed: {e}")
+            _record(model, retries=1)
+            time.sleep(backoff)
+            continue
+
+        breaker.record_success()
+        input_tokens, output_tokens = _usage(result)
+        if input_tokens + output_tokens > estimate:
+            tokens.charge(input_tokens + output_tokens - estimate)
+        _record(
+            model,
+            calls=1,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency=time.monotonic() - start,
+        )
+        content = getattr(result, "content", result)
+        return content.strip() if isinstance(content, str) else str(content)
+
+
+def batch(
+    message_lists: List[List[BaseMessage]],
+    model: Optional[str] = None,
+    temperature: float = 0.1,
+    max_concurrency: int = 4,
+    timeout: Optional[float] = None,
+) -> List[str]:
+    """invoke() for several prompts concurrently; fails if any of them fails."""
+    if not message_lists:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(message_lists)))) as pool:
+        return list(pool.map(
+            lambda messages: invoke(messages, model=model, temperature=temperature, timeout=timeout),
+            message_lists,
+        ))
@@ -0,0 +1,252 @@
+"""
+Garbage-collect media files nothing references (run through `python manage.py media-gc`).
+
+Media rows disappear through database cascades (article / user / category
+deletes) without touching disk, so this job walks uploads/media and:
+- blobs whose row has no Media reference left: row, variants and file are dropped
+- blob / variant files without a blob row, legacy files without a Media row: moved
+- stale partial uploads in uploads/.tmp: deleted
+
+Only files older than the grace period are touched (an upload places its file
+before committing its row), blob files are moved while the blob row is locked
+the same way uploads lock it, and unreferenced files go to uploads/.trash/<run>/
+first; trash runs older than purge_days are deleted for good.
+"""
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.services.image_variants import VARIANT_SUBDIR
+from app.services.media_service import BLOB_SUBDIR, UPLOAD_DIR, UPLOAD_TMP_DIR, local_path
+
+TRASH_DIR = "uploads/.trash"
+TRASH_RUN_FORMAT = "%Y%m%dT%H%M%S"
+# one GC at a time across processes
+GC_LOCK_KEY = 0x6D656469615F6763  # "media_gc"
+
+
+def _walk(root: str) -> Iterator[os.DirEntry]:
+    """Stream files below root without building the full listing."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+def _batches(items: Iterator, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _relpath(path: str) -> str:
+    return os.path.relpath(path, UPLOAD_DIR).replace(os.sep, "/")
+
+
+class _Run:
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.trash_root = os.path.join(TRASH_DIR, datetime.utcnow().strftime(TRASH_RUN_FORMAT))
+        self.stats = {
+            "scanned_files": 0,
+            "unreferenced_blob_rows": 0,
+            "trashed_files": 0,
+            "trashed_bytes": 0,
+            "stale_partial_uploads": 0,
+            "purged_runs": 0,
+            "reclaimed_bytes": 0,
+        }
+
+    def trash(self, path: str):
+        if not os.path.exists(path):
+            return
+        size = os.path.getsize(path)
+        self.stats["trashed_files"] += 1
+        self.stats["trashed_bytes"] += size
+        if self.dry_run:
+            return
+        target = os.path.join(self.trash_root, *_relpath(path).split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+
+
+def _collect_unreferenced_blobs(db, run: _Run, cutoff: datetime, batch_size: int):
+    """Blob rows left without any Media row (cascaded deletes)."""
+    last = ""
+    while True:
+        rows = (
+            db.query(models.MediaBlob)
+            .outerjoin(models.Media, models.Media.blob_sha256 == models.MediaBlob.sha256)
+            .filter(
+                models.Media.id.is_(None),
+                models.MediaBlob.created_at < cutoff,
+                models.MediaBlob.sha256 > last,
+            )
+            .order_by(models.MediaBlob.sha256)
+            .limit(batch_size)
+            .with_for_update(of=models.MediaBlob, skip_locked=True)
+            .all()
+        )
+        if not rows:
+            db.commit()
+            return
+        last = rows[-1].sha256
+        for blob in rows:
+            # re-check under the lock: an attach may have committed in between
+            if db.query(models.Media.id).filter(models.Media.blob_sha256 == blob.sha256).first():
+                continue
+            run.stats["unreferenced_blob_rows"] += 1
+            variant_paths = [
+                row.path for row in db.query(models.MediaVariant.path)
+                .filter(models.MediaVariant.blob_sha256 == blob.sha256)
+            ]
+            for relpath in [blob.path] + variant_paths:
+                run.trash(local_path(relpath))
+            if not run.dry_run:
+                db.delete(blob)
+        if run.dry_run:
+            db.rollback()
+        else:
+            db.commit()
+
+
+def _trash_orphan_blob_files(db, run: _Run, entries: List[os.DirEntry]):
+    """Blob files without a row; each is moved while holding the (placeholder) row lock."""
+    for entry in entries:
+        sha256 = entry.name.split(".", 1)[0]
+        relpath = _relpath(entry.path)
+        if run.dry_run:
+            if not db.query(models.MediaBlob.sha256).filter(models.MediaBlob.sha256 == sha256).first():
+                run.trash(entry.path)
+            continue
+        # same statement uploads use: if it inserts, no blob row existed and an
+        # upload of this content now waits for us instead of reusing the file
+        inserted = db.execute(
+            pg_insert(models.MediaBlob)
+            .values(sha256=sha256, path=relpath)
+            .on_conflict_do_nothing(index_elements=["sha256"])
+            .returning(models.MediaBlob.sha256)
+        ).first()
+        if inserted:
+            run.trash(entry.path)
+            db.query(models.MediaBlob).filter(models.MediaBlob.sha256 == sha256).delete(synchronize_session=False)
+        db.commit()
+
+
+def _trash_orphan_variants(db, run: _Run, entries: List[os.DirEntry]):
+    shas = {e.name.split("-", 1)[0] for e in entries}
+    known = {
+        row.sha256 for row in db.query(models.MediaBlob.sha256).filter(models.MediaBlob.sha256.in_(shas))
+    }
+    for entry in entries:
+        if entry.name.split("-", 1)[0] not in known:
+            run.trash(entry.path)
+
+
+def _trash_orphan_legacy(db, run: _Run, entries: List[os.DirEntry]):
+    urls = {f"/media/{e.name}" for e in entries}
+    known = {row.url for row in db.query(models.Media.url).filter(models.Media.url.in_(urls))}
+    for entry in entries:
+        if f"/media/{entry.name}" not in known:
+            run.trash(entry.path)
+
+
+def _purge_trash(run: _Run, purge_before: datetime):
+    if not os.path.isdir(TRASH_DIR):
+        return
+    for name in sorted(os.listdir(TRASH_DIR)):
+        try:
+            created = datetime.strptime(name, TRASH_RUN_FORMAT)
+        except ValueError:
+            continue
+        if created >= purge_before:
+            continue
+        path = os.path.join(TRASH_DIR, name)
+        size = sum(e.stat().st_size for e in _walk(path))
+        run.stats["purged_runs"] += 1
+        run.stats["reclaimed_bytes"] += size
+        if not run.dry_run:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def collect_media_garbage(
+    grace_hours: float = 24,
+    purge_days: float = 7,
+    batch_size: int = 500,
+    dry_run: bool = False,
+) -> Optional[dict]:
+    """Returns the run report, or None if another GC holds the lock."""
+    now = datetime.utcnow()
+    cutoff = now - timedelta(hours=grace_hours)
+    cutoff_ts = time.time() - grace_hours * 3600
+    run = _Run(dry_run)
+
+    def old_files(entries: Iterator[os.DirEntry]):
+        for entry in entries:
+            run.stats["scanned_files"] += 1
+            if entry.stat(follow_symlinks=False).st_mtime < cutoff_ts:
+                yield entry
+
+    def legacy_files():
+        # uploads stored before deduplication sit directly in uploads/media
+        with os.scandir(UPLOAD_DIR) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    yield entry
+
+    db = SessionLocal()
+    # session-level lock on its own connection, held for the whole run
+    lock_db = SessionLocal()
+    try:
+        locked = lock_db.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": GC_LOCK_KEY}).scalar()
+        if not locked:
+            return None
+        try:
+            _collect_unreferenced_blobs(db, run, cutoff, batch_size)
+
+            blob_root = os.path.join(UPLOAD_DIR, BLOB_SUBDIR)
+            if os.path.isdir(blob_root):
+                for batch in _batches(old_files(_walk(blob_root)), batch_size):
+                    _trash_orphan_blob_files(db, run, batch)
+            variant_root = os.path.join(UPLOAD_DIR, VARIANT_SUBDIR)
+            if os.path.isdir(variant_root):
+                for batch in _batches(old_files(_walk(variant_root)), batch_size):
+                    _trash_orphan_variants(db, run, batch)
+            for batch in _batches(old_files(legacy_files()), batch_size):
+                _trash_orphan_legacy(db, run, batch)
+
+            if os.path.isdir(UPLOAD_TMP_DIR):
+                for entry in _walk(UPLOAD_TMP_DIR):
+                    if entry.stat().st_mtime < cutoff_ts:
+                        run.stats["stale_partial_uploads"] += 1
+                        run.stats["reclaimed_bytes"] += entry.stat().st_size
+                        if not dry_run:
+                            os.remove(entry.path)
+
+            _purge_trash(run, now - timedelta(days=purge_days))
+        finally:
+            lock_db.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": GC_LOCK_KEY})
+    finally:
+        lock_db.close()
+        db.close()
+
+    report = dict(run.stats)
+    report["trash_dir"] = None if dry_run or not run.stats["trashed_files"] else run.trash_root
+    report["dry_run"] = dry_run
+    return report
@@ -1,10 +1,18 @@
+import asyncio
+import hashlib
 import os
-import uuid
-from typing import Optional
-from fastapi import UploadFile, HTTPException
+import tempfile
+from typing import List, Optional
+from fastapi import HTTPException, Request
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.db import models
 from app.schemas.media import MediaCreate
+from app.services.image_variants import schedule_variants
 
 # Allowed MIME types
 ALLOWED_IMAGE_TYPES = {
@@ -14,48 +22,361 @@ ALLOWED_IMAGE_TYPES = {
     "image/webp",
 }
 
+# file extension per sniffed type
+IMAGE_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+}
+
 
 UPLOAD_DIR = "uploads/media"
+# content-addressed files: blobs/<sha[:2]>/<sha[2:4]>/<sha>.<ext>, served as /media/blobs/...
+BLOB_SUBDIR = "blobs"
+# partial uploads; same filesystem as UPLOAD_DIR so the final rename is atomic
+UPLOAD_TMP_DIR = "uploads/.tmp"
+
+# enough for sniff_image_type
+SNIFF_BYTES = 12
+# room for part headers / small form fields on top of the files in one request body
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
 
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+os.makedirs(UPLOAD_TMP_DIR, exist_ok=True)
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Detect the image type from its magic bytes (the client's content_type is not trusted)."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if len(head) >= 12 and head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class _StagedFile:
+    """
+    One file part being written to UPLOAD_TMP_DIR while it arrives. write()
+    runs in the parser callbacks on the event loop and only checks and
+    buffers; flush() / sync() / discard() do the file I/O in the threadpool.
+    """
+
+    def __init__(self):
+        self.tmp_path = None
+        self.out = None
+        self.digest = hashlib.sha256()
+        self.pending: List[bytes] = []
+        self.size = 0
+        self.head = b""
+        self.mime_type = None
+
+    def write(self, data: bytes):
+        max_bytes = settings.MEDIA_MAX_UPLOAD_BYTES
+        self.size += len(data)
+        if self.size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"File too large (max {max_bytes} bytes)")
+        if self.mime_type is None and len(self.head) < SNIFF_BYTES:
+            self.head += data[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                self._sniff()
+        self.pending.append(data)
+
+    def _sniff(self):
+        self.mime_type = sniff_image_type(self.head)
+        if self.mime_type is None:
+            raise HTTPException(status_code=400, detail="Invalid image type" if self.size else "Empty file")
+
+    def finish(self):
+        if self.mime_type is None:
+            self._sniff()
+
+    def flush(self):
+        if self.out is None:
+            fd, self.tmp_path = tempfile.mkstemp(dir=UPLOAD_TMP_DIR, suffix=".part")
+            self.out = os.fdopen(fd, "wb")
+        pending, self.pending = self.pending, []
+        for data in pending:
+            self.digest.update(data)
+            self.out.write(data)
+
+    def sync(self):
+        self.flush()
+        self.out.flush()
+        os.fsync(self.out.fileno())
+        self.out.close()
+
+    def discard(self):
+        if self.out is not None and not self.out.closed:
+            self.out.close()
+        if self.tmp_path is not None:
+            discard_staged(self.tmp_path)
+
+    def staged(self) -> tuple[str, str, int, str]:
+        return self.tmp_path, self.mime_type, self.size, self.digest.hexdigest()
+
+
+def _flush_all(files: List[_StagedFile]):
+    for f in files:
+        f.flush()
+
+
+def _discard_all(files: List[_StagedFile]):
+    for f in files:
+        f.discard()
+
+
+def _part_headers(raw: List[tuple]) -> tuple[Optional[str], Optional[str], str]:
+    """(field name, filename, content type) of a multipart part."""
+    headers = {name.lower(): value for name, value in raw}
+    _, disposition = parse_options_header(headers.get(b"content-disposition", b""))
+    name = disposition.get(b"name")
+    filename = disposition.get(b"filename")
+    content_type = parse_options_header(headers.get(b"content-type", b""))[0].decode("latin-1")
+    return (
+        name.decode("utf-8", "replace") if name is not None else None,
+        filename.decode("utf-8", "replace") if filename is not None else None,
+        content_type,
+    )
+
+
+async def stage_request_uploads(request: Request, field: str, max_files: int) -> List[tuple[str, str, int, str]]:
+    """
+    Stream the multipart/form-data request body straight into temp files
+    under UPLOAD_TMP_DIR, one per `field` file part (at most max_files).
+
+    Parsed as the bytes arrive (nothing is spooled first): a Content-Length
+    over the limit is refused before reading, each file is type-sniffed from
+    its first bytes, hashed on the way and aborted with 413 as soon as it
+    passes MEDIA_MAX_UPLOAD_BYTES. Writes go through the threadpool after
+    each received chunk and the files are fsynced concurrently, so the event
+    loop never blocks on disk. create_media_records() moves the files into
+    the blob store. All or nothing: on any error every staged file is discarded.
+    Returns [(tmp_path, mime_type, file_size, sha256)] in upload order.
+    """
+    mime, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if mime != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    # whole-body cap: the files plus generous room for part headers and other fields
+    body_limit = max_files * settings.MEDIA_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > body_limit:
+        raise HTTPException(status_code=413, detail=f"Upload too large (max {settings.MEDIA_MAX_UPLOAD_BYTES} bytes per file)")
+
+    files: List[_StagedFile] = []
+    state = {"headers": [], "field": b"", "value": b"", "current": None}
+
+    def on_part_begin():
+        state["headers"], state["current"] = [], None
+
+    def on_header_field(data, start, end):
+        state["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"].append((state["field"], state["value"]))
+        state["field"], state["value"] = b"", b""
+
+    def on_headers_finished():
+        name, filename, content_type = _part_headers(state["headers"])
+        if name != field or filename is None:
+            return  # other form fields are ignored
+        if len(files) >= max_files:
+            raise HTTPException(status_code=400, detail=f"At most {max_files} files per upload")
+        if content_type not in ALLOWED_IMAGE_TYPES:
+            raise HTTPException(status_code=400, detail="Invalid image type")
+        state["current"] = _StagedFile()
+        files.append(state["current"])
+
+    def on_part_data(data, start, end):
+        if state["current"] is not None:
+            state["current"].write(data[start:end])
+
+    def on_part_end():
+        if state["current"] is not None:
+            state["current"].finish()
+            state["current"] = None
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    try:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                # chunked bodies carry no Content-Length
+                raise HTTPException(status_code=413, detail=f"Upload too large (max {settings.MEDIA_MAX_UPLOAD_BYTES} bytes per file)")
+            parser.write(chunk)
+            pending = [f for f in files if f.pending]
+            if pending:
+                await run_in_threadpool(_flush_all, pending)
+        parser.finalize()
+        if state["current"] is not None:
+            raise HTTPException(status_code=400, detail="Incomplete upload")
+        if not files:
+            raise HTTPException(status_code=400, detail=f"No '{field}' file in the upload")
+        await asyncio.gather(*(run_in_threadpool(f.sync) for f in files))
+    except MultipartParseError:
+        await run_in_threadpool(_discard_all, files)
+        raise HTTPException(status_code=400, detail="Malformed multipart body")
+    except Exception:
+        await run_in_threadpool(_discard_all, files)
+        raise
+    except BaseException:
+        # cancelled (client went away): clean up without awaiting
+        _discard_all(files)
+        raise
+    return [f.staged() for f in files]
+
+
+def discard_staged(tmp_path: str):
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
 
 
-def save_file_locally(file: UploadFile) -> tuple[str, str, int]:
+def blob_relpath(sha256: str, mime_type: str) -> str:
+    return f"{BLOB_SUBDIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}.{IMAGE_EXTENSIONS.get(mime_type, 'bin')}"
+
+
+def local_path(relpath: str) -> str:
+    return os.path.join(UPLOAD_DIR, *relpath.split("/"))
+
+
+def url_to_local_path(file_url: str) -> Optional[str]:
+    """uploads/media path for a /media/... url (None if it points elsewhere)."""
+    relpath = os.path.normpath(file_url.removeprefix("/media/"))
+    if relpath.startswith("..") or os.path.isabs(relpath):
+        return None
+    return os.path.join(UPLOAD_DIR, relpath)
+
+
+def _lock_blob(db: Session, sha256: str, mime_type: str, size: int) -> models.MediaBlob:
+    """Get-or-create the blob row and lock it until commit (serializes with delete_media)."""
+    while True:
+        db.execute(
+            pg_insert(models.MediaBlob)
+            .values(sha256=sha256, path=blob_relpath(sha256, mime_type), mime_type=mime_type, size=size)
+            .on_conflict_do_nothing(index_elements=["sha256"])
+        )
+        blob = (
+            db.query(models.MediaBlob)
+            .filter(models.MediaBlob.sha256 == sha256)
+            .with_for_update()
+            .first()
+        )
+        # None: delete_media / the GC removed the existing row in between, insert again
+        if blob is not None:
+            return blob
+
+
+def _remove_blob_files(db: Session, sha256: str, relpaths: List[str]):
     """
-    Save file in local uploads folder.
-    Returns: (file_url, mime_type, file_size)
+    Delete the files of a blob whose row is gone (after that delete committed).
+    The same insert uploads use guards them: if it inserts, no upload has
+    re-created the row, and one that tries now waits until the files are gone.
+    Otherwise an upload already re-created the blob and reuses the files.
     """
-    if file.content_type not in ALLOWED_IMAGE_TYPES:
-        raise HTTPException(status_code=400, detail="Invalid image type")
+    inserted = db.execute(
+        pg_insert(models.MediaBlob)
+        .values(sha256=sha256, path=relpaths[0])
+        .on_conflict_do_nothing(index_elements=["sha256"])
+        .returning(models.MediaBlob.sha256)
+    ).first()
+    if not inserted:
+        db.commit()
+        return
+    try:
+        for relpath in relpaths:
+            path = local_path(relpath)
+            if os.path.exists(path):
+                os.remove(path)
+        db.query(models.MediaBlob).filter(models.MediaBlob.sha256 == sha256).delete(synchronize_session=False)
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
 
-    # Generate unique filename
-    ext = file.filename.split(".")[-1].lower()
-    unique_name = f"{uuid.uuid4()}.{ext}"
 
-    file_path = os.path.join(UPLOAD_DIR, unique_name)
+def _place_blob(blob: models.MediaBlob, tmp_path: str) -> bool:
+    """Move the staged file into the blob store; False if the content was already stored."""
+    path = local_path(blob.path)
+    if os.path.exists(path):
+        # identical content already stored
+        discard_staged(tmp_path)
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+    return True
 
-    # Save file
-    with open(file_path, "wb") as f:
-        content = file.file.read()
-        f.write(content)
 
-    file_size = len(content)
+def create_media_records(db: Session, article_id, staged: List[tuple]) -> List[models.Media]:
+    """
+    One Media row per staged upload, in one commit. Each file is moved into the
+    blob store while its blob row is locked, or dropped if the blob already exists.
+    """
+    items = []
+    new_blobs = []
+    try:
+        # fixed lock order across concurrent batches
+        for tmp_path, mime_type, size, sha256 in sorted(staged, key=lambda x: x[3]):
+            blob = _lock_blob(db, sha256, mime_type, size)
+            if _place_blob(blob, tmp_path):
+                new_blobs.append((blob.sha256, blob.path))
+            items.append(models.Media(
+                article_id=article_id,
+                url=f"/media/{blob.path}",
+                mime_type=blob.mime_type,
+                size=blob.size,
+                blob_sha256=blob.sha256,
+            ))
+        db.add_all(items)
+        db.commit()
+    except BaseException:
+        db.rollback()
+        for tmp_path, *_ in staged:
+            discard_staged(tmp_path)
+        raise
+    # thumbnails / card / hero sizes, rendered off the request path
+    schedule_variants(new_blobs, UPLOAD_DIR)
+    for media in items:
+        db.refresh(media)
+    return items
 
-    # Build URL (we will serve /media as static)
-    file_url = f"/media/{unique_name}"
 
-    return file_url, file.content_type, file_size
+def create_media_record(db: Session, data: MediaCreate, staged: tuple) -> models.Media:
+    return create_media_records(db, data.article_id, [staged])[0]
 
 
-def create_media_record(
-    db: Session, data: MediaCreate, url: str, mime_type: str, size: int
-) -> models.Media:
+def attach_blob(db: Session, data: MediaCreate, sha256: str) -> Optional[models.Media]:
+    """Reference an already stored blob from another article, no upload needed."""
+    blob = (
+        db.query(models.MediaBlob)
+        .filter(models.MediaBlob.sha256 == sha256)
+        .with_for_update()
+        .first()
+    )
+    if not blob or not os.path.exists(local_path(blob.path)):
+        db.rollback()
+        return None
     media = models.Media(
         article_id=data.article_id,
-        url=url,
-        mime_type=mime_type,
-        size=size,
+        url=f"/media/{blob.path}",
+        mime_type=blob.mime_type,
+        size=blob.size,
+        blob_sha256=blob.sha256,
     )
     db.add(media)
     db.commit()
@@ -63,19 +384,42 @@ def create_media_record(
     return media
 
 
-
 def delete_media(db: Session, media: models.Media):
     """
-    Delete file from disk + remove DB record.
+    Remove DB record; the file is deleted once nothing references it.
     """
-    # Remove file from disk
-    file_path = f"uploads/media/{os.path.basename(media.url)}"
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    if media.blob_sha256 is None:
+        # uploads stored before deduplication own their file
+        path = url_to_local_path(media.url)
+        if path and os.path.exists(path):
+            os.remove(path)
+        db.delete(media)
+        db.commit()
+        return
 
-    # Delete DB record
+    sha256 = media.blob_sha256
+    # lock the blob so no upload / attach can add a reference while we check
+    blob = (
+        db.query(models.MediaBlob)
+        .filter(models.MediaBlob.sha256 == sha256)
+        .with_for_update()
+        .first()
+    )
     db.delete(media)
+    db.flush()
+    still_used = db.query(models.Media.id).filter(models.Media.blob_sha256 == sha256).first()
+    relpaths = []
+    if blob and not still_used:
+        relpaths = [blob.path] + [
+            row.path for row in db.query(models.MediaVariant.path)
+            .filter(models.MediaVariant.blob_sha256 == sha256)
+        ]
+        # variant rows go with the blob (ON DELETE CASCADE)
+        db.delete(blob)
     db.commit()
+    # files go only once the row deletion is committed: a rollback keeps row and file together
+    if relpaths:
+        _remove_blob_files(db, sha256, relpaths)
 
 
 
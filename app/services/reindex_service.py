@@ -0,0 +1,263 @@
+"""
+Bulk rebuild of the chroma index from Postgres (run through `python manage.py reindex`).
+
+Pipeline per batch of articles:
+- articles are streamed with a server-side cursor (yield_per), ordered by id
+- text splitting runs in a process pool
+- embeddings are requested in provider-sized batches with bounded concurrency
+- chunks are written to chroma in bulk
+- a checkpoint (last article id + counters) is saved so an interrupted run can resume
+
+With --fresh the rebuild goes into a new collection and is promoted by
+rewriting the live pointer (LIVE_COLLECTION_PATH) in one atomic replace:
+the live collection is never renamed, so there is no moment without one,
+and running workers switch on their next call. The collection it replaced
+is kept, since requests already in flight may still read it; --drop-old
+removes the ones replaced by earlier rebuilds.
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from types import SimpleNamespace
+from typing import Optional
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.services.embedding_service import (
+    CHROMA_COLLECTION_NAME,
+    CHROMA_PERSIST_DIR,
+    EMBED_BATCH_SIZE,
+    LIVE_COLLECTION_PATH,
+    _embed_documents,
+    _get_vectorstore,
+    build_chunks,
+    live_collection_name,
+)
+
+# chroma (sqlite) refuses writes above ~5.4k records per call
+CHROMA_WRITE_BATCH = 5000
+
+EMBED_MAX_RETRIES = 5
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(CHROMA_PERSIST_DIR, "reindex_checkpoint.json")
+
+_ARTICLE_COLUMNS = (
+    models.Article.id,
+    models.Article.title,
+    models.Article.summary,
+    models.Article.content,
+    models.Article.slug,
+    models.Article.category_id,
+    models.Article.status,
+    models.Article.publish_at,
+    models.Article.created_at,
+    models.Article.updated_at,
+)
+
+
+# -------------------------- pipeline stages --------------------------
+
+def _split_article(row: dict):
+    # runs in a worker process; rows travel as plain dicts
+    return build_chunks(SimpleNamespace(**row))
+
+
+def _embed_with_retry(texts):
+    delay = 1.0
+    for attempt in range(EMBED_MAX_RETRIES):
+        try:
+            return _embed_documents(texts)
+        except Exception as e:
+            if attempt == EMBED_MAX_RETRIES - 1:
+                raise
+            print(f"embed batch failed ({e}); retrying in {delay:.0f}s")
+            time.sleep(delay)
+            delay *= 2
+
+
+def _embed_all(texts, embed_pool: ThreadPoolExecutor):
+    batches = [texts[i:i + EMBED_BATCH_SIZE] for i in range(0, len(texts), EMBED_BATCH_SIZE)]
+    vectors = []
+    # map keeps input order; the pool size bounds the number of in-flight requests
+    for batch_vectors in embed_pool.map(_embed_with_retry, batches):
+        vectors.extend(batch_vectors)
+    return vectors
+
+
+def _write_chunks(collection, ids, texts, metas, vectors):
+    for start in range(0, len(ids), CHROMA_WRITE_BATCH):
+        end = start + CHROMA_WRITE_BATCH
+        collection.add(
+            ids=ids[start:end],
+            documents=texts[start:end],
+            metadatas=metas[start:end],
+            embeddings=vectors[start:end],
+        )
+
+
+def _stream_articles(db, after_id: Optional[str], published_only: bool, batch_size: int):
+    query = db.query(*_ARTICLE_COLUMNS)
+    if after_id:
+        query = query.filter(models.Article.id > after_id)
+    if published_only:
+        query = query.filter(models.Article.status == "published")
+    rows = query.order_by(models.Article.id).yield_per(batch_size)
+
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield [dict(r._mapping) for r in batch]
+
+
+# -------------------------- checkpoint --------------------------
+
+def _load_checkpoint(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path: str, checkpoint: dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+# -------------------------- collection swap --------------------------
+
+def _promote_collection(client, new_name: str, drop_old: bool) -> tuple[str, list]:
+    """
+    Point the live pointer at the freshly built collection.
+    Returns (the collection it replaced, the collections dropped). drop_old
+    only drops collections retired by earlier promotions (workers left them
+    at least one swap ago), never the one just replaced or unfinished rebuilds.
+    """
+    pointer = {}
+    if os.path.exists(LIVE_COLLECTION_PATH):
+        with open(LIVE_COLLECTION_PATH, "r", encoding="utf-8") as f:
+            pointer = json.load(f)
+    previous = live_collection_name()
+    retired = [n for n in pointer.get("retired", []) + [pointer.get("previous")] if n and n not in (new_name, previous)]
+
+    dropped = []
+    if drop_old:
+        existing = {c.name for c in client.list_collections()}
+        for name in dict.fromkeys(retired):
+            if name in existing:
+                client.delete_collection(name)
+                dropped.append(name)
+        retired = []
+
+    tmp_path = f"{LIVE_COLLECTION_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "name": new_name,
+            "previous": previous,
+            "retired": list(dict.fromkeys(retired)),
+            "promoted_at": datetime.utcnow().isoformat(),
+        }, f)
+    os.replace(tmp_path, LIVE_COLLECTION_PATH)
+    return previous, dropped
+
+
+# -------------------------- entry point --------------------------
+
+def reindex(
+    batch_size: int = 200,
+    workers: Optional[int] = None,
+    concurrency: int = 4,
+    fresh: bool = False,
+    resume: bool = False,
+    published_only: bool = False,
+    drop_old: bool = False,
+    checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+) -> dict:
+    """
+    Rebuild chunk embeddings for every article.
+    - fresh=False: re-index in place (chunks of each batch are replaced)
+    - fresh=True: build into a new collection, then swap it in under the live name
+    - resume=True: continue from the checkpoint left by an interrupted run
+    """
+    client = _get_vectorstore()._client
+    checkpoint = _load_checkpoint(checkpoint_path) if resume else None
+    if checkpoint and checkpoint.get("fresh") != fresh:
+        raise RuntimeError("checkpoint was written by a run with a different --fresh setting")
+
+    if fresh:
+        target_name = (checkpoint or {}).get("collection") or \
+            f"{CHROMA_COLLECTION_NAME}__rebuild_{datetime.utcnow():%Y%m%d%H%M%S}"
+        target = client.get_or_create_collection(
+            name=target_name,
+            metadata=_get_vectorstore()._collection.metadata,
+        )
+    else:
+        target = _get_vectorstore()._collection
+
+    checkpoint = checkpoint or {
+        "collection": target.name,
+        "fresh": fresh,
+        "last_article_id": None,
+        "articles": 0,
+        "chunks": 0,
+    }
+    started = time.monotonic()
+    run_articles = 0
+    run_chunks = 0
+
+    db = SessionLocal()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as split_pool, \
+                ThreadPoolExecutor(max_workers=concurrency) as embed_pool:
+            for rows in _stream_articles(db, checkpoint["last_article_id"], published_only, batch_size):
+                ids, texts, metas = [], [], []
+                for chunk_ids, chunk_texts, chunk_metas in split_pool.map(_split_article, rows, chunksize=16):
+                    ids.extend(chunk_ids)
+                    texts.extend(chunk_texts)
+                    metas.extend(chunk_metas)
+
+                vectors = _embed_all(texts, embed_pool) if texts else []
+
+                if not fresh:
+                    target.delete(where={"article_id": {"$in": [str(r["id"]) for r in rows]}})
+                if ids:
+                    _write_chunks(target, ids, texts, metas, vectors)
+
+                run_articles += len(rows)
+                run_chunks += len(ids)
+                checkpoint["last_article_id"] = str(rows[-1]["id"])
+                checkpoint["articles"] += len(rows)
+                checkpoint["chunks"] += len(ids)
+                _save_checkpoint(checkpoint_path, checkpoint)
+
+                elapsed = max(time.monotonic() - started, 1e-6)
+                print(
+                    f"{checkpoint['articles']} articles / {checkpoint['chunks']} chunks indexed "
+                    f"({run_articles / elapsed:.1f} articles/s, {run_chunks / elapsed:.1f} chunks/s)"
+                )
+    finally:
+        db.close()
+
+    previous, dropped = None, []
+    if fresh:
+        previous, dropped = _promote_collection(client, target.name, drop_old)
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    elapsed = max(time.monotonic() - started, 1e-6)
+    return {
+        "articles": checkpoint["articles"],
+        "chunks": checkpoint["chunks"],
+        "seconds": round(elapsed, 2),
+        "articles_per_second": round(run_articles / elapsed, 2),
+        "chunks_per_second": round(run_chunks / elapsed, 2),
+        "collection": target.name,
+        "previous_collection": previous,
+        "dropped_collections": dropped,
+    }
@@ -0,0 +1,102 @@
+"""
+Scheduled publishing (run through `python manage.py scheduler`).
+
+Articles in status `scheduled` are published once publish_at has passed.
+Due articles are claimed in batches with FOR UPDATE SKIP LOCKED (several
+scheduler processes can run side by side without publishing twice) from the
+partial index on publish_at WHERE status = 'scheduled', flipped to published
+with one UPDATE, and then the follow-up work runs once per batch instead of
+once per article: one bulk reindex, one summary pass. A top-of-the-hour
+release of dozens of stories is a handful of statements, not dozens of
+write-path requests.
+
+The headlines, feed / sitemap and dashboard caches live in each API worker,
+not in the scheduler process: the publishing transaction notifies them
+through article_events (delivered on commit).
+"""
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.services.article_events import notify_articles_changed
+from app.services.embedding_service import index_articles
+from app.services.summary_service import schedule_summary
+
+
+def _publish_batch(db, now: datetime, batch_size: int) -> list:
+    """Claim and publish up to batch_size due articles; returns the published rows (committed)."""
+    due = (
+        db.query(models.Article.id, models.Article.author_id)
+        .filter(models.Article.status == "scheduled", models.Article.publish_at <= now)
+        .order_by(models.Article.publish_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not due:
+        db.rollback()
+        return []
+    ids = [row.id for row in due]
+    db.execute(
+        update(models.Article)
+        .where(models.Article.id.in_(ids), models.Article.status == "scheduled")
+        .values(status="published", updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    notify_articles_changed(db, [(row.id, row.author_id) for row in due])
+    db.commit()
+    return db.query(models.Article).filter(models.Article.id.in_(ids)).all()
+
+
+def _after_publish(articles: list):
+    """
+    Shared follow-up work for freshly published articles (best effort); the
+    per-worker caches are refreshed by the article_events listeners.
+    """
+    try:
+        index_articles(articles)
+    except Exception as e:
+        print(f"Scheduled publish: reindex failed: {e}")
+    for article in articles:
+        try:
+            schedule_summary(article.id)
+        except Exception:
+            pass
+
+
+def publish_due_articles(batch_size: Optional[int] = None, now: Optional[datetime] = None) -> int:
+    """Publish every article due at `now` (default: utcnow), batch by batch; returns how many."""
+    batch_size = batch_size or settings.SCHEDULER_BATCH_SIZE
+    now = now or datetime.utcnow()
+    published = 0
+    db = SessionLocal()
+    try:
+        while True:
+            articles = _publish_batch(db, now, batch_size)
+            if not articles:
+                return published
+            _after_publish(articles)
+            published += len(articles)
+            db.expunge_all()
+    finally:
+        db.close()
+
+
+def run_scheduler(interval: Optional[float] = None, batch_size: Optional[int] = None):
+    """Poll for due articles forever."""
+    interval = interval or settings.SCHEDULER_INTERVAL_SECONDS
+    while True:
+        started = time.monotonic()
+        try:
+            count = publish_due_articles(batch_size)
+            if count:
+                print(f"{datetime.utcnow():%Y-%m-%d %H:%M:%S} published {count} scheduled articles")
+        except Exception as e:
+            print(f"Scheduled publish failed: {e}")
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
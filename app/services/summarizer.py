@@ -1,20 +1,11 @@
-from langchain_groq import ChatGroq
 from langchain.prompts import ChatPromptTemplate
+from langchain.text_splitter import RecursiveCharacterTextSplitter
 from app.core.config import settings
+from app.services import llm_gateway
 
-GROQ_API_KEY = settings.GROQ_API_KEY
-if not GROQ_API_KEY:
-    raise RuntimeError("GROQ_API_KEY not set")
-
-# Use same model style you used in chat endpoint
-GROQ_MODEL = "llama-3.3-70b-versatile"
-
-# LLM client (consistent with your chat.py style)
-llm = ChatGroq(
-    model=GROQ_MODEL,
-    api_key=GROQ_API_KEY,
-    temperature=0.2,
-)
+# calls go through the shared LLM gateway (rate limits, deadlines, retries)
+GROQ_MODEL = settings.GROQ_SUMMARY_MODEL
+TEMPERATURE = 0.2
 
 # Prompt template in LangChain syntax (same pattern as your chat code)
 prompt = ChatPromptTemplate.from_messages([
@@ -25,24 +16,66 @@ prompt = ChatPromptTemplate.from_messages([
     )
 ])
 
+# ---------------- map-reduce mode for long articles ----------------
+# Articles above SUMMARY_MAP_REDUCE_THRESHOLD characters are split, the parts
+# are summarized concurrently (map) and the partial summaries are combined
+# (reduce), so latency follows the slowest part instead of the total length.
 
-def summarize_news(text: str) -> str:
-    """
-    Summarize a news article using Groq LLM via LangChain.
-    Fully compatible replacement for the previous raw requests version.
-    """
+# same splitter as embedding_service, sized for LLM input instead of retrieval
+_map_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=settings.SUMMARY_CHUNK_SIZE,
+    chunk_overlap=200,
+)
 
-    chain = prompt | llm
+map_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You summarize news articles accurately."),
+    ("human",
+     "The following is one section of a longer news article. Summarize the "
+     "facts it reports in a few sentences, without opinions or speculation:\n\n{text}"
+    )
+])
+
+reduce_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You summarize news articles accurately."),
+    ("human",
+     "The following are summaries of consecutive sections of one news article. "
+     "Combine them into a single concise, factual summary of the whole article "
+     "without adding opinions or speculation:\n\n{text}"
+    )
+])
+
+# partial summaries are collapsed again if they are still too long, at most this many times
+MAX_REDUCE_DEPTH = 3
+
+
+def _complete(template: ChatPromptTemplate, text: str) -> str:
+    return llm_gateway.invoke(template.format_messages(text=text), model=GROQ_MODEL, temperature=TEMPERATURE)
+
+
+def _summarize_parts(text: str):
+    chunks = _map_splitter.split_text(text)
+    return llm_gateway.batch(
+        [map_prompt.format_messages(text=c) for c in chunks],
+        model=GROQ_MODEL,
+        temperature=TEMPERATURE,
+        max_concurrency=settings.SUMMARY_MAX_CONCURRENCY,
+    )
 
-    try:
-        result = chain.invoke({"text": text})
-    except Exception as e:
-        raise RuntimeError(f"Groq summarization failed: {e}")
 
-    # Extract final answer safely (same pattern as your chat.py extractor)
-    if hasattr(result, "content"):
-        summary = result.content
-    else:
-        summary = str(result)
+def _map_reduce(text: str, depth: int = 0) -> str:
+    combined = "\n\n".join(_summarize_parts(text))
+    if len(combined) > settings.SUMMARY_MAP_REDUCE_THRESHOLD and depth + 1 < MAX_REDUCE_DEPTH:
+        return _map_reduce(combined, depth + 1)
+    return _complete(reduce_prompt, combined)
 
-    return summary.strip()
+
+def summarize_news(text: str) -> str:
+    """
+    Summarize a news article using Groq LLM via LangChain.
+    Long articles (above SUMMARY_MAP_REDUCE_THRESHOLD characters) are
+    summarized map-reduce style.
+    Raises llm_gateway.LLMError (a RuntimeError) when the LLM call fails.
+    """
+    if len(text or "") > settings.SUMMARY_MAP_REDUCE_THRESHOLD:
+        return _map_reduce(text)
+    return _complete(prompt, text)
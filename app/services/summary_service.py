@@ -0,0 +1,204 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.services import summarizer
+
+# Summaries are stored per (article_id, sha256(content), model) and generated
+# at most once: in-process callers share one in-flight future, and workers in
+# other processes see the claim row (summary NULL) the generating worker
+# inserted and wait for it. Claiming and storing are short transactions; no
+# connection or lock is held during the LLM call.
+
+# how often a waiting worker re-reads a pending claim
+CLAIM_POLL_SECONDS = 0.5
+
+_inflight: dict = {}
+_inflight_lock = threading.Lock()
+
+# background precompute on publish
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="summary")
+
+
+def content_hash(content: Optional[str]) -> str:
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+
+def get_stored_summary(db: Session, article_id, digest: str, model: str) -> Optional[str]:
+    row = (
+        db.query(models.ArticleSummary.summary)
+        .filter(
+            models.ArticleSummary.article_id == article_id,
+            models.ArticleSummary.content_hash == digest,
+            models.ArticleSummary.model == model,
+        )
+        .first()
+    )
+    return row.summary if row else None
+
+
+def _version(article_id, digest: str, model: str):
+    return (
+        models.ArticleSummary.article_id == article_id,
+        models.ArticleSummary.content_hash == digest,
+        models.ArticleSummary.model == model,
+    )
+
+
+def _claim(article_id, digest: str, model: str):
+    """
+    One short transaction. Returns (summary, claimed): the stored summary, or
+    claimed=True when this worker now owns generation (new claim, or a stale
+    one taken over), or (None, False) while another worker is generating.
+    """
+    db = SessionLocal()
+    try:
+        claimed = db.execute(
+            pg_insert(models.ArticleSummary)
+            .values(article_id=article_id, content_hash=digest, model=model, summary=None, created_at=datetime.utcnow())
+            .on_conflict_do_nothing(constraint="uq_article_summary_version")
+            .returning(models.ArticleSummary.id)
+        ).first()
+        if claimed is None:
+            row = db.query(models.ArticleSummary.summary).filter(*_version(article_id, digest, model)).first()
+            if row is not None and row.summary is not None:
+                db.commit()
+                return row.summary, False
+            stale = datetime.utcnow() - timedelta(seconds=settings.SUMMARY_CLAIM_TIMEOUT_SECONDS)
+            claimed = (
+                db.query(models.ArticleSummary)
+                .filter(
+                    *_version(article_id, digest, model),
+                    models.ArticleSummary.summary.is_(None),
+                    models.ArticleSummary.created_at < stale,
+                )
+                .update({"created_at": datetime.utcnow()}, synchronize_session=False)
+            ) or None
+        db.commit()
+        return None, claimed is not None
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _store(article_id, digest: str, model: str, summary: str):
+    db = SessionLocal()
+    try:
+        db.execute(
+            pg_insert(models.ArticleSummary)
+            .values(article_id=article_id, content_hash=digest, model=model, summary=summary, created_at=datetime.utcnow())
+            .on_conflict_do_update(constraint="uq_article_summary_version", set_={"summary": summary})
+        )
+        # older versions (previous content or model) are no longer served
+        db.query(models.ArticleSummary).filter(
+            models.ArticleSummary.article_id == article_id,
+            (models.ArticleSummary.content_hash != digest) | (models.ArticleSummary.model != model),
+        ).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _release(article_id, digest: str, model: str):
+    """Drop our claim after a failed generation so the next request retries."""
+    db = SessionLocal()
+    try:
+        db.query(models.ArticleSummary).filter(
+            *_version(article_id, digest, model), models.ArticleSummary.summary.is_(None)
+        ).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _generate_and_store(article_id, content: str, digest: str, model: str) -> str:
+    while True:
+        stored, claimed = _claim(article_id, digest, model)
+        if stored is not None:
+            return stored
+        if claimed:
+            break
+        # another worker is generating: its claim either turns into the summary or goes stale
+        time.sleep(CLAIM_POLL_SECONDS)
+
+    try:
+        summary = summarizer.summarize_news(content)
+    except BaseException:
+        try:
+            _release(article_id, digest, model)
+        except Exception as e:
+            print(f"Summary claim release failed for {article_id}: {e}")
+        raise
+    _store(article_id, digest, model, summary)
+    return summary
+
+
+def _single_flight(key, fn):
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[key] = future
+
+    if not leader:
+        return future.result()
+
+    try:
+        result = fn()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def get_or_create_summary(db: Session, article_id, content: Optional[str]) -> str:
+    """
+    Serve the stored summary for the current content, generating it once on a miss.
+    `db` is committed before claiming, so the caller's connection goes back to
+    the pool instead of idling in a transaction through the wait / LLM call.
+    """
+    model = summarizer.GROQ_MODEL
+    digest = content_hash(content)
+    stored = get_stored_summary(db, article_id, digest, model)
+    db.commit()
+    if stored is not None:
+        return stored
+
+    content = content or ""
+    return _single_flight(
+        (str(article_id), digest, model),
+        lambda: _generate_and_store(article_id, content, digest, model),
+    )
+
+
+def _precompute(article_id):
+    db = SessionLocal()
+    try:
+        row = db.query(models.Article.content).filter(models.Article.id == article_id).first()
+        if row and row.content:
+            get_or_create_summary(db, article_id, row.content)
+    except Exception as e:
+        print(f"Summary precompute failed for {article_id}: {e}")
+    finally:
+        db.close()
+
+
+def schedule_summary(article_id):
+    """Generate the summary in the background (e.g. when an article gets published)."""
+    _executor.submit(_precompute, article_id)
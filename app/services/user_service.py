@@ -1,7 +1,11 @@
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from app.db import models
+from app.db.enums import RoleEnum
+from app.db.keyset import keyset_page
 from app.schemas.user import UserCreate, UserUpdate
+from app.services.index_sync import article_ids_for, drop_chunks_of_deleted_articles
+from app.services.comment_service import uncount_user_comments
 import bcrypt
 
 
@@ -13,8 +17,20 @@ def get_user_by_id(db: Session, user_id: str) -> Optional[models.User]:
     return db.query(models.User).filter(models.User.id == user_id).first()
 
 
-def list_users(db: Session) -> List[models.User]:
-    return db.query(models.User).order_by(models.User.created_at.desc()).all()
+def list_users(
+    db: Session,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    role: Optional[RoleEnum] = None,
+    is_active: Optional[bool] = None,
+) -> Tuple[List[models.User], Optional[str]]:
+    """Newest first, keyset-paginated on (created_at, id); raises InvalidCursor."""
+    query = db.query(models.User)
+    if role is not None:
+        query = query.filter(models.User.role == role)
+    if is_active is not None:
+        query = query.filter(models.User.is_active == is_active)
+    return keyset_page(query, [models.User.created_at, models.User.id], limit, cursor, descending=True)
 
 
 def create_user(db: Session, data: UserCreate) -> models.User:
@@ -61,8 +77,11 @@ def toggle_user_activation(db: Session, user: models.User) -> models.User:
 
 
 def delete_user(db: Session, user: models.User):
+    article_ids = article_ids_for(db, models.Article.author_id == user.id)
+    uncount_user_comments(db, user.id)
     db.delete(user)
     db.commit()
+    drop_chunks_of_deleted_articles(db, article_ids)
 
 
 def update_user(db: Session, user: models.User, data: UserUpdate) -> models.User:
@@ -0,0 +1,399 @@
+"""
+Compact, read-only vector index backed by numpy memory maps.
+
+An index is a directory of flat files built from the chroma collection
+(`python manage.py build-vector-index`):
+
+    vectors.npy        (N, D) normalized embeddings: float32, float16 or int8
+    scales.npy         (N,) float32 per-row dequantization scale (int8 only)
+    meta.npy           (N,) structured array, one row per chunk (see META_DTYPE)
+    texts.bin          utf-8 chunk texts, concatenated
+    text_offsets.npy   (N + 1,) int64 byte offsets into texts.bin
+    articles.json      [[article_id, slug], ...] indexed by meta["article"]
+    manifest.json      dtype, dim, count, build time
+
+Builds go into a new timestamped directory next to a `current` symlink that
+is swapped atomically, so every uvicorn worker can mmap the same read-only
+files (shared page cache) and pick up new builds without a restart.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.db.enums import ArticleStatus
+
+# stored in built indexes: codes never change, new statuses get the next free one
+STATUS_CODES = {
+    "draft": 0,
+    "pending_review": 1,
+    "rejected": 2,
+    "published": 3,
+    "archived": 4,
+    "scheduled": 5,
+}
+assert set(STATUS_CODES) == {s.value for s in ArticleStatus}, "every ArticleStatus needs a STATUS_CODES entry"
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+UNKNOWN = -1
+
+META_DTYPE = np.dtype([
+    ("article", np.int32),      # row in articles.json
+    ("chunk", np.int32),        # chunk number within the article ("<article_id>:<chunk>")
+    ("status", np.int8),
+    ("category_id", np.int32),  # UNKNOWN when not set
+    ("publish_ts", np.int64),   # 0 when not set
+    ("updated_ts", np.int64),
+])
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+
+# rows scored per matrix multiply; keeps the float32 working set small for int8/float16 data
+BLOCK_ROWS = 65536
+
+# how often a worker checks whether `current` points at a newer build
+RELOAD_CHECK_SECONDS = 30
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _quantize(block: np.ndarray, dtype: str):
+    """Returns (stored block, per-row scales or None)."""
+    if dtype == "int8":
+        scales = np.abs(block).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        q = np.rint(block / scales[:, None]).astype(np.int8)
+        return q, scales.astype(np.float32)
+    return block.astype(dtype), None
+
+
+# -------------------------- filter evaluation --------------------------
+
+class _FilterContext:
+    def __init__(self, meta: np.ndarray, article_lookup: dict):
+        self.meta = meta
+        self.article_lookup = article_lookup
+
+    def column(self, field: str, value):
+        """Map a chroma metadata field/value pair onto a meta column and encoded value."""
+        if field == "article_id":
+            return self.meta["article"], self.article_lookup.get(str(value), -2)
+        if field == "status":
+            return self.meta["status"], STATUS_CODES.get(value, -2)
+        if field in ("category_id", "publish_ts", "updated_ts"):
+            return self.meta[field], value
+        raise ValueError(f"unsupported filter field: {field}")
+
+
+def _mask(where: Optional[dict], ctx: _FilterContext) -> np.ndarray:
+    """
+    Evaluate the subset of the chroma `where` syntax produced by
+    embedding_service._build_where: $and / $or, $eq, $ne, $in, $gt(e), $lt(e).
+    """
+    n = len(ctx.meta)
+    if not where:
+        return np.ones(n, dtype=bool)
+
+    mask = np.ones(n, dtype=bool)
+    for key, cond in where.items():
+        if key == "$and":
+            for sub in cond:
+                mask &= _mask(sub, ctx)
+            continue
+        if key == "$or":
+            any_mask = np.zeros(n, dtype=bool)
+            for sub in cond:
+                any_mask |= _mask(sub, ctx)
+            mask &= any_mask
+            continue
+
+        if not isinstance(cond, dict):
+            cond = {"$eq": cond}
+        for op, value in cond.items():
+            if op == "$in":
+                col, _ = ctx.column(key, None)
+                encoded = [ctx.column(key, v)[1] for v in value]
+                mask &= np.isin(col, encoded)
+                continue
+            col, encoded = ctx.column(key, value)
+            if op == "$eq":
+                mask &= col == encoded
+            elif op == "$ne":
+                mask &= col != encoded
+            elif op == "$gt":
+                mask &= col > encoded
+            elif op == "$gte":
+                mask &= col >= encoded
+            elif op == "$lt":
+                mask &= col < encoded
+            elif op == "$lte":
+                mask &= col <= encoded
+            else:
+                raise ValueError(f"unsupported filter operator: {op}")
+    return mask
+
+
+# -------------------------- index --------------------------
+
+class NumpyVectorIndex:
+    def __init__(self, root: str, path: str):
+        self.root = root
+        self.path = path
+        self._lock = threading.Lock()
+        self._last_reload_check = time.monotonic()
+        self._load(path)
+
+    @classmethod
+    def open(cls, root: str) -> "NumpyVectorIndex":
+        current = os.path.join(root, "current")
+        if not os.path.exists(current):
+            raise RuntimeError(f"no vector index found at {current}; run manage.py build-vector-index")
+        return cls(root, os.path.realpath(current))
+
+    def _load(self, path: str):
+        with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        with open(os.path.join(path, "articles.json"), "r", encoding="utf-8") as f:
+            articles = json.load(f)
+
+        self.manifest = manifest
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.scales = (
+            np.load(os.path.join(path, "scales.npy"), mmap_mode="r")
+            if manifest["dtype"] == "int8" else None
+        )
+        self.meta = np.load(os.path.join(path, "meta.npy"), mmap_mode="r")
+        self.text_offsets = np.load(os.path.join(path, "text_offsets.npy"), mmap_mode="r")
+        self.texts = np.memmap(os.path.join(path, "texts.bin"), dtype=np.uint8, mode="r") \
+            if self.text_offsets[-1] > 0 else np.zeros(0, dtype=np.uint8)
+        self.article_ids = [a[0] for a in articles]
+        self.article_slugs = [a[1] for a in articles]
+        self.article_lookup = {aid: i for i, aid in enumerate(self.article_ids)}
+
+    def newer(self) -> "NumpyVectorIndex":
+        """
+        Returns a freshly loaded index when `current` was swapped to a new build,
+        otherwise self. Callers replace their reference, so in-flight queries keep
+        a consistent view of the old build.
+        """
+        now = time.monotonic()
+        if now - self._last_reload_check < RELOAD_CHECK_SECONDS:
+            return self
+        with self._lock:
+            if now - self._last_reload_check < RELOAD_CHECK_SECONDS:
+                return self
+            self._last_reload_check = now
+            target = os.path.realpath(os.path.join(self.root, "current"))
+            if target != self.path and os.path.exists(os.path.join(target, "manifest.json")):
+                return NumpyVectorIndex(self.root, target)
+        return self
+
+    def __len__(self):
+        return len(self.meta)
+
+    def _text(self, row: int) -> str:
+        start, end = int(self.text_offsets[row]), int(self.text_offsets[row + 1])
+        return bytes(self.texts[start:end]).decode("utf-8")
+
+    def _document(self, row: int, score: float) -> Document:
+        m = self.meta[row]
+        article_id = self.article_ids[m["article"]]
+        metadata = {
+            "article_id": article_id,
+            "status": STATUS_NAMES.get(int(m["status"]), ""),
+            # same scale as chroma's l2 distance on normalized vectors (lower is better)
+            "score": float(2.0 - 2.0 * score),
+        }
+        if self.article_slugs[m["article"]]:
+            metadata["slug"] = self.article_slugs[m["article"]]
+        if m["category_id"] != UNKNOWN:
+            metadata["category_id"] = int(m["category_id"])
+        if m["publish_ts"]:
+            metadata["publish_ts"] = int(m["publish_ts"])
+        if m["updated_ts"]:
+            metadata["updated_ts"] = int(m["updated_ts"])
+        return Document(
+            id=f"{article_id}:{int(m['chunk'])}",
+            page_content=self._text(row),
+            metadata=metadata,
+        )
+
+    def top_k(self, embedding, k: int, where: Optional[dict] = None):
+        """Returns [(row, cosine similarity)] best first."""
+        query = _normalize(np.asarray(embedding, dtype=np.float32))
+        best_rows: List[np.ndarray] = []
+        best_scores: List[np.ndarray] = []
+
+        for start in range(0, len(self.meta), BLOCK_ROWS):
+            end = min(start + BLOCK_ROWS, len(self.meta))
+            mask = _mask(where, _FilterContext(self.meta[start:end], self.article_lookup))
+            if not mask.any():
+                continue
+
+            rows = np.flatnonzero(mask)
+            block = np.asarray(self.vectors[start:end][rows], dtype=np.float32)
+            scores = block @ query
+            if self.scales is not None:
+                scores *= self.scales[start:end][rows]
+
+            if len(scores) > k:
+                top = np.argpartition(-scores, k)[:k]
+                rows, scores = rows[top], scores[top]
+            best_rows.append(rows + start)
+            best_scores.append(scores)
+
+        if not best_rows:
+            return []
+        rows = np.concatenate(best_rows)
+        scores = np.concatenate(best_scores)
+        order = np.argsort(-scores)[:k]
+        return [(int(rows[i]), float(scores[i])) for i in order]
+
+    def search(self, embedding, k: int, where: Optional[dict] = None) -> List[Document]:
+        return [self._document(row, score) for row, score in self.top_k(embedding, k, where)]
+
+
+# -------------------------- build --------------------------
+
+def _encode_meta(meta: dict, article_lookup: dict, articles: list, chunk_id: str):
+    article_id = str(meta.get("article_id") or "")
+    if article_id not in article_lookup:
+        article_lookup[article_id] = len(articles)
+        articles.append([article_id, meta.get("slug")])
+    chunk = chunk_id.rsplit(":", 1)[-1]
+    category_id = meta.get("category_id")
+    return (
+        article_lookup[article_id],
+        int(chunk) if chunk.isdigit() else 0,
+        STATUS_CODES.get(meta.get("status"), UNKNOWN),
+        UNKNOWN if category_id is None else int(category_id),
+        int(meta.get("publish_ts") or 0),
+        int(meta.get("updated_ts") or 0),
+    )
+
+
+def iter_chroma_pages(collection, page_size: int = 2000) -> Iterable[dict]:
+    offset = 0
+    while True:
+        page = collection.get(
+            include=["embeddings", "metadatas", "documents"],
+            limit=page_size,
+            offset=offset,
+        )
+        if not len(page["ids"]):
+            return
+        yield page
+        offset += len(page["ids"])
+
+
+def build_index(collection, root: str, dtype: str = "int8", page_size: int = 2000, keep: int = 2) -> str:
+    """
+    Export a chroma collection into a new index directory under `root` and
+    point `root/current` at it. Returns the new directory.
+    """
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"dtype must be one of {SUPPORTED_DTYPES}")
+
+    count = collection.count()
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, datetime.utcnow().strftime("%Y%m%d%H%M%S"))
+    os.makedirs(path)
+
+    articles: list = []
+    article_lookup: dict = {}
+    meta = np.lib.format.open_memmap(os.path.join(path, "meta.npy"), mode="w+", dtype=META_DTYPE, shape=(count,))
+    offsets = np.lib.format.open_memmap(os.path.join(path, "text_offsets.npy"), mode="w+", dtype=np.int64, shape=(count + 1,))
+    vectors = None
+    scales = None
+    dim = None
+
+    row = 0
+    text_pos = 0
+    offsets[0] = 0
+    with open(os.path.join(path, "texts.bin"), "wb") as texts_file:
+        for page in iter_chroma_pages(collection, page_size):
+            embeddings = _normalize(np.asarray(page["embeddings"], dtype=np.float32))
+            n = min(len(embeddings), count - row)  # guard against writes racing the export
+            if n <= 0:
+                break
+            if vectors is None:
+                dim = embeddings.shape[1]
+                vectors = np.lib.format.open_memmap(
+                    os.path.join(path, "vectors.npy"), mode="w+", dtype=dtype, shape=(count, dim)
+                )
+                if dtype == "int8":
+                    scales = np.lib.format.open_memmap(
+                        os.path.join(path, "scales.npy"), mode="w+", dtype=np.float32, shape=(count,)
+                    )
+
+            stored, block_scales = _quantize(embeddings[:n], dtype)
+            vectors[row:row + n] = stored
+            if scales is not None:
+                scales[row:row + n] = block_scales
+
+            for i in range(n):
+                meta[row + i] = _encode_meta(page["metadatas"][i] or {}, article_lookup, articles, page["ids"][i])
+                data = (page["documents"][i] or "").encode("utf-8")
+                texts_file.write(data)
+                text_pos += len(data)
+                offsets[row + i + 1] = text_pos
+            row += n
+
+    if vectors is None:
+        # empty collection: still produce a loadable index
+        dim = 0
+        vectors = np.lib.format.open_memmap(os.path.join(path, "vectors.npy"), mode="w+", dtype=dtype, shape=(0, 0))
+        if dtype == "int8":
+            scales = np.lib.format.open_memmap(os.path.join(path, "scales.npy"), mode="w+", dtype=np.float32, shape=(0,))
+
+    for arr in (meta, offsets, vectors, scales):
+        if arr is not None:
+            arr.flush()
+
+    if row < count:
+        # collection shrank while exporting: truncate to what was written
+        for name, arr in (("meta.npy", meta[:row]), ("text_offsets.npy", offsets[:row + 1]),
+                          ("vectors.npy", vectors[:row]), ("scales.npy", scales[:row] if scales is not None else None)):
+            if arr is not None:
+                np.save(os.path.join(path, f"{name}.tmp.npy"), np.asarray(arr))
+                os.replace(os.path.join(path, f"{name}.tmp.npy"), os.path.join(path, name))
+
+    with open(os.path.join(path, "articles.json"), "w", encoding="utf-8") as f:
+        json.dump(articles, f)
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "dtype": dtype,
+            "dim": dim,
+            "count": row,
+            "built_at": datetime.utcnow().isoformat(),
+            "collection": collection.name,
+        }, f)
+
+    # atomic swap of the `current` pointer
+    tmp_link = os.path.join(root, "current.tmp")
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(os.path.basename(path), tmp_link)
+    os.replace(tmp_link, os.path.join(root, "current"))
+
+    _prune_builds(root, keep)
+    return path
+
+
+def _prune_builds(root: str, keep: int):
+    # keep a few previous builds: workers may still have them mapped
+    builds = sorted(
+        d for d in os.listdir(root)
+        if d.isdigit() and os.path.isdir(os.path.join(root, d))
+    )
+    for old in builds[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
@@ -0,0 +1,129 @@
+"""
+Rows/second and peak Python memory of the NDJSON article export.
+
+    python benchmarks/article_export_bench.py --seed 20000 --fields id,title,slug,updated_at
+
+Reads the configured database through export_service.export_articles (the
+generator GET /articles/export streams) and, for comparison, through the
+paginated listing path partners used (offset page + COUNT + ArticleRead
+validation per page). --seed inserts that many published articles first
+(removed again at the end).
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.responses import paginated_response  # noqa: E402
+from app.db import models  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.schemas.article import ArticleRead  # noqa: E402
+from app.services.article_service import get_paginated_articles  # noqa: E402
+from app.services.export_service import ARTICLE_EXPORT_DEFAULT_FIELDS, export_articles  # noqa: E402
+
+SEED_PREFIX = "bench-export-"
+
+
+def _seed(count: int):
+    db = SessionLocal()
+    try:
+        author_id = db.query(models.User.id).limit(1).scalar()
+        if author_id is None:
+            raise SystemExit("need at least one user to seed articles")
+        body = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 60
+        now = datetime.utcnow()
+        for start in range(0, count, 1000):
+            db.bulk_insert_mappings(models.Article, [
+                {
+                    "id": uuid.uuid4(), "title": f"Bench article {i}", "slug": f"{SEED_PREFIX}{uuid.uuid4().hex}",
+                    "summary": body[:300], "content": body, "status": "published",
+                    "author_id": author_id, "views": 0, "likes_count": 0, "comments_count": 0,
+                    "created_at": now, "updated_at": now, "publish_at": now,
+                }
+                for i in range(start, min(start + 1000, count))
+            ])
+            db.commit()
+    finally:
+        db.close()
+
+
+def _unseed():
+    db = SessionLocal()
+    try:
+        db.query(models.Article).filter(models.Article.slug.like(f"{SEED_PREFIX}%")).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows, size = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, size, elapsed, peak
+
+
+def _export(fields):
+    def run():
+        rows = size = 0
+        for chunk in export_articles(fields):
+            rows += chunk.count(b"\n")
+            size += len(chunk)
+        return rows, size
+    return run
+
+
+def _paged(page_size):
+    def run():
+        db = SessionLocal()
+        rows = size = 0
+        try:
+            page = 1
+            while True:
+                items, total = get_paginated_articles(db, page, page_size, None, "published")
+                if not items:
+                    return rows, size
+                size += len(paginated_response(ArticleRead, items, total, page, page_size).body)
+                rows += len(items)
+                db.expunge_all()
+                page += 1
+        finally:
+            db.close()
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fields", default=",".join(ARTICLE_EXPORT_DEFAULT_FIELDS))
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--skip-paged", action="store_true")
+    args = parser.parse_args()
+
+    if args.seed:
+        _seed(args.seed)
+    try:
+        runs = {f"export ({args.fields})": _export(args.fields.split(","))}
+        if not args.skip_paged:
+            runs[f"/articles/ pages of {args.page_size}"] = _paged(args.page_size)
+        for name, fn in runs.items():
+            rows, size, elapsed, peak = _measure(fn)
+            print(
+                f"{name}: {rows} rows, {size / 1e6:.1f} MB in {elapsed:.2f}s = "
+                f"{rows / max(elapsed, 1e-9):,.0f} rows/s, peak Python memory {peak / 1e6:.1f} MB"
+            )
+    finally:
+        if args.seed:
+            _unseed()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+CPU vs bytes for compressing article list pages, per encoding and level.
+
+    python benchmarks/compression_bench.py --items 20 --rounds 50 --link-kbps 1600
+
+Pages are built like GET /articles/ builds them (paginated_response over
+article-shaped rows) with generated prose for summary / content, so the
+ratio is close to real pages rather than to repeated filler text.
+Per setting: compressed size, ratio, compression time per page and the
+estimated time to deliver the page over --link-kbps (compression + transfer),
+which is what a reader on a slow mobile link waits for.
+"""
+import argparse
+import gzip
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.responses import paginated_response  # noqa: E402
+from app.core.compression import brotli  # noqa: E402
+from app.schemas.article import ArticleRead  # noqa: E402
+
+WORDS = (
+    "the of and to in a is that for on with as was by at government said year new people city "
+    "market election minister report police court team season company million percent health "
+    "school students weather storm rain council budget project energy price prices local national "
+    "international official officials according statement week month today yesterday announced "
+    "plans support public water road traffic hospital doctors patients economy growth bank"
+).split()
+
+
+def _prose(rng: random.Random, words: int) -> str:
+    sentences = []
+    while words > 0:
+        n = rng.randint(8, 22)
+        sentence = " ".join(rng.choice(WORDS) for _ in range(n))
+        sentences.append(sentence.capitalize() + ".")
+        words -= n
+    return " ".join(sentences)
+
+
+def _article(rng: random.Random, i: int):
+    now = datetime.utcnow()
+    author = SimpleNamespace(
+        id=uuid.uuid4(), email=f"author{i % 5}@example.com", username=f"author{i % 5}", role="author",
+        is_active=True, created_at=now, updated_at=now,
+    )
+    category = SimpleNamespace(id=i % 8, name=f"Category {i % 8}", slug=f"category-{i % 8}", description=None)
+    sha = uuid.uuid4().hex * 2
+    media = [SimpleNamespace(
+        id=uuid.uuid4(), article_id=None, url=f"/media/blobs/{sha[:2]}/{sha[2:4]}/{sha}.jpg",
+        mime_type="image/jpeg", size=150_000, uploaded_at=now, blob_sha256=sha, variants=[],
+    )]
+    return SimpleNamespace(
+        id=uuid.uuid4(), title=_prose(rng, 10).rstrip("."), slug=f"article-{i}-{sha[:6]}",
+        summary=_prose(rng, 60), content=_prose(rng, rng.randint(400, 900)), status="published",
+        publish_at=now, rejection_reason=None, author_id=author.id, category_id=category.id,
+        views=rng.randint(0, 5000), likes_count=rng.randint(0, 300), created_at=now, updated_at=now,
+        author=author, category=category, media=media,
+    )
+
+
+def _settings():
+    yield "gzip", 1, lambda b: gzip.compress(b, 1)
+    for level in (4, 6, 9):
+        yield "gzip", level, lambda b, level=level: gzip.compress(b, level)
+    if brotli is not None:
+        for quality in (1, 3, 4, 5, 6, 9, 11):
+            yield "br", quality, lambda b, q=quality: brotli.compress(b, mode=brotli.MODE_TEXT, quality=q)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--link-kbps", type=int, default=1600, help="client bandwidth (1600 ~ slow 4G / good 3G)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    page = paginated_response(ArticleRead, [_article(rng, i) for i in range(args.items)], 1000, 1, args.items).body
+    bytes_per_ms = args.link_kbps * 1000 / 8 / 1000
+
+    print(f"page: {args.items} articles, {len(page) / 1024:.0f} KiB uncompressed")
+    print(f"{'encoding':8s} {'level':>5s} {'KiB':>8s} {'ratio':>6s} {'cpu ms':>8s} {'MB/s':>7s} {'deliver ms':>11s}")
+    print(f"{'identity':8s} {'-':>5s} {len(page) / 1024:8.1f} {1:6.2f} {0:8.2f} {'-':>7s} {len(page) / bytes_per_ms:11.0f}")
+    if brotli is None:
+        print("(brotli not installed: gzip only)")
+    for name, level, compress in _settings():
+        size = len(compress(page))
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            compress(page)
+        cpu_ms = (time.perf_counter() - start) * 1000 / args.rounds
+        deliver_ms = cpu_ms + size / bytes_per_ms
+        print(
+            f"{name:8s} {level:5d} {size / 1024:8.1f} {len(page) / size:6.2f} {cpu_ms:8.2f} "
+            f"{len(page) / 1e6 / (cpu_ms / 1000):7.0f} {deliver_ms:11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Queries and latency per GET /dashboard/stats load, per role.
+
+    python benchmarks/dashboard_bench.py --loads 200
+
+Runs against the configured database (read only). Compares the previous
+per-counter count() queries, the single aggregate query, and the cached path
+(what auto-refreshing dashboards hit between status changes).
+--author-id defaults to the author with the most articles.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import event, func
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import models  # noqa: E402
+from app.db.enums import RoleEnum  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.services import dashboard_service  # noqa: E402
+
+
+def _legacy_stats(db, role, author_id):
+    """The count() per counter version the endpoint used before."""
+    Article = models.Article
+    total_categories = db.query(models.Category).count()
+    if role == RoleEnum.admin:
+        return {
+            "total_users": db.query(models.User).count(),
+            "total_articles": db.query(Article).filter(Article.status.in_(["published", "pending_review", "archived"])).count(),
+            "total_categories": total_categories,
+        }
+    if role == RoleEnum.editor:
+        today = datetime.utcnow().date()
+        return {
+            "pending_reviews": db.query(Article).filter(Article.status == "pending_review").count(),
+            "published_today": db.query(Article).filter(Article.status == "published", Article.publish_at >= today).count(),
+            "total_categories": total_categories,
+        }
+    by_author = Article.author_id == author_id
+    return {
+        "my_articles": db.query(Article).filter(by_author).count(),
+        "pending_review": db.query(Article).filter(by_author, Article.status == "pending_review").count(),
+        "published": db.query(Article).filter(by_author, Article.status == "published").count(),
+        "rejected": db.query(Article).filter(by_author, Article.status == "rejected").count(),
+    }
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+def _measure(counter, fn, loads):
+    fn()  # warm up
+    counter.count = 0
+    start = time.perf_counter()
+    for _ in range(loads):
+        fn()
+    elapsed = time.perf_counter() - start
+    return counter.count / loads, elapsed * 1000 / loads
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--loads", type=int, default=200)
+    parser.add_argument("--author-id", default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    counter = _QueryCounter()
+    try:
+        author_id = args.author_id or db.query(models.Article.author_id).group_by(
+            models.Article.author_id
+        ).order_by(func.count().desc()).limit(1).scalar()
+        if author_id is None:
+            print("no articles in the database")
+            return
+
+        builders = {
+            RoleEnum.admin: lambda: dashboard_service.admin_stats(db),
+            RoleEnum.editor: lambda: dashboard_service.editor_stats(db),
+            RoleEnum.author: lambda: dashboard_service.author_stats(db, author_id),
+        }
+        print(f"{'role':7s} {'path':10s} {'queries/load':>13s} {'ms/load':>9s}")
+        for role, build in builders.items():
+            user = SimpleNamespace(role=role, id=author_id)
+            legacy = _legacy_stats(db, role, author_id)
+            assert legacy == build(), (legacy, build())
+            dashboard_service.invalidate_dashboard_stats(author_id)
+            paths = {
+                "count()": lambda: _legacy_stats(db, role, author_id),
+                "aggregate": build,
+                "cached": lambda: dashboard_service.get_dashboard_stats(db, user),
+            }
+            for name, fn in paths.items():
+                queries, ms = _measure(counter, fn, args.loads)
+                print(f"{role.value:7s} {name:10s} {queries:13.2f} {ms:9.3f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Requests/second for hot images: plain StaticFiles vs MediaStaticFiles.
+
+    python benchmarks/media_serving_bench.py --requests 2000 --concurrency 32 --size-kb 300
+
+Both apps serve the same content-addressed file from a temp dir, in process
+(httpx ASGI transport, so this measures the Python side only). Reported per app:
+- full GET (cold client)
+- revalidation GET with If-None-Match (what browsers send for files without
+  Cache-Control on every page view)
+- range GET (first 64 KiB)
+and how many of --page-views reach the server when the client honours the
+response's Cache-Control (immutable files: only the first one).
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.media_files import MediaStaticFiles  # noqa: E402
+
+
+async def _run(app, path: str, total: int, concurrency: int, headers=None) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        queue = asyncio.Queue()
+        for _ in range(total):
+            queue.put_nowait(None)
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                r = await client.get(path, headers=headers)
+                await r.aread()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+async def _requests_reaching_server(app, path: str, page_views: int) -> int:
+    """A minimal browser cache: reuse while fresh per Cache-Control, else revalidate."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        sent, etag, fresh = 0, None, False
+        for _ in range(page_views):
+            if fresh:
+                continue
+            headers = {"if-none-match": etag} if etag else None
+            r = await client.get(path, headers=headers)
+            sent += 1
+            etag = r.headers.get("etag", etag)
+            cache_control = r.headers.get("cache-control", "")
+            fresh = "immutable" in cache_control or ("max-age=" in cache_control and "max-age=0" not in cache_control)
+        return sent
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory() as root:
+        data = os.urandom(args.size_kb * 1024)
+        sha = hashlib.sha256(data).hexdigest()
+        rel = f"blobs/{sha[:2]}/{sha[2:4]}/{sha}.jpg"
+        os.makedirs(os.path.join(root, os.path.dirname(rel)))
+        with open(os.path.join(root, rel), "wb") as f:
+            f.write(data)
+        path = f"/media/{rel}"
+
+        apps = {
+            "StaticFiles": Starlette(routes=[Mount("/media", StaticFiles(directory=root))]),
+            "MediaStaticFiles": Starlette(routes=[Mount("/media", MediaStaticFiles(directory=root))]),
+        }
+        for name, app in apps.items():
+            probe = await httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench").get(path)
+            etag = probe.headers["etag"]
+            full = await _run(app, path, args.requests, args.concurrency)
+            revalidate = await _run(app, path, args.requests, args.concurrency, {"if-none-match": etag})
+            ranged = await _run(app, path, args.requests, args.concurrency, {"range": "bytes=0-65535"})
+            reached = await _requests_reaching_server(app, path, args.page_views)
+            print(
+                f"{name:17s} full={full:8.0f} req/s  304={revalidate:8.0f} req/s  range={ranged:8.0f} req/s  "
+                f"server hits for {args.page_views} page views: {reached}"
+            )
+            print(f"{'':17s} cache-control={probe.headers.get('cache-control')!r} etag={etag}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--size-kb", type=int, default=300)
+    parser.add_argument("--page-views", type=int, default=100)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
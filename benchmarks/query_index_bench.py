@@ -0,0 +1,233 @@
+"""
+Article listing / search latency without and with the listing + search indexes.
+
+    python benchmarks/query_index_bench.py --seed 50000 --runs 20 --query election
+
+Runs the article_service / feed_service queries behind the home page, category
+and author pages, the review queue, search (latest / likes / views) and the
+feeds, first with the indexes from migration b4e4a8a4e5f6 ("after"), then
+with them dropped ("before"). Everything happens in one transaction that is
+rolled back at the end: --seed articles (spread over statuses, categories and
+two years), the ANALYZE and the DROP INDEX never reach the database. DROP
+INDEX locks the articles table until then, so run it against a copy, not a
+live database.
+
+Per query: median / p95 ms per call and, from EXPLAIN (ANALYZE, BUFFERS) of
+its statements, the scans used and the observatory's index hints left with
+the indexes in place.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import event, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import models, observatory  # noqa: E402
+from app.db.enums import RoleEnum  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.services import article_service, feed_service  # noqa: E402
+
+INDEXES = [
+    "ix_articles_status_created_at",
+    "ix_articles_category_status_created_at",
+    "ix_articles_author_created_at",
+    "ix_articles_status_likes_count",
+    "ix_articles_status_views",
+    "ix_articles_published_on",
+    "ix_articles_title_trgm",
+    "ix_articles_summary_trgm",
+    "ix_articles_content_trgm",
+]
+# what the single-column indexes they replaced covered
+LEGACY_INDEXES = {
+    "ix_articles_author_id": "author_id",
+    "ix_articles_category_id": "category_id",
+}
+
+WORDS = (
+    "government said year city market election minister report police court team season company "
+    "health school students weather storm council budget project energy prices local national "
+    "international official statement announced plans public water traffic hospital economy growth bank"
+).split()
+
+SEED_SQL = """
+WITH words AS (SELECT CAST(:words AS text[]) AS w)
+INSERT INTO articles (
+    id, title, slug, summary, content, status, views, likes_count, comments_count,
+    author_id, category_id, created_at, updated_at, publish_at
+)
+SELECT
+    gen_random_uuid(),
+    array_to_string(ARRAY(
+        SELECT w[1 + floor(random() * array_length(w, 1))::int] FROM generate_series(1, 8 + g % 5)
+    ), ' '),
+    'bench-index-' || g || '-' || md5(random()::text),
+    array_to_string(ARRAY(
+        SELECT w[1 + floor(random() * array_length(w, 1))::int] FROM generate_series(1, 40 + g % 7)
+    ), ' '),
+    array_to_string(ARRAY(
+        SELECT w[1 + floor(random() * array_length(w, 1))::int] FROM generate_series(1, 300 + g % 11)
+    ), ' '),
+    CAST(CASE
+        WHEN g % 100 < 80 THEN 'published'
+        WHEN g % 100 < 88 THEN 'pending_review'
+        WHEN g % 100 < 93 THEN 'draft'
+        WHEN g % 100 < 97 THEN 'archived'
+        WHEN g % 100 < 99 THEN 'rejected'
+        ELSE 'scheduled' END AS articlestatus),
+    floor(random() * 20000)::int,
+    floor(random() * 500)::int,
+    0,
+    (CAST(:authors AS uuid[]))[1 + g % array_length(CAST(:authors AS uuid[]), 1)],
+    (CAST(:categories AS int[]))[1 + g % array_length(CAST(:categories AS int[]), 1)],
+    now() - random() * interval '730 days',
+    now(),
+    CASE WHEN g % 3 = 0 THEN NULL ELSE now() - random() * interval '730 days' END
+FROM words, generate_series(1, :count) AS g
+"""
+
+
+def _seed(db, count: int):
+    authors = [row.id for row in db.query(models.User.id).limit(20)]
+    if not authors:
+        author = models.User(email="bench-index@example.com", username="bench", hashed_password="-", role=RoleEnum.author)
+        db.add(author)
+        db.flush()
+        authors = [author.id]
+    categories = []
+    for i in range(12):
+        category = models.Category(name=f"Bench index {i}", slug=f"bench-index-{i}")
+        db.add(category)
+        db.flush()
+        categories.append(category.id)
+    db.execute(text(SEED_SQL), {
+        "words": WORDS, "authors": [str(a) for a in authors], "categories": categories, "count": count,
+    })
+
+
+def _queries(db, word: str):
+    author_id, category_id = db.query(models.Article.author_id, models.Article.category_id).filter(
+        models.Article.status == "published", models.Article.category_id.isnot(None)
+    ).limit(1).one()
+    admin = SimpleNamespace(role=RoleEnum.admin, id=None)
+    editor = SimpleNamespace(role=RoleEnum.editor, id=None)
+    author = SimpleNamespace(role=RoleEnum.author, id=author_id)
+    return {
+        "home": lambda: article_service.get_paginated_articles(db, 1, 20),
+        "admin list": lambda: article_service.get_paginated_articles(db, 1, 20, current_user=admin),
+        "review queue": lambda: article_service.get_paginated_articles(db, 1, 20, current_user=editor, status="pending_review"),
+        "my articles": lambda: article_service.get_paginated_articles(db, 1, 20, current_user=author, author_id=str(author_id)),
+        "category page": lambda: article_service.get_articles_by_category(db, category_id),
+        "search latest": lambda: article_service.search_articles(db, word, 1, 20),
+        "search likes": lambda: article_service.search_articles(db, word, 1, 20, sort="likes"),
+        "search views": lambda: article_service.search_articles(db, word, 1, 20, sort="views"),
+        "feed": lambda: feed_service._feed_rows(db, None),
+        "category feed": lambda: feed_service._feed_rows(db, category_id),
+    }
+
+
+class _Statements:
+    """Statements (with parameters) a call executes."""
+
+    def __init__(self):
+        self.captured = None
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.captured is not None:
+            self.captured.append((statement, parameters))
+
+    def capture(self, fn):
+        self.captured = []
+        fn()
+        captured, self.captured = self.captured, None
+        return captured
+
+
+def _scans(plan) -> str:
+    nodes = [
+        f"{node['Node Type']}({node.get('Index Name') or node.get('Relation Name')})"
+        for node in observatory._walk(plan["Plan"])
+        if "Scan" in node["Node Type"] and (node.get("Relation Name") == "articles" or "articles" in str(node.get("Index Name", "")))
+    ]
+    return ", ".join(nodes) or "-"
+
+
+def _run(db, queries, statements, runs: int):
+    results = {}
+    for name, fn in queries.items():
+        db.expire_all()
+        fn()  # warm up
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - start) * 1000)
+        scans, hints = [], []
+        for statement, parameters in statements.capture(fn):
+            captured = observatory.explain(db.connection(), statement, parameters)
+            if captured is not None:
+                scans.append(_scans(captured["plan"]))
+                hints.extend(observatory.plan_hints(captured["plan"]))
+        times.sort()
+        results[name] = {
+            "p50": statistics.median(times),
+            "p95": times[min(len(times) - 1, int(0.95 * len(times)))],
+            "scans": " | ".join(scans),
+            "hints": list(dict.fromkeys(hints)),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0, help="articles to insert first (rolled back)")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--query", default="election", help="search term")
+    args = parser.parse_args()
+
+    # plans are taken inline below; background captures would wait on the DROP INDEX lock
+    observatory.uninstall(engine)
+    statements = _Statements()
+    db = SessionLocal()
+    try:
+        if args.seed:
+            _seed(db, args.seed)
+        db.execute(text("ANALYZE articles"))
+        total = db.query(models.Article).count()
+        present = {
+            row.indexname for row in db.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'articles'"))
+        }
+        queries = _queries(db, args.query)
+        print(f"{total} articles; indexes present: {', '.join(i for i in INDEXES if i in present) or 'none'}")
+
+        after = _run(db, queries, statements, args.runs)
+        for name in INDEXES:
+            if name in present:
+                db.execute(text(f"DROP INDEX {name}"))
+        for name, column in LEGACY_INDEXES.items():
+            if name not in present:
+                db.execute(text(f"CREATE INDEX {name} ON articles ({column})"))
+        before = _run(db, queries, statements, args.runs)
+
+        print(f"{'query':14s} {'before p50':>10s} {'p95':>8s} {'after p50':>10s} {'p95':>8s} {'speedup':>8s}")
+        for name in queries:
+            b, a = before[name], after[name]
+            print(f"{name:14s} {b['p50']:10.2f} {b['p95']:8.2f} {a['p50']:10.2f} {a['p95']:8.2f} {b['p50'] / a['p50']:7.1f}x")
+        print()
+        for name in queries:
+            print(f"{name}:\n  before: {before[name]['scans']}\n  after:  {after[name]['scans']}")
+            for hint in after[name]["hints"]:
+                print(f"  still:  {hint}")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
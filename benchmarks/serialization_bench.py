@@ -0,0 +1,104 @@
+"""
+Per-item cost of serializing article pages: response_model path vs TypeAdapter.dump_json.
+
+    python benchmarks/serialization_bench.py --items 50 --rounds 200
+
+"response_model" is what the routes did before: validate the ORM objects into
+ArticleRead, return a dict, and let FastAPI validate it again against
+PaginatedResponse, run jsonable_encoder and json.dumps (JSONResponse).
+"dump_json" is app.api.responses.paginated_response: validate once, serialize
+the envelope to bytes in pydantic-core.
+Items are plain objects shaped like the ORM rows (author, category, two media).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app.api.responses import paginated_response  # noqa: E402
+from app.schemas.article import ArticleRead  # noqa: E402
+from app.schemas.pagination import PaginatedResponse  # noqa: E402
+
+
+def _fake_article(i: int):
+    now = datetime.utcnow()
+    author = SimpleNamespace(
+        id=uuid.uuid4(), email=f"user{i}@example.com", username=f"user{i}", role="author",
+        is_active=True, created_at=now, updated_at=now,
+    )
+    category = SimpleNamespace(id=i % 10, name=f"Category {i % 10}", slug=f"category-{i % 10}", description=None)
+    sha = uuid.uuid4().hex * 2
+    media = [
+        SimpleNamespace(
+            id=uuid.uuid4(), article_id=None, url=f"/media/blobs/{sha[:2]}/{sha[2:4]}/{sha}.jpg",
+            mime_type="image/jpeg", size=120_000, uploaded_at=now, blob_sha256=sha, variants=[],
+        )
+        for _ in range(2)
+    ]
+    return SimpleNamespace(
+        id=uuid.uuid4(), title=f"Article {i}", slug=f"article-{i}", summary="Lorem ipsum " * 20,
+        content="Lorem ipsum dolor sit amet. " * 150, status="published", publish_at=now,
+        rejection_reason=None, author_id=author.id, category_id=category.id, views=i, likes_count=i,
+        created_at=now, updated_at=now, author=author, category=category, media=media,
+    )
+
+
+def _response_model_path(field, items, page, limit) -> bytes:
+    content = {
+        "items": [ArticleRead.model_validate(i) for i in items],
+        "total": len(items),
+        "page": page,
+        "limit": limit,
+    }
+    encoded = asyncio.run(serialize_response(field=field, response_content=content, is_coroutine=False))
+    return JSONResponse(encoded).body
+
+
+def _dump_json_path(items, page, limit) -> bytes:
+    return paginated_response(ArticleRead, items, len(items), page, limit).body
+
+
+async def _noop():
+    return None
+
+
+def _time(fn, rounds: int) -> float:
+    fn()  # warm up (schema / adapter build)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    items = [_fake_article(i) for i in range(args.items)]
+    field = create_model_field(name="Response", type_=PaginatedResponse, mode="serialization")
+
+    # asyncio.run per page adds a constant; subtract it so only serialization is compared
+    loop_overhead = _time(lambda: asyncio.run(_noop()), args.rounds)
+    old = _time(lambda: _response_model_path(field, items, 1, args.items), args.rounds) - loop_overhead
+    new = _time(lambda: _dump_json_path(items, 1, args.items), args.rounds)
+    per_item = 1e6 / (args.rounds * args.items)
+    size = len(_dump_json_path(items, 1, args.items))
+    print(f"{args.items} items/page, {args.rounds} pages, {size} bytes/page")
+    print(f"response_model : {old * per_item:8.1f} us/item")
+    print(f"dump_json      : {new * per_item:8.1f} us/item  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
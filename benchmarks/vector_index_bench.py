@@ -0,0 +1,145 @@
+"""
+Recall / latency of the numpy vector index against chroma.
+
+    # live comparison: queries are stored chunk embeddings, results are
+    # compared with chroma's answer for the same published-only filter
+    python benchmarks/vector_index_bench.py chroma --queries 200 --k 10
+
+    # offline: quantized indexes against exact float32 search on synthetic data
+    python benchmarks/vector_index_bench.py synthetic --rows 200000 --dim 1024
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.vector_index import NumpyVectorIndex, build_index  # noqa: E402
+
+PUBLISHED = {"status": {"$eq": "published"}}
+
+
+def _percentiles(samples):
+    arr = np.asarray(samples) * 1000
+    return f"p50={np.percentile(arr, 50):.2f}ms p95={np.percentile(arr, 95):.2f}ms"
+
+
+def _timed(fn, queries):
+    results, latencies = [], []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(fn(q))
+        latencies.append(time.perf_counter() - start)
+    return results, latencies
+
+
+def _recall(expected, actual):
+    hits = sum(len(set(e) & set(a)) / max(len(e), 1) for e, a in zip(expected, actual))
+    return hits / max(len(expected), 1)
+
+
+class _ArrayCollection:
+    """Just enough of the chroma collection API for build_index."""
+
+    name = "synthetic"
+
+    def __init__(self, embeddings, metadatas):
+        self.embeddings = embeddings
+        self.metadatas = metadatas
+
+    def count(self):
+        return len(self.embeddings)
+
+    def get(self, include, limit, offset):
+        end = offset + limit
+        return {
+            "ids": [f"{m['article_id']}:{i}" for i, m in enumerate(self.metadatas[offset:end], start=offset)],
+            "embeddings": self.embeddings[offset:end],
+            "metadatas": self.metadatas[offset:end],
+            "documents": [""] * len(self.metadatas[offset:end]),
+        }
+
+
+def bench_synthetic(rows: int, dim: int, queries: int, k: int):
+    rng = np.random.default_rng(7)
+    # clustered data is closer to real embeddings than iid noise
+    centers = rng.normal(size=(64, dim)).astype(np.float32)
+    data = centers[rng.integers(0, 64, rows)] + 0.5 * rng.normal(size=(rows, dim)).astype(np.float32)
+    metas = [
+        {"article_id": f"a{i}", "status": "published" if i % 4 else "draft", "category_id": i % 10}
+        for i in range(rows)
+    ]
+    qs = data[rng.integers(0, rows, queries)] + 0.1 * rng.normal(size=(queries, dim)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        collection = _ArrayCollection(data, metas)
+        indexes = {}
+        for dtype in ("float32", "float16", "int8"):
+            build_index(collection, os.path.join(tmp, dtype), dtype=dtype)
+            indexes[dtype] = NumpyVectorIndex.open(os.path.join(tmp, dtype))
+
+        exact, _ = _timed(lambda q: [r for r, _ in indexes["float32"].top_k(q, k, PUBLISHED)], qs)
+        for dtype, index in indexes.items():
+            found, lat = _timed(lambda q: [r for r, _ in index.top_k(q, k, PUBLISHED)], qs)
+            size = os.path.getsize(os.path.join(index.path, "vectors.npy")) / 2**20
+            print(f"{dtype:8s} recall@{k}={_recall(exact, found):.3f} {_percentiles(lat)} vectors={size:.1f}MiB")
+
+
+def bench_chroma(queries: int, k: int, dtype: str):
+    from app.services.embedding_service import _get_vectorstore
+
+    collection = _get_vectorstore()._collection
+    total = collection.count()
+    if not total:
+        print("chroma collection is empty")
+        return
+
+    rng = np.random.default_rng(7)
+    offsets = rng.integers(0, total, queries)
+    qs = [np.asarray(collection.get(include=["embeddings"], limit=1, offset=int(o))["embeddings"][0]) for o in offsets]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        build_index(collection, tmp, dtype=dtype)
+        print(f"build: {total} chunks in {time.perf_counter() - start:.1f}s")
+        index = NumpyVectorIndex.open(tmp)
+
+        def chroma_query(q):
+            res = collection.query(query_embeddings=[q.tolist()], n_results=k, where=PUBLISHED)
+            return res["ids"][0]
+
+        def numpy_query(q):
+            return [d.id for d in index.search(q, k, PUBLISHED)]
+
+        expected, chroma_lat = _timed(chroma_query, qs)
+        found, numpy_lat = _timed(numpy_query, qs)
+        print(f"chroma        {_percentiles(chroma_lat)}")
+        print(f"numpy {dtype:7s} {_percentiles(numpy_lat)} recall@{k} vs chroma={_recall(expected, found):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="mode", required=True)
+    p = sub.add_parser("synthetic")
+    p.add_argument("--rows", type=int, default=100_000)
+    p.add_argument("--dim", type=int, default=1024)
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--k", type=int, default=10)
+    p = sub.add_parser("chroma")
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--k", type=int, default=10)
+    p.add_argument("--dtype", default="int8", choices=["int8", "float16", "float32"])
+    args = parser.parse_args()
+
+    if args.mode == "synthetic":
+        bench_synthetic(args.rows, args.dim, args.queries, args.k)
+    else:
+        bench_chroma(args.queries, args.k, args.dtype)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from app.api import auth, users, category, article, media, dashboard, comment, like, bookmark,chat
+from app.core.media_files import MediaStaticFiles
+from app.api import auth, users, category, article, media, dashboard, comment, like, bookmark, chat, me, feeds
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.compression import CompressionMiddleware
 
 app = FastAPI(title="News Portal Backend")
 
@@ -13,6 +14,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# gzip / brotli for JSON and text responses (added last, so it wraps CORS)
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(auth.router)
 app.include_router(users.router)
@@ -24,10 +27,19 @@ app.include_router(comment.router)
 app.include_router(like.router)
 app.include_router(bookmark.router)
 app.include_router(chat.router)
+app.include_router(me.router)
+app.include_router(feeds.router)
 
 
 # Mount static files AFTER routers to avoid shadowing /media/upload
-app.mount("/media", StaticFiles(directory="uploads/media"), name="media")
+# immutable caching + strong ETags for content-addressed files, ranges, optional X-Accel-Redirect
+app.mount("/media", MediaStaticFiles(directory="uploads/media"), name="media")
+
+@app.on_event("startup")
+def start_article_events_listener():
+    # publishes / unpublishes in other workers and the scheduler refresh this worker's caches
+    from app.services.article_events import start_listener
+    start_listener()
 
 # @app.on_event("startup")
 # def create_admin_user():
@@ -0,0 +1,152 @@
+"""
+Maintenance commands.
+
+    python manage.py reindex [--fresh] [--resume] [--published-only]
+    python manage.py reconcile-index [--dry-run] [--fix-missing]
+    python manage.py build-vector-index [--dtype int8|float16|float32]
+    python manage.py purge-chat-sessions
+    python manage.py media-variants
+    python manage.py media-gc [--dry-run] [--grace-hours 24] [--purge-days 7]
+    python manage.py scheduler [--once] [--interval 30] [--batch-size 100]
+"""
+import argparse
+import json
+import os
+
+
+def cmd_reindex(args):
+    from app.services.reindex_service import reindex
+
+    stats = reindex(
+        batch_size=args.batch_size,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        fresh=args.fresh,
+        resume=args.resume,
+        published_only=args.published_only,
+        drop_old=args.drop_old,
+    )
+    print(json.dumps(stats, indent=2))
+
+
+def cmd_reconcile_index(args):
+    from app.services.index_reconcile_service import reconcile_index
+
+    report = reconcile_index(
+        batch_size=args.batch_size,
+        fix_stale=not args.skip_stale,
+        fix_missing=args.fix_missing,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(report, indent=2))
+
+
+def cmd_build_vector_index(args):
+    from app.core.config import settings
+    from app.services.embedding_service import _get_vectorstore
+    from app.services.vector_index import build_index
+
+    path = build_index(
+        _get_vectorstore()._collection,
+        args.out or settings.NUMPY_INDEX_DIR,
+        dtype=args.dtype or settings.NUMPY_INDEX_DTYPE,
+    )
+    print(f"vector index written to {path}")
+
+
+def cmd_purge_chat_sessions(args):
+    from app.db.session import SessionLocal
+    from app.services.chat_session_service import purge_expired_sessions
+
+    db = SessionLocal()
+    try:
+        removed = purge_expired_sessions(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"removed {removed} expired chat sessions")
+
+
+def cmd_media_variants(args):
+    from app.services.image_variants import backfill_variants
+    from app.services.media_service import UPLOAD_DIR
+
+    print(json.dumps(backfill_variants(UPLOAD_DIR, batch_size=args.batch_size), indent=2))
+
+
+def cmd_media_gc(args):
+    from app.services.media_gc_service import collect_media_garbage
+
+    report = collect_media_garbage(
+        grace_hours=args.grace_hours,
+        purge_days=args.purge_days,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+    if report is None:
+        print("another media GC is running")
+        return
+    print(json.dumps(report, indent=2))
+
+
+def cmd_scheduler(args):
+    from app.services.scheduler_service import publish_due_articles, run_scheduler
+
+    if args.once:
+        print(f"published {publish_due_articles(args.batch_size)} scheduled articles")
+        return
+    run_scheduler(interval=args.interval, batch_size=args.batch_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="News portal maintenance commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("reindex", help="rebuild the chroma index from Postgres")
+    p.add_argument("--batch-size", type=int, default=200, help="articles per batch")
+    p.add_argument("--workers", type=int, default=os.cpu_count(), help="text splitting processes")
+    p.add_argument("--concurrency", type=int, default=4, help="parallel embedding requests")
+    p.add_argument("--fresh", action="store_true", help="build into a new collection and point the live pointer at it")
+    p.add_argument("--resume", action="store_true", help="continue from the last checkpoint")
+    p.add_argument("--published-only", action="store_true", help="skip unpublished articles")
+    p.add_argument("--drop-old", action="store_true", help="with --fresh, delete collections replaced by earlier rebuilds")
+    p.set_defaults(func=cmd_reindex)
+
+    p = sub.add_parser("reconcile-index", help="remove orphaned / stale chunks from the chroma index")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.add_argument("--dry-run", action="store_true", help="only report, change nothing")
+    p.add_argument("--skip-stale", action="store_true", help="do not re-index stale articles")
+    p.add_argument("--fix-missing", action="store_true", help="index articles that have no chunks")
+    p.set_defaults(func=cmd_reconcile_index)
+
+    p = sub.add_parser("build-vector-index", help="snapshot chroma into the numpy vector index")
+    p.add_argument("--dtype", choices=["int8", "float16", "float32"], help="defaults to NUMPY_INDEX_DTYPE")
+    p.add_argument("--out", help="index root, defaults to NUMPY_INDEX_DIR")
+    p.set_defaults(func=cmd_build_vector_index)
+
+    p = sub.add_parser("purge-chat-sessions", help="delete chat sessions past their TTL")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.set_defaults(func=cmd_purge_chat_sessions)
+
+    p = sub.add_parser("media-variants", help="render missing image variants for stored media")
+    p.add_argument("--batch-size", type=int, default=100)
+    p.set_defaults(func=cmd_media_variants)
+
+    p = sub.add_parser("media-gc", help="move unreferenced media files to trash and purge old trash")
+    p.add_argument("--grace-hours", type=float, default=24, help="ignore files younger than this")
+    p.add_argument("--purge-days", type=float, default=7, help="delete trash runs older than this")
+    p.add_argument("--batch-size", type=int, default=500)
+    p.add_argument("--dry-run", action="store_true", help="only report, change nothing")
+    p.set_defaults(func=cmd_media_gc)
+
+    p = sub.add_parser("scheduler", help="publish scheduled articles when their publish_at passes")
+    p.add_argument("--once", action="store_true", help="publish what is due now and exit")
+    p.add_argument("--interval", type=float, default=None, help="seconds between polls, defaults to SCHEDULER_INTERVAL_SECONDS")
+    p.add_argument("--batch-size", type=int, default=None, help="articles claimed per batch, defaults to SCHEDULER_BATCH_SIZE")
+    p.set_defaults(func=cmd_scheduler)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()